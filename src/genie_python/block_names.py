@@ -1,10 +1,19 @@
 import zlib
+from collections.abc import Iterable
 from keyword import iskeyword
 from threading import RLock, Timer
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Optional
 
 from .channel_access_exceptions import UnableToConnectToPVException
-from .genie_blockserver import BLOCK_SERVER_PREFIX, PV_BLOCK_NAMES
+from .genie_blockserver import (
+    BLOCK_PREFIX,
+    BLOCK_SERVER_PREFIX,
+    PV_BLOCK_NAMES,
+    RC_ENABLE,
+    RC_HIGH,
+    RC_LOW,
+)
 from .genie_cachannel_wrapper import CaChannelWrapper
 from .utilities import dehex_decompress_and_dejson
 
@@ -14,6 +23,65 @@ if TYPE_CHECKING:
     from genie_python.genie import PVValue
 
 
+class BlockNameIndex:
+    """
+    Index of the current block names, to look blocks up ignoring case. An index is not changed
+    once made; when the block names change a new index replaces it.
+    """
+
+    def __init__(self, names: Iterable[str] = (), pv_prefix: str = "") -> None:
+        """
+        Constructor.
+        :param names: the block names
+        :param pv_prefix: the instrument PV prefix of the block PVs
+        """
+        self.names = tuple(names)
+        self.pv_prefix = pv_prefix
+        self._names = MappingProxyType({name.lower(): name for name in self.names})
+        self._pv_names = MappingProxyType(
+            {
+                name.lower(): "{}{}{}".format(pv_prefix, BLOCK_PREFIX, name.upper())
+                for name in self.names
+            }
+        )
+        self._runcontrol_pv_names = MappingProxyType(
+            {
+                name: (pv_name + RC_ENABLE, pv_name + RC_LOW, pv_name + RC_HIGH)
+                for name, pv_name in self._pv_names.items()
+            }
+        )
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get_name(self, name: str) -> Optional[str]:
+        """
+        Get the name of a block as it is in the configuration.
+        :param name: the block name in any case
+        :return: the block name; None if there is no such block
+        """
+        return self._names.get(name.lower())
+
+    def get_pv_name(self, name: str) -> Optional[str]:
+        """
+        Get the full PV name of a block.
+        :param name: the block name in any case
+        :return: the PV name, with the instrument prefix; None if there is no such block
+        """
+        return self._pv_names.get(name.lower())
+
+    def get_runcontrol_pv_names(self, name: str) -> Optional[tuple[str, str, str]]:
+        """
+        Get the full names of the run-control PVs of a block.
+        :param name: the block name in any case
+        :return: the enable, low limit and high limit PV names; None if there is no such block
+        """
+        return self._runcontrol_pv_names.get(name.lower())
+
+
 class BlockNamesManager:
     """
     Manager for a blocks name object. It makes sure that the blocks it contains are updated
@@ -31,6 +99,9 @@ class BlockNamesManager:
             on start the delay before retrying
         """
         self._block_names = block_names
+        # Replaced rather than changed when the block names change, so is never seen part made
+        self.index = BlockNameIndex()
+        self._pv_prefix = ""
         self._cancel_monitor_fn = None
         self._delay_before_retry_add_monitor = delay_before_retry_add_monitor
         self._timer = None
@@ -45,6 +116,7 @@ class BlockNamesManager:
         """
 
         with self.pv_name_lock:
+            self._pv_prefix = pv_prefix
             new_name = "{}{}{}".format(pv_prefix, BLOCK_SERVER_PREFIX, PV_BLOCK_NAMES)
             if new_name != self._pv_name:
                 self._pv_name = new_name
@@ -71,7 +143,7 @@ class BlockNamesManager:
             # first value, otherwise do nothing
             try:
                 self._cancel_monitor_fn = CaChannelWrapper.add_monitor(
-                    self._pv_name, self._update_block_names, to_string=True
+                    self._pv_name, self._update_block_names, to_string=True, coalesce=True
                 )
                 self._update_block_names(
                     CaChannelWrapper.get_pv_value(self._pv_name, to_string=True), "", ""
@@ -94,22 +166,29 @@ class BlockNamesManager:
             :param _1(CaChannel._ca.AlarmCondition): status of the alarm
                 (not used but passed in by monitor)
         """
+        block_names = []
+        if not isinstance(value, (str, bytes)):
+            print("WARNING: Block names PV value is not a string: {!r:.100}".format(value))
+        else:
+            try:
+                block_names = [
+                    str(name) for name in dehex_decompress_and_dejson(value, cached=True)
+                ]
+            except (zlib.error, ValueError, TypeError):
+                # if we can not decode the blocks then there are no blocks
+                pass
+        self.index = BlockNameIndex(block_names, self._pv_prefix)
+
         # remove old blocks
         for block_name in list(self._block_names.__dict__.keys()):
             delattr(self._block_names, block_name)
 
         # add new block as attributes to class
-        try:
-            assert isinstance(value, (str, bytes)), value
-            block_names = dehex_decompress_and_dejson(value)
-            for name in block_names:
-                attribute_name = name
-                if iskeyword(attribute_name):
-                    attribute_name = "{}__".format(attribute_name)
-                setattr(self._block_names, attribute_name, name)
-        except (zlib.error, ValueError, TypeError):
-            # if we can not decode the blocks then just pass
-            pass
+        for name in block_names:
+            attribute_name = name
+            if iskeyword(attribute_name):
+                attribute_name = "{}__".format(attribute_name)
+            setattr(self._block_names, attribute_name, name)
 
 
 class BlockNames:
@@ -273,12 +273,12 @@ def cset(
         # Setting multiple blocks, so other settings not allowed
         if not all(argument is None for argument in [runcontrol, lowlimit, highlimit, wait]):
             raise Exception("Runcontrol and wait can only be changed for one block at a time")
-
-    for block, value in list(zip(blocks, values)):
-        # If there are multiple blocks then runcontrol etc.
-        # should be None anyway so pass them through
-
-        _genie_api.set_block_value(block, value, runcontrol, lowlimit, highlimit, wait)
+        # Write all the setpoints together rather than one block at a time
+        _genie_api.set_multiple_blocks(list(blocks), list(values))
+    else:
+        for block, value in zip(blocks, values):
+            _genie_api.set_block_value(block, value, runcontrol, lowlimit, highlimit, wait)
+    for block in blocks:
         _warn_if_block_alarm(block)
 
     # Display what the new block state is as a result of the command if
@@ -316,7 +316,7 @@ def cget(block: str) -> _CgetReturn:
             - `highlimit` - run control high limit set
             - `alarm` - the alarm status of the block
     """
-    ans = _genie_api.get_block_data(block)
+    (ans,) = _genie_api.get_blocks_data([block])
     if ans["alarm"] != "NO_ALARM":
         _log_alarmed_block(block, ans["alarm"])
     return ans
@@ -378,8 +378,9 @@ def cshow(block: str | None = None) -> None:
         >>> cshow("block1")
     """
     blocks_to_get = [block] if block is not None else _genie_api.get_block_names()
-    for block in blocks_to_get:
-        _print_from_cget(_genie_api.get_block_data(block, True))
+    # All the blocks are read together, rather than one after another
+    for block_details in _genie_api.get_blocks_data(blocks_to_get, True):
+        _print_from_cget(block_details)
 
 
 @log_command_and_handle_exception
@@ -1432,31 +1433,7 @@ def get_dashboard() -> _GetdashboardReturn:
         dict: the experiment values
     """
     assert _genie_api.dae is not None
-    data = _GetdashboardReturn(
-        status=_genie_api.dae.get_run_state(),
-        run_number=_genie_api.dae.get_run_number(),
-        rb_number=_genie_api.dae.get_rb_number(),
-        user=_genie_api.dae.get_users(),
-        title=_genie_api.dae.get_title(),
-        display_title=_genie_api.dae.get_display_title(),
-        run_time=_genie_api.dae.get_run_duration(),
-        good_frames_total=_genie_api.dae.get_good_frames(),
-        good_frames_period=_genie_api.dae.get_good_frames(True),
-        raw_frames_total=_genie_api.dae.get_raw_frames(),
-        raw_frames_period=_genie_api.dae.get_raw_frames(True),
-        beam_current=_genie_api.dae.get_beam_current(),
-        total_current=_genie_api.dae.get_total_uamps(),
-        spectra=_genie_api.dae.get_num_spectra(),
-        # data["dae_memory_used"] = genie_api.dae.get_memory_used()
-        # Not implemented in EPICS system
-        periods=_genie_api.dae.get_num_periods(),
-        time_channels=_genie_api.dae.get_num_timechannels(),
-        monitor_spectrum=_genie_api.dae.get_monitor_spectrum(),
-        monitor_from=_genie_api.dae.get_monitor_from(),
-        monitor_to=_genie_api.dae.get_monitor_to(),
-        monitor_counts=_genie_api.dae.get_monitor_counts(),
-    )
-    return data
+    return _genie_api.dae.get_dashboard()
 
 
 def _get_correct_globals() -> dict[str, int]:
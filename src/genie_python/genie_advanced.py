@@ -5,9 +5,10 @@ This module is used for advanced commands that are for expert users.
 """
 
 import contextlib
+from concurrent.futures import Future, wait
 from datetime import UTC, datetime, timedelta
-from time import sleep
-from typing import Any, Iterator, Protocol, TypedDict
+from time import monotonic, sleep
+from typing import Any, Iterable, Iterator, Protocol, TypedDict
 
 import numpy as np
 import numpy.typing as npt
@@ -18,9 +19,13 @@ from genie_python.genie_api_setup import (
     log_command_and_handle_exception,
     usercommand,
 )
+from genie_python.genie_pv_instrumentation import INSTRUMENTATION
 from genie_python.genie_waitfor import DELAY_IN_WAIT_FOR_SLEEP_LOOP
 from genie_python.utilities import check_break
 
+# Longest time to wait for futures before checking for a user interrupt (Ctrl-C)
+FUTURE_BREAK_CHECK_INTERVAL = 0.5
+
 
 class PrePostCmd(Protocol):
     def __call__(self, **kwargs: Any) -> str | None:
@@ -173,6 +178,131 @@ def wait_for_pv(
         check_break(2)
 
 
+@usercommand
+@helparglist("pv str, value[, is_local]")
+def set_pv_async(pv: str, value: Any, is_local: bool = False) -> "Future[None]":
+    """
+    Start setting a PV to a value without waiting for it to finish, e.g. to start motors on
+    several controllers moving at once. Use wait_for_futures to wait for the puts to complete.
+
+    Args:
+        pv (str): The address of the PV
+        value: The value to set
+        is_local (bool, optional): is it a local PV i.e. needs prefix adding
+
+    Returns:
+        a future which is done when the put completes
+
+    Raises:
+        UnableToConnectToPVException: if the PV could not be connected to
+        WriteAccessException: if the PV cannot be written to
+
+    Example:
+        >>> futures = [g.adv.set_pv_async(pv, 10.0) for pv in motor_pvs]
+        >>> g.adv.wait_for_futures(futures, timeout=60)
+    """
+    return __api.set_pv_value_async(pv, value, is_local=is_local)
+
+
+@usercommand
+@helparglist("futures[, timeout]")
+def wait_for_futures(futures: Iterable["Future[Any]"], timeout: float | None = None) -> None:
+    """
+    Wait for puts started with set_pv_async, or any other futures, to complete. The wait takes as
+    long as the slowest of them, and can be interrupted with Ctrl-C.
+
+    Args:
+        futures: the futures to wait for
+        timeout (float, optional): the most seconds to wait; None to wait until all are done
+
+    Raises:
+        TypeError: if one of the futures is not a future, e.g. None
+        TimeoutError: if not all the futures were done within the timeout
+        the exception of the first future that failed, once all are done
+    """
+    pending = set(futures)
+    for future in pending:
+        if not isinstance(future, Future):  # pyright: ignore (scripts may pass anything)
+            raise TypeError("Expected futures to wait for but was given {!r}".format(future))
+    done: set["Future[Any]"] = set()
+    deadline = None if timeout is None else monotonic() + timeout
+    while pending:
+        wait_time = FUTURE_BREAK_CHECK_INTERVAL
+        if deadline is not None:
+            wait_time = min(wait_time, max(deadline - monotonic(), 0))
+        finished, pending = wait(pending, timeout=wait_time)
+        done.update(finished)
+        check_break(2)
+        if pending and deadline is not None and monotonic() >= deadline:
+            raise TimeoutError("{} of the puts did not complete in time".format(len(pending)))
+    for future in done:
+        exception = future.exception()
+        if exception is not None:
+            raise exception
+
+
+@usercommand
+@helparglist("enabled[, max_age]")
+def set_monitored_reads(enabled: bool, max_age: float | None = None) -> None:
+    """
+    Set whether PV reads use monitors. When enabled, the first read of a PV subscribes to it and
+    later reads return the latest value sent by the monitor, so PVs which are read repeatedly
+    (e.g. in a loop) do not need a round trip to the IOC each time. Monitors which are not read
+    for a while are removed.
+
+    Args:
+        enabled (bool): True to read PVs from monitors; False to read them directly
+        max_age (float, optional): if the latest monitored value was received longer ago than
+            this many seconds, read the PV directly instead; None to always use the monitored
+            value while the PV is connected
+    """
+    __api.monitored_reads = enabled
+    __api.monitored_read_max_age = max_age
+
+
+@usercommand
+@helparglist("enabled[, reset]")
+def set_pv_instrumentation(enabled: bool, reset: bool = False) -> None:
+    """
+    Set whether PV accesses are instrumented. When enabled, the number of connects, gets, puts,
+    puts waiting for completion and monitor updates of each PV are recorded along with the bytes
+    transferred and how long each took. Use print_pv_statistics to see which PVs are slow.
+
+    Args:
+        enabled (bool): True to record PV accesses; False to stop recording
+        reset (bool, optional): True to forget what has been recorded so far
+    """
+    if reset:
+        INSTRUMENTATION.reset()
+    INSTRUMENTATION.enable(enabled)
+
+
+@usercommand
+@helparglist("[max_rows]")
+def print_pv_statistics(max_rows: int | None = 20) -> None:
+    """
+    Print the statistics recorded while PV instrumentation is enabled, as a table of PVs and
+    operations with the longest total time first.
+
+    Args:
+        max_rows (int, optional): the most rows to print; None to print them all
+    """
+    print(INSTRUMENTATION.format_summary(max_rows))
+
+
+@usercommand
+@helparglist("filename")
+def export_pv_statistics(filename: str) -> None:
+    """
+    Write the statistics recorded while PV instrumentation is enabled to a file as JSON,
+    including the latency histogram of each PV and operation.
+
+    Args:
+        filename (str): the file to write
+    """
+    INSTRUMENTATION.export(filename)
+
+
 @usercommand
 @helparglist("")
 def set_begin_precmd(begin_precmd: PrePostCmd) -> None:
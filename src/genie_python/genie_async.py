@@ -0,0 +1,320 @@
+"""
+asyncio front end for PV access, so that many PVs can be read, written, monitored and waited for
+concurrently from one event loop rather than from a thread each.
+"""
+
+import asyncio
+import functools
+from collections.abc import AsyncIterator, Callable, Generator
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, Optional, Tuple, cast
+
+from genie_python.genie_cachannel_wrapper import TIMEOUT, CaChannelWrapper
+
+if TYPE_CHECKING:
+    from genie_python.genie import PVValue
+    from genie_python.genie_pv_connection_protocol import GeniePvConnectionProtocol
+
+# A monitor update: value, alarm severity and alarm status
+MonitorUpdate = Tuple["PVValue", Optional[str], Optional[str]]
+
+NUMERIC_TYPE = (float, int)
+
+
+class PvMonitor(AsyncIterator[MonitorUpdate]):
+    """
+    Asynchronous iterator over the updates of a PV monitor. Updates arrive on channel access
+    threads and are passed to the event loop with call_soon_threadsafe.
+
+    The PV is subscribed to when the monitor is entered, awaited or first iterated. Subscribing
+    may block while the channel connects, so it is run on an executor rather than the event loop.
+    Use as an async context manager, or call aclose, to remove the monitor when done with it.
+    """
+
+    def __init__(
+        self,
+        wrapper: "GeniePvConnectionProtocol",
+        name: str,
+        to_string: bool = False,
+        use_numpy: bool | None = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            wrapper: the PV access wrapper to monitor through
+            name: the PV name
+            to_string: whether to convert the values to strings
+            use_numpy: True use numpy to return arrays, False return a list; None for the default
+            executor: the executor to subscribe on; None for the event loop's default
+        """
+        self.name = name
+        self._wrapper = wrapper
+        self._to_string = to_string
+        self._use_numpy = use_numpy
+        self._executor = executor
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # None is put on the queue when the monitor is closed, to end iteration
+        self._updates: "asyncio.Queue[Optional[MonitorUpdate]]" = asyncio.Queue()
+        self._subscribing: "Optional[asyncio.Future[object]]" = None
+        self._subscription: Optional[object] = None
+        self._closed = False
+
+    async def subscribe(self) -> "PvMonitor":
+        """
+        Subscribe to the PV, if not already subscribed.
+
+        Returns:
+            this monitor
+        """
+        if self._closed:
+            return self
+        if self._subscribing is None:
+            self._loop = asyncio.get_running_loop()
+            self._subscribing = self._loop.run_in_executor(
+                self._executor,
+                functools.partial(
+                    self._wrapper.add_monitor,
+                    self.name,
+                    self._value_changed,
+                    to_string=self._to_string,
+                    use_numpy=self._use_numpy,
+                ),
+            )
+            self._subscribing.add_done_callback(self._subscribed)
+        try:
+            await asyncio.shield(self._subscribing)
+        except asyncio.CancelledError:
+            # The subscription still completes on the executor; remove it when it does
+            await self.aclose()
+            raise
+        return self
+
+    def _subscribed(self, subscribing: "asyncio.Future[object]") -> None:
+        """
+        Called on the event loop when the subscription has been made.
+        """
+        if subscribing.cancelled() or subscribing.exception() is not None:
+            return
+        if self._closed:
+            _unsubscribe(subscribing.result())
+        else:
+            self._subscription = subscribing.result()
+
+    def _value_changed(
+        self, value: "PVValue", severity: Optional[str], status: Optional[str]
+    ) -> None:
+        """
+        Monitor callback, called on a channel access thread.
+        """
+        if self._loop is None:
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._updates.put_nowait, (value, severity, status))
+        except RuntimeError:
+            # The event loop has been closed
+            pass
+
+    def __await__(self) -> Generator[Any, None, "PvMonitor"]:
+        return self.subscribe().__await__()
+
+    def __aiter__(self) -> "PvMonitor":
+        return self
+
+    async def __anext__(self) -> MonitorUpdate:
+        await self.subscribe()
+        update = await self._updates.get()
+        if update is None:
+            # Leave the marker for any other reader of the monitor
+            self._updates.put_nowait(None)
+            raise StopAsyncIteration
+        return update
+
+    async def __aenter__(self) -> "PvMonitor":
+        return await self.subscribe()
+
+    async def __aexit__(self, *args: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """
+        Remove the monitor; iteration then stops.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        subscription, self._subscription = self._subscription, None
+        if subscription is not None:
+            _unsubscribe(subscription)
+        self._updates.put_nowait(None)
+
+
+def _unsubscribe(subscription: object) -> None:
+    """
+    Remove a monitor subscription.
+    """
+    # The CA wrapper returns an unsubscribe function, the PVA wrapper a subscription
+    close = getattr(subscription, "close", None)
+    if callable(close):
+        close()
+    elif callable(subscription):
+        subscription()
+
+
+class AsyncPvAccess:
+    """
+    asyncio facade over a PV access wrapper.
+
+    Gets and puts are run on an executor, so an event loop can have many of them outstanding
+    while only the executor's worker threads block on channel access. Monitors and waits are
+    subscribed to on the executor, then use channel access callbacks and need no thread at all.
+    """
+
+    def __init__(
+        self,
+        wrapper: "GeniePvConnectionProtocol" = CaChannelWrapper,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            wrapper: the PV access wrapper to use, e.g. CaChannelWrapper or P4PWrapper
+            executor: the executor to run gets and puts on; None for the event loop's default
+        """
+        self.wrapper = wrapper
+        self.executor = executor
+
+    async def _run(
+        self, function: Callable[..., object], *args: object, **kwargs: object
+    ) -> object:
+        """
+        Run a blocking wrapper call on the executor.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args, **kwargs)
+        )
+
+    async def aget_pv(
+        self,
+        name: str,
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: bool | None = None,
+    ) -> "PVValue":
+        """
+        Get the current value of a PV.
+
+        Args:
+            name: the PV name
+            to_string: whether to convert the value to a string
+            timeout: how long to wait for the PV to connect etc.
+            use_numpy: True use numpy to return arrays, False return a list; None for the default
+
+        Returns:
+            the value of the PV
+        """
+        value = await self._run(self.wrapper.get_pv_value, name, to_string, timeout, use_numpy)
+        return cast("PVValue", value)
+
+    async def aset_pv(
+        self,
+        name: str,
+        value: "PVValue|bytes",
+        wait: bool = False,
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> None:
+        """
+        Set a PV to a value.
+
+        Args:
+            name: the PV name
+            value: the value to set
+            wait: whether to wait for the put to complete, e.g. for a motor to finish moving
+            timeout: how long to wait for the PV to connect etc.
+            safe_not_quick: True run all checks while setting the pv, False don't run checks
+        """
+        await self._run(self.wrapper.set_pv_value, name, value, wait, timeout, safe_not_quick)
+
+    def monitor(
+        self, name: str, to_string: bool = False, use_numpy: bool | None = None
+    ) -> PvMonitor:
+        """
+        Monitor a PV. The PV is subscribed to when the monitor is entered, awaited or iterated.
+
+        Args:
+            name: the PV name
+            to_string: whether to convert the values to strings
+            use_numpy: True use numpy to return arrays, False return a list; None for the default
+
+        Returns:
+            an asynchronous iterator over the (value, alarm severity, alarm status) updates
+
+        Example:
+            async with access.monitor("IN:DEMO:TEMP") as updates:
+                async for value, severity, status in updates:
+                    print(value)
+        """
+        return PvMonitor(self.wrapper, name, to_string, use_numpy, self.executor)
+
+    async def waitfor(
+        self,
+        name: str,
+        value: "PVValue|None" = None,
+        lowlimit: float | None = None,
+        highlimit: float | None = None,
+        timeout: float | None = None,
+    ) -> "PVValue":
+        """
+        Wait until a PV reaches a value or goes within limits.
+
+        Args:
+            name: the PV name
+            value: the value to wait for; a string PV is compared as a string
+            lowlimit: wait for the value to be at or above this
+            highlimit: wait for the value to be at or below this
+            timeout: the most seconds to wait; None to wait forever
+
+        Returns:
+            the value of the PV which satisfied the wait
+
+        Raises:
+            ValueError: if there is nothing to wait for
+            TimeoutError: if the timeout passed before the PV got there
+        """
+        if value is None and lowlimit is None and highlimit is None:
+            raise ValueError("No value or limits given to wait for")
+
+        async def _wait() -> "PVValue":
+            async with self.monitor(name) as updates:
+                async for current, _, _ in updates:
+                    if _is_satisfied(current, value, lowlimit, highlimit):
+                        return current
+            raise TimeoutError("Monitor on {} closed".format(name))
+
+        return await asyncio.wait_for(_wait(), timeout)
+
+
+def _is_satisfied(
+    current: "PVValue",
+    value: "PVValue|None",
+    lowlimit: float | None,
+    highlimit: float | None,
+) -> bool:
+    """
+    Whether a PV value satisfies a wait.
+    """
+    if value is not None:
+        if isinstance(value, NUMERIC_TYPE) and isinstance(current, NUMERIC_TYPE):
+            return current == value
+        return str(current) == str(value)
+    if not isinstance(current, NUMERIC_TYPE):
+        return False
+    if lowlimit is not None and current < lowlimit:
+        return False
+    if highlimit is not None and current > highlimit:
+        return False
+    return True
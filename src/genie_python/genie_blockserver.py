@@ -1,9 +1,16 @@
 from __future__ import absolute_import, print_function
 
+import re
 import time
+import zlib
 from builtins import object
-from typing import TYPE_CHECKING, Any, Callable, ParamSpec, TypeVar
+from collections.abc import Iterable
+from threading import Lock
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Optional, ParamSpec, TypeVar
 
+from genie_python.channel_access_exceptions import UnableToConnectToPVException
+from genie_python.genie_cachannel_wrapper import CaChannelWrapper
 from genie_python.utilities import compress_and_hex, dehex_decompress_and_dejson
 
 if TYPE_CHECKING:
@@ -16,6 +23,17 @@ RetType = TypeVar("RetType")
 # Prefix for block server pvs
 PV_BLOCK_NAMES = "BLOCKNAMES"
 BLOCK_SERVER_PREFIX = "CS:BLOCKSERVER:"
+# Prefix for block pvs, after the instrument prefix
+BLOCK_PREFIX = "CS:SB:"
+# Suffixes of the run-control pvs of a block
+RC_ENABLE = ":RC:ENABLE"
+RC_LOW = ":RC:LOW"
+RC_HIGH = ":RC:HIGH"
+# Block server pvs listing the parameter pvs, and the identifier in the names of those pvs
+PV_SAMPLE_PARS = "SAMPLE_PARS"
+SAMPLE_PAR_IDENTIFIER = "SAMPLE"
+PV_BEAMLINE_PARS = "BEAMLINE_PARS"
+BEAMLINE_PAR_IDENTIFIER = "BL"
 
 
 def _blockserver_retry(func: Callable[Param, RetType]) -> Callable[Param, RetType]:
@@ -34,9 +52,164 @@ def _blockserver_retry(func: Callable[Param, RetType]) -> Callable[Param, RetTyp
     return wrapper
 
 
+class ParameterIndex(object):
+    """
+    Index of the pvs of a set of parameters, e.g. the sample parameters, by parameter name. An
+    index is not changed once made; when the parameters change a new index replaces it.
+    """
+
+    def __init__(
+        self, pv_names: Iterable[str] = (), identifier: str = "", pv_prefix: str = ""
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            pv_names: the pv names of the parameters, without the instrument prefix, as listed by
+                the block server
+            identifier: the identifier of the set of parameters in the pv names, e.g. SAMPLE
+            pv_prefix: the instrument pv prefix
+        """
+        pattern = re.compile(".+:" + identifier + ":(.+)")
+        pvs: dict[str, str] = {}
+        upper_pvs: dict[str, str] = {}
+        unexpected = []
+        for pv_name in pv_names:
+            match = pattern.match(pv_name)
+            if match is None:
+                unexpected.append(pv_name)
+            else:
+                pvs.setdefault(match.group(1), pv_prefix + pv_name)
+                upper_pvs.setdefault(match.group(1).upper(), pv_prefix + pv_name)
+        # Parameter name to full pv name
+        self.pvs = MappingProxyType(pvs)
+        # Listed pvs which are not parameters of this set
+        self.unexpected = tuple(unexpected)
+        self._upper_pvs = MappingProxyType(upper_pvs)
+
+    def get_pv_name(self, name: str) -> Optional[str]:
+        """
+        Get the full pv name of a parameter.
+
+        Args:
+            name: the parameter name in any case
+
+        Returns:
+            the pv name; None if there is no such parameter
+        """
+        return self._upper_pvs.get(name.upper())
+
+
+class ParameterNamesMonitor(object):
+    """
+    The names of a set of parameters, kept up to date by a monitor on the block server pv which
+    lists them, so that they are not fetched from the block server every time they are used.
+    """
+
+    def __init__(
+        self, pv_name: str, identifier: str, pv_prefix: str, get_names: Callable[[], Any]
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            pv_name: the full name of the block server pv listing the parameters
+            identifier: the identifier of the set of parameters in the pv names, e.g. SAMPLE
+            pv_prefix: the instrument pv prefix
+            get_names: fetches the parameter names from the block server; used until the monitor
+                has a value
+        """
+        self._pv_name = pv_name
+        self._identifier = identifier
+        self._pv_prefix = pv_prefix
+        self._get_names = get_names
+        self._cancel_monitor_fn: Optional[Callable[[], None]] = None
+        # lock used to add the monitor and make the first index
+        self._lock = Lock()
+        # Replaced rather than changed when the names change, so is never seen part made
+        self.index: Optional[ParameterIndex] = None
+
+    def get_index(self) -> ParameterIndex:
+        """
+        Get the current parameters. The first call adds the monitor; if the monitor has no value
+        yet the names are fetched from the block server. If the monitor cannot be added the names
+        are fetched every call, until it can.
+
+        Returns:
+            the index of the parameter pvs
+        """
+        index = self.index
+        if index is not None:
+            return index
+        with self._lock:
+            if self._cancel_monitor_fn is None:
+                try:
+                    self._cancel_monitor_fn = CaChannelWrapper.add_monitor(
+                        self._pv_name, self._update_names, to_string=True, coalesce=True
+                    )
+                except UnableToConnectToPVException:
+                    # Not kept, so the monitor is added again on the next call
+                    return self._make_index(self._get_names())
+            index = self.index
+            if index is None:
+                index = self._make_index(self._get_names())
+                # The monitor may have sent a value while the names were fetched
+                if self.index is None:
+                    self.index = index
+            return index
+
+    def stop(self) -> None:
+        """
+        Remove the monitor.
+        """
+        with self._lock:
+            if self._cancel_monitor_fn is not None:
+                self._cancel_monitor_fn()
+                self._cancel_monitor_fn = None
+            self.index = None
+
+    def _make_index(self, names: Any) -> ParameterIndex:  # noqa: ANN401
+        """
+        Make an index from the decoded block server value; anything other than a list of strings
+        gives no parameters.
+        """
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            names = []
+        return ParameterIndex(names, self._identifier, self._pv_prefix)
+
+    def _update_names(self, value: "PVValue", _: Optional[str], _1: Optional[str]) -> None:
+        """
+        Update the parameters from a monitor of the block server pv.
+
+        Args:
+            value: the new value of the pv
+            _: severity of any alarm (not used but passed in by monitor)
+            _1: status of the alarm (not used but passed in by monitor)
+        """
+        names = []
+        if isinstance(value, (str, bytes)):
+            try:
+                names = dehex_decompress_and_dejson(value, cached=True)
+            except (zlib.error, ValueError, TypeError):
+                pass
+        self.index = self._make_index(names)
+
+
 class BlockServer(object):
     def __init__(self, api: "API") -> None:
         self.api: "API" = api
+        self.sample_pars = ParameterNamesMonitor(
+            api.prefix_pv_name(BLOCK_SERVER_PREFIX + PV_SAMPLE_PARS),
+            SAMPLE_PAR_IDENTIFIER,
+            api.inst_prefix,
+            self.get_sample_par_names,
+        )
+        self.beamline_pars = ParameterNamesMonitor(
+            api.prefix_pv_name(BLOCK_SERVER_PREFIX + PV_BEAMLINE_PARS),
+            BEAMLINE_PAR_IDENTIFIER,
+            api.inst_prefix,
+            self.get_beamline_par_names,
+        )
 
     def _get_pv_value(self, pv: str, as_string: bool = False) -> "PVValue":
         """Just a convenient wrapper for calling the api's get_pv_value method"""
@@ -48,23 +221,28 @@ class BlockServer(object):
 
     @_blockserver_retry
     def get_sample_par_names(self) -> Any:  # noqa: ANN401
-        """Get the current sample parameter names as a list."""
+        """Get the current sample parameter names as a shared list."""
         # Get the names from the blockserver
-        raw = self._get_pv_value(BLOCK_SERVER_PREFIX + "SAMPLE_PARS", True)
-        return dehex_decompress_and_dejson(raw)
+        raw = self._get_pv_value(BLOCK_SERVER_PREFIX + PV_SAMPLE_PARS, True)
+        return dehex_decompress_and_dejson(raw, cached=True)
 
     @_blockserver_retry
     def get_beamline_par_names(self) -> Any:  # noqa: ANN401
-        """Get the current beamline parameter names as a list."""
+        """Get the current beamline parameter names as a shared list."""
         # Get the names from the blockserver
-        raw = self._get_pv_value(BLOCK_SERVER_PREFIX + "BEAMLINE_PARS", True)
-        return dehex_decompress_and_dejson(raw)
+        raw = self._get_pv_value(BLOCK_SERVER_PREFIX + PV_BEAMLINE_PARS, True)
+        return dehex_decompress_and_dejson(raw, cached=True)
+
+    def stop_monitors(self) -> None:
+        """Remove the monitors of the parameter names."""
+        self.sample_pars.stop()
+        self.beamline_pars.stop()
 
     @_blockserver_retry
     def get_runcontrol_settings(self) -> Any:  # noqa: ANN401
-        """Get the current run-control settings."""
+        """Get the current run-control settings as a shared dictionary."""
         raw = self._get_pv_value(BLOCK_SERVER_PREFIX + "GET_RC_PARS", True)
-        return dehex_decompress_and_dejson(raw)
+        return dehex_decompress_and_dejson(raw, cached=True)
 
     def reload_current_config(self) -> None:
         """Reload the current configuration."""
@@ -6,10 +6,14 @@ from __future__ import absolute_import, print_function
 
 import os
 import threading
+import time
 from builtins import object
-from collections.abc import Callable
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future
+from contextlib import ExitStack
 from threading import Event
-from typing import TYPE_CHECKING, Optional, Tuple, TypeVar
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, TypeVar
 
 from CaChannel import CaChannel, CaChannelException, ca
 
@@ -40,13 +44,437 @@ from .channel_access_exceptions import (
     UnableToConnectToPVException,
     WriteAccessException,
 )
-from .utilities import waveform_to_string
+from .genie_monitor_dispatcher import MonitorDispatcher
+from .genie_pv_connection_protocol import MonitoredValue
+from .genie_pv_instrumentation import (
+    CONNECT,
+    GET,
+    INSTRUMENTATION,
+    MONITOR,
+    PUT,
+    PUT_CALLBACK,
+)
+from .utilities import check_break, waveform_to_string
 
 TIMEOUT = 15  # Default timeout for PV set/get
 EXIST_TIMEOUT = 3  # Separate smaller timeout for pv_exists() and searchw() operations
-CACHE = threading.local()
-CACHE_LOCK = threading.local()
+MAX_CACHED_CHANNELS = 1000  # Unreferenced channels above this number are evicted, oldest first
+CHANNEL_IDLE_TIMEOUT = 600  # Unreferenced channels unused for this many seconds are evicted
+MISSING_RETRY_INTERVAL = 30  # PVs not found are reported missing at once for this many seconds
+# Time a new channel is given to connect from when its search starts, even by checks which do not
+# wait, so that a PV which exists is not reported disconnected the first time it is looked for
+NEW_CHANNEL_CONNECT_GRACE = 0.1
+# Longest time to block waiting for a callback before checking for a user interrupt (Ctrl-C)
+BREAK_CHECK_INTERVAL = 0.5
+# First wait between polls for a put callback, doubling up to BREAK_CHECK_INTERVAL
+POLL_INTERVAL = 0.001
+MONITORED_READ_IDLE_TIMEOUT = 60  # Monitored reads not read for this many seconds are unsubscribed
 T = TypeVar("T")
+# Callback for the updates of a channel access subscription: epics arguments and user arguments
+SubscriptionCallback = Callable[[Dict[str, Any], Tuple[Any, ...]], None]
+
+
+class ChannelMetadata(object):
+    """
+    Properties of a channel which do not change while it is connected.
+    """
+
+    def __init__(self, field_type: int, element_count: int, enum_strings: Tuple[str, ...]) -> None:
+        """
+        Constructor.
+
+        Args:
+            field_type: the DBF type of the channel
+            element_count: the number of elements in the channel
+            enum_strings: the state strings of an enum channel; empty for other channels
+        """
+        self.field_type = field_type
+        self.element_count = element_count
+        self.enum_strings = enum_strings
+        # Read from the EGU field when first asked for
+        self.units: Optional[str] = None
+
+
+class _CachedChannel(object):
+    """
+    A channel in the channel cache along with what is needed to share it between threads.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Constructor.
+
+        Args:
+            name: the PV name of the channel
+        """
+        self.name = name
+        self.channel: Optional[CaChannel] = None
+        # A CaChannel holds the result of only one outstanding get, so requests on it are serialised
+        self.lock = threading.RLock()
+        self.connected = Event()
+        self.references = 0
+        self.last_used = time.monotonic()
+        self.connection_callbacks: list[Callable[[bool], None]] = []
+        self.unsubscribe_functions: list[Callable[[], None]] = []
+        self.metadata: Optional[ChannelMetadata] = None
+        # Incremented whenever the metadata may have changed, so stale reads are not cached
+        self.metadata_generation = 0
+        # Until this time the channel is known not to connect, so waits for it fail at once
+        self.missing_until = 0.0
+        # Whether the channel has ever connected, and when its search was started
+        self.ever_connected = False
+        self.searched_at = 0.0
+        # When the search for the channel was started, until it first connects
+        self.search_started: Optional[float] = None
+
+    def invalidate_metadata(self) -> None:
+        """
+        Forget the cached metadata of the channel; it is read again when next needed.
+        """
+        self.metadata_generation += 1
+        self.metadata = None
+
+    def connection_changed(self, epics_args: Tuple[T, ...], _: Tuple[T, ...]) -> None:
+        """
+        Connection callback for the channel; passes the new connection state to any listeners.
+
+        Args:
+            epics_args: channel id and connection operation
+            _: user arguments (not used)
+        """
+        connected = epics_args[1] == ca.CA_OP_CONN_UP
+        # The PV may have been reloaded with different properties
+        self.invalidate_metadata()
+        if connected:
+            self.missing_until = 0.0
+            self.ever_connected = True
+            if self.search_started is not None:
+                INSTRUMENTATION.record(
+                    self.name, CONNECT, time.perf_counter() - self.search_started
+                )
+                self.search_started = None
+            self.connected.set()
+        else:
+            self.connected.clear()
+        for callback in list(self.connection_callbacks):
+            try:
+                callback(connected)
+            except Exception as e:
+                CaChannelWrapper.logError(
+                    "Connection callback for {} failed: {}".format(self.name, e)
+                )
+
+
+class ChannelCache(object):
+    """
+    Process-wide cache of channels, shared between all threads so that each PV is only searched
+    for once.
+
+    Channels that are referenced, e.g. by a monitor, are never evicted. Unreferenced channels are
+    evicted once they have been idle for longer than the idle timeout, or least recently used first
+    when the cache holds more than the maximum number of channels.
+
+    A channel which fails to connect is remembered as missing for the retry interval, during which
+    lookups of it fail at once instead of waiting out their timeout again. The channel keeps
+    searching meanwhile, and is no longer missing as soon as it connects.
+    """
+
+    def __init__(
+        self,
+        max_channels: int = MAX_CACHED_CHANNELS,
+        idle_timeout: float = CHANNEL_IDLE_TIMEOUT,
+        missing_retry_interval: float = MISSING_RETRY_INTERVAL,
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            max_channels: number of channels above which unreferenced channels are evicted
+            idle_timeout: time in seconds after which an unused, unreferenced channel is evicted
+            missing_retry_interval: time in seconds for which a channel that failed to connect is
+                reported missing without waiting; 0 to always wait
+        """
+        self.max_channels = max_channels
+        self.idle_timeout = idle_timeout
+        self.missing_retry_interval = missing_retry_interval
+        self.lock = threading.RLock()
+        self._entries: "OrderedDict[str, _CachedChannel]" = OrderedDict()
+
+    def __len__(self) -> int:
+        with self.lock:
+            return len(self._entries)
+
+    def __contains__(self, name: str) -> bool:
+        with self.lock:
+            return name in self._entries
+
+    def entry(self, name: str) -> _CachedChannel:
+        """
+        Gets the cache entry for a PV, creating it if needed, and marks it as recently used.
+
+        Args:
+            name: the PV name
+
+        Returns:
+            the cache entry; its channel is None if the PV has not been searched for yet
+        """
+        with self.lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                entry = self._entries[name] = _CachedChannel(name)
+            else:
+                self._entries.move_to_end(name)
+            entry.last_used = time.monotonic()
+            self._evict(keep=name)
+            return entry
+
+    def acquire(self, name: str) -> _CachedChannel:
+        """
+        Gets the cache entry for a PV and adds a reference to it so that it is not evicted.
+
+        Args:
+            name: the PV name
+
+        Returns:
+            the cache entry
+        """
+        with self.lock:
+            entry = self.entry(name)
+            entry.references += 1
+            return entry
+
+    def release(self, name: str) -> None:
+        """
+        Removes a reference added by acquire.
+
+        Args:
+            name: the PV name
+        """
+        with self.lock:
+            entry = self._entries.get(name)
+            if entry is not None and entry.references > 0:
+                entry.references -= 1
+                entry.last_used = time.monotonic()
+
+    def channels(self) -> list[CaChannel]:
+        """
+        Returns:
+            all channels which have been searched for
+        """
+        with self.lock:
+            return [entry.channel for entry in self._entries.values() if entry.channel is not None]
+
+    def clear(self) -> None:
+        """
+        Removes all channels from the cache and closes them.
+        """
+        with self.lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            if entry.channel is not None:
+                entry.channel.clear_channel()
+
+    def _evict(self, keep: str) -> None:
+        """
+        Evict idle channels, and the least recently used channels while the cache is too large.
+        Channels which are referenced or are in use are skipped.
+
+        Args:
+            keep: name of the PV being requested, which is never evicted
+        """
+        now = time.monotonic()
+        excess = len(self._entries) - self.max_channels
+        for name, entry in list(self._entries.items()):
+            if excess <= 0 and now - entry.last_used < self.idle_timeout:
+                # entries are in least recently used order so all the rest are newer
+                break
+            if name == keep or entry.references > 0 or not entry.lock.acquire(blocking=False):
+                continue
+            try:
+                del self._entries[name]
+                excess -= 1
+                if entry.channel is not None:
+                    entry.channel.clear_channel()
+            finally:
+                entry.lock.release()
+
+
+CACHE = ChannelCache()
+
+
+class _SharedSubscription(object):
+    """
+    A channel access subscription shared by any number of callbacks. Each update is sent once by
+    the IOC and passed on to every callback.
+    """
+
+    def __init__(self, key: Tuple[str, int, Optional[int], Optional[bool]]) -> None:
+        """
+        Constructor.
+
+        Args:
+            key: PV name, DBR type, event mask and use_numpy of the subscription
+        """
+        self.key = key
+        self.channel: Optional[CaChannel] = None
+        self.callbacks: list[SubscriptionCallback] = []
+        # The latest update, passed to callbacks as they are added since CA only sends the current
+        # value when a subscription is created
+        self.last_update: Optional[dict[str, Any]] = None
+        # Callbacks added or about to be added; the subscription is closed when this reaches zero
+        self.references = 0
+        self.lock = threading.Lock()
+
+    def connected(self) -> bool:
+        """
+        Returns:
+            whether the channel of the subscription is connected
+        """
+        return self.channel is not None and self.channel.state() == ca.cs_conn
+
+    def update(self, epics_args: Dict[str, Any], user_args: Tuple[Any, ...]) -> None:
+        """
+        Monitor callback of the subscription; passes the update to every callback.
+
+        Args:
+            epics_args: the update
+            user_args: user arguments
+        """
+        INSTRUMENTATION.record(self.key[0], MONITOR, value=epics_args)
+        with self.lock:
+            self.last_update = epics_args
+            callbacks = list(self.callbacks)
+        for callback in callbacks:
+            try:
+                callback(epics_args, user_args)
+            except Exception as e:
+                CaChannelWrapper.logError(
+                    "Monitor callback for {} failed: {}".format(self.key[0], e)
+                )
+
+    def close(self) -> None:
+        """
+        Remove the subscription from channel access.
+        """
+        with self.lock:
+            if self.channel is not None:
+                self.channel.clear_channel()
+                self.channel = None
+            self.callbacks = []
+            self.last_update = None
+
+
+# Subscriptions by PV name, DBR type, event mask and use_numpy
+SUBSCRIPTIONS: dict[Tuple[str, int, Optional[int], Optional[bool]], _SharedSubscription] = {}
+SUBSCRIPTIONS_LOCK = threading.Lock()
+
+# Runs the callbacks of monitors added with dispatch, off the channel access threads
+MONITOR_DISPATCHER = MonitorDispatcher(
+    error_handler=lambda message: CaChannelWrapper.logError(message)
+)
+
+
+class _DispState(object):
+    """
+    Whether writes to a record are disabled by its DISP field, kept up to date by a monitor.
+    """
+
+    def __init__(self) -> None:
+        # True if DISP is set, False if it is not set or the record has no DISP field, None if
+        # not known so it must be read
+        self.disabled: Optional[bool] = None
+        self.watched = False
+        self.monitored = False
+        self.lock = threading.Lock()
+
+
+class _MonitoredRead(object):
+    """
+    A subscription holding the latest value of a PV, so that reads need no channel access.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Constructor.
+
+        Args:
+            name: the PV name
+        """
+        self.name = name
+        self.subscription: Optional[_SharedSubscription] = None
+        self.unsubscribe: Optional[Callable[[], None]] = None
+        self.value: Optional[MonitoredValue] = None
+        # When the value was last received, from the monitor or from a get
+        self.received = time.monotonic()
+        self.last_read = time.monotonic()
+        self.lock = threading.Lock()
+
+    def update(self, value: MonitoredValue) -> None:
+        """
+        Store a newly received value.
+
+        Args:
+            value: the new value
+        """
+        self.value = value
+        self.received = time.monotonic()
+
+    def close(self) -> None:
+        """
+        Remove the subscription.
+        """
+        if self.unsubscribe is not None:
+            self.unsubscribe()
+            self.unsubscribe = None
+            self.subscription = None
+        self.value = None
+
+
+# Monitored reads by PV name and how they are read (as a string, as numpy)
+MONITORED_READS: dict[Tuple[str, bool, Optional[bool]], _MonitoredRead] = {}
+MONITORED_READS_LOCK = threading.Lock()
+
+
+# DISP state of each record that has been written to, by record name
+DISP_STATES: dict[str, _DispState] = {}
+DISP_STATES_LOCK = threading.Lock()
+
+
+class _PutCompletion(object):
+    """
+    Counts the completion callbacks of a group of puts, setting an event once all have fired.
+    """
+
+    def __init__(self, count: int) -> None:
+        """
+        Constructor.
+
+        Args:
+            count: the number of puts in the group
+        """
+        self.event = Event()
+        self.failures: Dict[str, Exception] = {}
+        self._remaining = count
+        self._lock = threading.Lock()
+        if count == 0:
+            self.event.set()
+
+    def put_complete(self, epics_args: dict[str, int], user_args: Tuple[str, ...]) -> None:
+        """
+        Callback for each put in the group.
+
+        Args:
+            epics_args: the results of the put
+            user_args: the PV name of the put
+        """
+        with self._lock:
+            status = epics_args.get("status", ca.ECA_NORMAL)
+            if status != ca.ECA_NORMAL:
+                self.failures[user_args[0]] = CaChannelException(status)
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self.event.set()
 
 
 class CaChannelWrapper(object):
@@ -184,16 +612,18 @@ class CaChannelWrapper(object):
             InvalidEnumStringException: If the PV is an enum and the string value supplied is not a
             valid enum value.
         """
-        chan = CaChannelWrapper.get_chan(name)
-        chan.setTimeout(timeout)
+        entry, chan = CaChannelWrapper._get_cached_channel(name)
+        with entry.lock:
+            chan.setTimeout(timeout)
 
-        # Validate user input and format accordingly for mbbi/bi records
-        value = CaChannelWrapper.check_for_enum_value(value, chan, name)
+            # Validate user input and format accordingly for mbbi/bi records
+            value = CaChannelWrapper.check_for_enum_value(value, chan, name)
 
-        if not chan.write_access():
-            raise WriteAccessException(name)
+            if not chan.write_access():
+                raise WriteAccessException(name)
         if safe_not_quick:
             CaChannelWrapper._check_for_disp(name)
+        start = time.perf_counter()
         if wait:
             ftype = chan.field_type()
             ecount = chan.element_count()
@@ -204,25 +634,212 @@ class CaChannelWrapper(object):
             # putw() flushes send buffer, but doesn't wait for a CA completion callback
             # Write value to PV, or produce error
             chan.putw(value)
+        INSTRUMENTATION.record(
+            name, PUT_CALLBACK if wait else PUT, time.perf_counter() - start, value
+        )
+
+    @staticmethod
+    def set_pv_values(
+        values: "Mapping[str, PVValue|bytes]",
+        wait: bool = False,
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> Dict[str, Exception]:
+        """
+        Set several PVs at once. The puts are all sent in a single flush rather than one at a time.
+
+        Args:
+            values: dictionary of PV name to the value to set it to
+            wait (bool, optional): Wait for every put to complete before returning.
+            timeout (optional): How long to wait for the PVs to connect etc.
+            safe_not_quick (bool): True run all checks while setting the pvs, False don't run
+                checks just write the values, e.g. disp check
+
+        Returns:
+            dictionary of PV name to the exception raised for each PV that could not be set; the
+            other PVs are still set
+        """
+        channels, errors = CaChannelWrapper._get_cached_channels(values, EXIST_TIMEOUT)
+        puts: list[Tuple[str, CaChannel, "PVValue|bytes"]] = []
+        for name, (entry, chan) in channels.items():
+            try:
+                with entry.lock:
+                    chan.setTimeout(timeout)
+                    value = CaChannelWrapper.check_for_enum_value(values[name], chan, name)
+                    if not chan.write_access():
+                        raise WriteAccessException(name)
+                if safe_not_quick:
+                    CaChannelWrapper._check_for_disp(name)
+                puts.append((name, chan, value))
+            except Exception as e:
+                errors[name] = e
+
+        start = time.perf_counter()
+        completion = _PutCompletion(len(puts) if wait else 0)
+        sent = []
+        for name, chan, value in puts:
+            try:
+                if wait:
+                    ftype = chan.field_type()
+                    ecount = chan.element_count()
+                    chan.array_put_callback(value, ftype, ecount, completion.put_complete, name)
+                else:
+                    chan.array_put(value)
+                sent.append((name, chan, value))
+            except CaChannelException as e:
+                errors[name] = e
+                if wait:
+                    completion.put_complete({}, (name,))
+        # Failed puts are left out by rebuilding the list; remove() would compare the values,
+        # which fails for arrays
+        puts = sent
+        if not puts:
+            return errors
+
+        # flush_io sends the puts of every channel, not just this one
+        chan = puts[0][1]
+        chan.flush_io()
+        if wait:
+            CaChannelWrapper._wait_for_pend_event(chan, completion.event, timeout=None)
+            errors.update(completion.failures)
+        if INSTRUMENTATION.enabled:
+            # The puts are sent and waited for together, so each takes as long as all of them
+            latency = time.perf_counter() - start
+            for name, _, value in puts:
+                INSTRUMENTATION.record(name, PUT_CALLBACK if wait else PUT, latency, value)
+        return errors
+
+    @staticmethod
+    def put_async(
+        name: str,
+        value: "PVValue|bytes",
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> "Future[None]":
+        """
+        Start setting a PV to a value, without waiting for the put to complete. Several puts can
+        be started and then waited for together, e.g. to move motors on different controllers at
+        the same time and wait only as long as the slowest.
+
+        Args:
+            name (string): The PV name.
+            value: The value to set.
+            timeout (optional): How long to wait for the PV to connect etc.
+            safe_not_quick (bool): True run all checks while setting the pv, False don't run checks
+                just write the value, e.g. disp check
+
+        Returns:
+            a future whose result is set when the put completes, e.g. when a motor has finished
+            moving, or whose exception is set if the put fails
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV.
+            WriteAccessException: If write access is denied.
+            InvalidEnumStringException: If the PV is an enum and the string value supplied is not a
+            valid enum value.
+        """
+        entry, chan = CaChannelWrapper._get_cached_channel(name)
+        with entry.lock:
+            chan.setTimeout(timeout)
+            value = CaChannelWrapper.check_for_enum_value(value, chan, name)
+            if not chan.write_access():
+                raise WriteAccessException(name)
+        if safe_not_quick:
+            CaChannelWrapper._check_for_disp(name)
+
+        future: "Future[None]" = Future()
+        future.set_running_or_notify_cancel()
+        start = time.perf_counter()
+
+        def _put_complete(epics_args: dict[str, int], _: Tuple[T, ...]) -> None:
+            INSTRUMENTATION.record(name, PUT_CALLBACK, time.perf_counter() - start, value)
+            status = epics_args.get("status", ca.ECA_NORMAL)
+            if status != ca.ECA_NORMAL:
+                future.set_exception(CaChannelException(status))
+            else:
+                future.set_result(None)
+
+        chan.array_put_callback(value, chan.field_type(), chan.element_count(), _put_complete)
+        chan.flush_io()
+        return future
 
     @staticmethod
     def _check_for_disp(name: str) -> None:
         """
         Check if DISP is set on a PV. If passed a field instead of a PV, do nothing.
         Only check DISP if it exists.
+
+        The DISP field is read the first time a record is written to and then kept up to date by
+        a monitor, so later checks do not need any channel access. A record without a DISP field
+        is remembered as such until a DISP field for it connects.
         """
         if (
             ".DISP" not in name
         ):  # Do not check for DISP if it's already in the name of the PV to check
             if "." in name:  # If given a field on a PV, check the PV itself if DISP is set
                 name = name.split(".")[0]
-            _disp_name = "{}.DISP".format(name)
-            if (
-                CaChannelWrapper.pv_exists(_disp_name, 0)
-                and CaChannelWrapper.get_pv_value(_disp_name) != "0"
-            ):
+            with DISP_STATES_LOCK:
+                state = DISP_STATES.get(name)
+                if state is None:
+                    state = DISP_STATES[name] = _DispState()
+            disabled = state.disabled
+            if disabled is None:
+                disabled = CaChannelWrapper._read_disp_state(name, state)
+            if disabled:
                 raise WriteAccessException("{} (DISP is set)".format(name))
 
+    @staticmethod
+    def _read_disp_state(name: str, state: _DispState) -> bool:
+        """
+        Read whether DISP is set on a record, monitoring the DISP field if it exists.
+
+        Args:
+            name: the record name
+            state: the cached DISP state of the record
+
+        Returns:
+            True if DISP is set; False otherwise
+        """
+        disp_name = "{}.DISP".format(name)
+        with state.lock:
+            if state.disabled is not None:
+                return state.disabled
+            if state.monitored:
+                # The DISP field has disconnected; read it directly until the monitor reconnects
+                return (
+                    CaChannelWrapper.pv_exists(disp_name, EXIST_TIMEOUT)
+                    and CaChannelWrapper.get_pv_value(disp_name) != "0"
+                )
+
+            if not state.watched:
+                # Keep the DISP channel in the cache, searching if it does not exist, so the record
+                # is checked again if the field appears
+                entry = CACHE.acquire(disp_name)
+
+                def _disp_connection_changed(connected: bool) -> None:
+                    if not connected or not state.monitored:
+                        state.disabled = None
+
+                entry.connection_callbacks.append(_disp_connection_changed)
+                state.watched = True
+
+            # Give the DISP channel the usual time to connect; a record is only remembered as
+            # having no DISP field once its channel has failed to connect in that time
+            if not CaChannelWrapper.pv_exists(disp_name, EXIST_TIMEOUT):
+                state.disabled = False
+                return False
+
+            def _disp_changed(value: "PVValue", _: Optional[str], __: Optional[str]) -> None:
+                state.disabled = value != "0"
+
+            disabled = CaChannelWrapper.get_pv_value(disp_name) != "0"
+            state.disabled = disabled
+            CaChannelWrapper.add_monitor(
+                disp_name, _disp_changed, link_alarm_on_disconnect=False, to_string=True
+            )
+            state.monitored = True
+            return disabled
+
     @staticmethod
     def get_chan(name: str, timeout: float = EXIST_TIMEOUT) -> CaChannel:
         """
@@ -238,36 +855,221 @@ class CaChannelWrapper(object):
         Raises:
             UnableToConnectToPVException if it was unable to connect to the channel
         """
+        return CaChannelWrapper._get_cached_channel(name, timeout)[1]
 
-        try:
-            lock = CACHE_LOCK.lock
-        except AttributeError:
-            lock = CACHE_LOCK.lock = threading.RLock()
+    @staticmethod
+    def _get_cached_channel(
+        name: str, timeout: float = EXIST_TIMEOUT
+    ) -> Tuple[_CachedChannel, CaChannel]:
+        """
+        Gets the cache entry of a connected channel. The channel is searched for if this is the
+        first time it has been asked for in this process, otherwise the existing channel is used.
 
-        with lock:
-            try:
-                pv_map = CACHE.map
-            except AttributeError:
-                pv_map = CACHE.map = {}
+        Args:
+            name: the name of the channel to get
+            timeout: how long to wait for the channel to connect
 
-            if name in list(pv_map.keys()) and pv_map[name].state() == ca.cs_conn:
-                chan = pv_map[name]
-            else:
+        Returns:
+            the cache entry of the channel and the connected channel
+
+        Raises:
+            UnableToConnectToPVException if it was unable to connect to the channel
+        """
+        entry, chan = CaChannelWrapper._search_for_channel(name, timeout)
+
+        # A channel which is not connected keeps searching in the background, so wait on it rather
+        # than starting a new search
+        CaChannelWrapper._wait_for_connection(entry, timeout)
+        return entry, chan
+
+    @staticmethod
+    def _search_for_channel(
+        name: str, timeout: float, flush: bool = True
+    ) -> Tuple[_CachedChannel, CaChannel]:
+        """
+        Gets the cache entry of a channel, starting a search for it if this is the first time it
+        has been asked for in this process. Does not wait for the channel to connect.
+
+        Args:
+            name: the name of the channel to get
+            timeout: timeout to set on a new channel
+            flush: whether to send the search request now; False when searching for several
+                channels, so that the caller sends them all with one flush
+
+        Returns:
+            the cache entry of the channel and the channel
+
+        Raises:
+            UnableToConnectToPVException if the search could not be started
+        """
+        entry = CACHE.entry(name)
+        with entry.lock:
+            chan = entry.channel
+            if chan is not None and chan.state() == ca.cs_conn:
+                return entry, chan
+
+            if os.getenv("GITHUB_ACTIONS"):
+                # genie_python does some PV accesses on import. To avoid them timing out and making
+                # CI builds really slow, shortcut every PV to "non-existent" here.
+                raise UnableToConnectToPVException(name, "In CI")
+
+            if chan is None:
                 chan = CaChannel(name)
                 # do not install handlers if server
                 if os.getenv("EPICS_CAS_INTF_ADDR_LIST") is None:
                     # noinspection PyTypeChecker
                     CaChannelWrapper.installHandlers(chan)
                 chan.setTimeout(timeout)
-                # Try to connect - throws if cannot
-                CaChannelWrapper.connect_to_pv(chan)
-                pv_map[name] = chan
-        return chan
+                if INSTRUMENTATION.enabled:
+                    entry.search_started = time.perf_counter()
+                entry.searched_at = time.monotonic()
+                try:
+                    chan.search_and_connect(None, entry.connection_changed)
+                except CaChannelException as e:
+                    raise UnableToConnectToPVException(name, str(e))
+                if flush:
+                    chan.flush_io()
+                entry.channel = chan
+        return entry, chan
+
+    @staticmethod
+    def _get_cached_channels(
+        names: Iterable[str], timeout: float
+    ) -> Tuple[Dict[str, Tuple[_CachedChannel, CaChannel]], Dict[str, Exception]]:
+        """
+        Gets the cache entries of several connected channels. Searches for all the channels are
+        sent together before waiting for any of them, so the channels connect in parallel and the
+        wait is as long as for the slowest channel rather than the sum of them all.
+
+        Args:
+            names: the names of the channels to get
+            timeout: how long to wait for all the channels to connect
+
+        Returns:
+            tuple of: (dictionary of name to cache entry and connected channel, dictionary of name
+            to the exception raised for each channel which could not be connected)
+        """
+        channels, errors = CaChannelWrapper._search_for_channels(names, timeout)
+        deadline = time.monotonic() + timeout
+        for name, (entry, _) in list(channels.items()):
+            try:
+                CaChannelWrapper._wait_for_connection(entry, max(deadline - time.monotonic(), 0))
+            except UnableToConnectToPVException as e:
+                errors[name] = e
+                del channels[name]
+        return channels, errors
+
+    @staticmethod
+    def _search_for_channels(
+        names: Iterable[str], timeout: float
+    ) -> Tuple[Dict[str, Tuple[_CachedChannel, CaChannel]], Dict[str, Exception]]:
+        """
+        Gets the cache entries of several channels, starting searches for any which are new with
+        a single flush. Does not wait for the channels to connect.
+
+        Args:
+            names: the names of the channels to get
+            timeout: timeout to set on new channels
+
+        Returns:
+            tuple of: (dictionary of name to cache entry and channel, dictionary of name to the
+            exception raised for each channel which could not be searched for)
+        """
+        channels: Dict[str, Tuple[_CachedChannel, CaChannel]] = {}
+        errors: Dict[str, Exception] = {}
+        searched = False
+        for name in names:
+            if name in channels or name in errors:
+                continue
+            searched = searched or CACHE.entry(name).channel is None
+            try:
+                channels[name] = CaChannelWrapper._search_for_channel(name, timeout, flush=False)
+            except UnableToConnectToPVException as e:
+                errors[name] = e
+
+        # flush_io acts on the whole channel access context, so one flush sends every search
+        if searched:
+            for _, chan in channels.values():
+                chan.flush_io()
+                break
+        return channels, errors
+
+    @staticmethod
+    def connected_pvs(names: Iterable[str], timeout: float = EXIST_TIMEOUT) -> list[str]:
+        """
+        Find which of several PVs exist. All the PVs are searched for at once, so this takes as
+        long as the slowest PV rather than the sum of them all.
+
+        Args:
+            names: the PV names
+            timeout (optional): How long to wait for the PVs to "appear".
+
+        Returns:
+            the names of the PVs which exist, in the order given
+        """
+        names = list(names)
+        channels, _ = CaChannelWrapper._get_cached_channels(names, timeout)
+        return [name for name in names if name in channels]
+
+    @staticmethod
+    def search_for_pvs(names: Iterable[str], timeout: float = EXIST_TIMEOUT) -> None:
+        """
+        Start searching for PVs which are likely to be needed soon, without waiting for them to
+        connect, so that later accesses find the channels already connected.
+
+        Args:
+            names: the PV names
+            timeout (optional): timeout to set on the new channels
+        """
+        CaChannelWrapper._search_for_channels(names, timeout)
+
+    @staticmethod
+    def _wait_for_connection(entry: _CachedChannel, timeout: float) -> None:
+        """
+        Wait for a cached channel to connect. A channel which has never connected is waited for
+        until at least NEW_CHANNEL_CONNECT_GRACE after its search started, even if the timeout is
+        shorter.
+
+        Args:
+            entry: the cache entry of the channel
+            timeout: how long to wait
+
+        Raises:
+            UnableToConnectToPVException: If the channel does not connect in time.
+        """
+        if not entry.connected.is_set() and time.monotonic() < entry.missing_until:
+            raise UnableToConnectToPVException(entry.name, "Not found (searched recently)")
+
+        wait = timeout
+        if not entry.ever_connected:
+            # A new channel is given time to connect however short the timeout
+            wait = max(timeout, entry.searched_at + NEW_CHANNEL_CONNECT_GRACE - time.monotonic())
+
+        # we do not need to call pend_event / poll as we are using preemptive callbacks
+        if not CaChannelWrapper._wait_for_event(entry.connected, wait):
+            # A check which does not wait is no evidence that the PV does not exist
+            if timeout > 0:
+                entry.missing_until = time.monotonic() + CACHE.missing_retry_interval
+            raise UnableToConnectToPVException(entry.name, "Connection timeout (event)")
+
+        if entry.channel is None or entry.channel.state() != ca.cs_conn:
+            raise UnableToConnectToPVException(entry.name, "Connection timeout (state)")
 
     @staticmethod
     def clear_monitor(name: str, timeout: float = EXIST_TIMEOUT) -> None:
-        channel = CaChannelWrapper.get_chan(name, timeout)
-        channel.clear_channel()
+        """
+        Clear the monitors on a PV. The channel stays open for other users of the cache.
+
+        Args:
+            name: the PV name
+            timeout: how long to wait for the PV to connect
+        """
+        entry, chan = CaChannelWrapper._get_cached_channel(name, timeout)
+        for unsubscribe in list(entry.unsubscribe_functions):
+            unsubscribe()
+        with entry.lock:
+            chan.clear_event()
+        chan.flush_io()
 
     @staticmethod
     def get_pv_value(
@@ -290,32 +1092,175 @@ class CaChannelWrapper(object):
             UnableToConnectToPVException: If cannot connect to PV.
             ReadAccessException: If read access is denied.
         """
-        chan = CaChannelWrapper.get_chan(name)
-        chan.setTimeout(timeout)
-        if not chan.read_access():
-            raise ReadAccessException(name)
-        ftype = chan.field_type()
-        if ca.dbr_type_is_ENUM(ftype) or ca.dbr_type_is_CHAR(ftype) or ca.dbr_type_is_STRING(ftype):
-            to_string = True
-        if to_string:
-            if ca.dbr_type_is_ENUM(ftype) or ca.dbr_type_is_STRING(ftype):
-                value = chan.getw(ca.DBR_STRING)
+        entry, chan = CaChannelWrapper._get_cached_channel(name)
+        with entry.lock:
+            chan.setTimeout(timeout)
+            if not chan.read_access():
+                raise ReadAccessException(name)
+            req_type, to_string = CaChannelWrapper._request_type(chan, to_string)
+            start = time.perf_counter()
+            if to_string or use_numpy is None:
+                value = chan.getw(req_type)
             else:
-                # If we get a numeric using ca.DBR_CHAR the value still comes back as a numeric
-                # In other words, it does not get cast to char
-                value = chan.getw(ca.DBR_CHAR)
-            # Could see if the element count is > 1 instead
-            if isinstance(value, list):
-                return waveform_to_string(value)
-            else:
-                return str(value)
-        else:
+                value = chan.getw(req_type, use_numpy=use_numpy)
+        latency = time.perf_counter() - start
+        value = CaChannelWrapper._format_value(value, to_string)
+        INSTRUMENTATION.record(name, GET, latency, value)
+        return value
+
+    @staticmethod
+    def get_waveform(
+        name: str, timeout: float = TIMEOUT, use_numpy: bool | None = True
+    ) -> "PVValue":
+        """
+        Get the valid elements of a waveform PV, i.e. the first NORD elements rather than all NELM
+        of them, in a single request. Only the valid elements are sent by the IOC, and with numpy
+        they are returned in a numpy array without going through a list.
+
+        Args:
+            name: The PV.
+            timeout (optional): How long to wait for the PV to connect etc.
+            use_numpy (None|boolean): True use numpy to return arrays, False return a list;
+            None for use the default
+
+        Returns:
+            The valid elements of the waveform.
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV or the get fails.
+            ReadAccessException: If read access is denied.
+        """
+        entry, chan = CaChannelWrapper._get_cached_channel(name)
+        result: dict[str, Any] = {}
+        event = Event()
+
+        def _got_value(epics_args: dict[str, Any], _: Tuple[T, ...]) -> None:
+            result.update(epics_args)
+            event.set()
+
+        with entry.lock:
+            chan.setTimeout(timeout)
+            if not chan.read_access():
+                raise ReadAccessException(name)
+            # A count of zero asks the IOC for the current number of elements of the array
+            start = time.perf_counter()
             if use_numpy is None:
-                output = chan.getw()
+                chan.array_get_callback(chan.field_type(), 0, _got_value)
             else:
-                output = chan.getw(use_numpy=use_numpy)
-            assert not isinstance(output, dict)
-            return output
+                chan.array_get_callback(chan.field_type(), 0, _got_value, use_numpy=use_numpy)
+            chan.flush_io()
+            if not CaChannelWrapper._wait_for_event(event, timeout, chan):
+                raise UnableToConnectToPVException(name, "Get timeout")
+
+        status = result.get("status", ca.ECA_NORMAL)
+        if status != ca.ECA_NORMAL:
+            raise UnableToConnectToPVException(name, ca.message(status))
+        INSTRUMENTATION.record(name, GET, time.perf_counter() - start, result)
+        return result["pv_value"]
+
+    @staticmethod
+    def get_pv_values(
+        names: Iterable[str],
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: bool | None = None,
+    ) -> Tuple[Dict[str, "PVValue"], Dict[str, Exception]]:
+        """
+        Get the current values of several PVs at once. The requests for all the PVs are sent
+        together and waited for once, rather than making a round trip for each PV.
+
+        Args:
+            names: The PVs.
+            to_string (bool, optional): Whether to convert the values to strings.
+            timeout (optional): How long to wait for the values.
+            use_numpy (None|boolean): True use numpy to return arrays, False return a list;
+            None for use the default
+
+        Returns:
+            tuple of: (dictionary of PV name to value, dictionary of PV name to the exception
+            raised for each PV that could not be read)
+        """
+        values: Dict[str, "PVValue"] = {}
+        channels, errors = CaChannelWrapper._get_cached_channels(names, EXIST_TIMEOUT)
+
+        start = time.perf_counter()
+        # Locks are taken in name order so that concurrent bulk reads can not deadlock
+        with ExitStack() as stack:
+            requested: Dict[str, Tuple[CaChannel, bool]] = {}
+            for name in sorted(channels):
+                entry, chan = channels[name]
+                stack.enter_context(entry.lock)
+                try:
+                    if not chan.read_access():
+                        raise ReadAccessException(name)
+                    req_type, as_string = CaChannelWrapper._request_type(chan, to_string)
+                    if as_string or use_numpy is None:
+                        chan.array_get(req_type)
+                    else:
+                        chan.array_get(req_type, use_numpy=use_numpy)
+                    requested[name] = (chan, as_string)
+                except (ReadAccessException, CaChannelException) as e:
+                    errors[name] = e
+
+            if requested:
+                # pend_io flushes and waits for all outstanding gets, not just this channel's
+                try:
+                    next(iter(requested.values()))[0].pend_io(timeout)
+                except CaChannelException as e:
+                    errors.update((name, e) for name in requested)
+                    requested.clear()
+
+            # The gets are sent and waited for together, so each takes as long as all of them
+            latency = time.perf_counter() - start
+            for name, (chan, as_string) in requested.items():
+                value = chan.getValue()
+                INSTRUMENTATION.record(name, GET, latency, value)
+                values[name] = CaChannelWrapper._format_value(value, as_string)
+        return values, errors
+
+    @staticmethod
+    def _request_type(chan: CaChannel, to_string: bool) -> Tuple[Optional[int], bool]:
+        """
+        Works out which type to request the value of a channel as.
+
+        Args:
+            chan: the connected channel
+            to_string: whether the value was asked for as a string
+
+        Returns:
+            tuple of: (the DBR type to request, None for the native type; whether the value should
+            be returned as a string)
+        """
+        ftype = chan.field_type()
+        if ca.dbr_type_is_ENUM(ftype) or ca.dbr_type_is_CHAR(ftype) or ca.dbr_type_is_STRING(ftype):
+            to_string = True
+        if not to_string:
+            return None, False
+        if ca.dbr_type_is_ENUM(ftype) or ca.dbr_type_is_STRING(ftype):
+            return ca.DBR_STRING, True
+        # If we get a numeric using ca.DBR_CHAR the value still comes back as a numeric
+        # In other words, it does not get cast to char
+        return ca.DBR_CHAR, True
+
+    @staticmethod
+    def _format_value(value: "PVValue|dict[Any, Any]", to_string: bool) -> "PVValue":
+        """
+        Formats a value read from a channel.
+
+        Args:
+            value: the value read
+            to_string: whether to return the value as a string
+
+        Returns:
+            the value
+        """
+        assert not isinstance(value, dict)
+        if not to_string:
+            return value
+        # Could see if the element count is > 1 instead
+        if isinstance(value, list):
+            return waveform_to_string(value)
+        return str(value)
 
     @staticmethod
     def get_pv_timestamp(name: str, timeout: float = TIMEOUT) -> Tuple[int, int]:
@@ -333,12 +1278,13 @@ class CaChannelWrapper(object):
             UnableToConnectToPVException: If cannot connect to PV.
             ReadAccessException: If read access is denied.
         """
-        chan = CaChannelWrapper.get_chan(name)
-        chan.setTimeout(timeout)
-        if not chan.read_access():
-            raise ReadAccessException(name)
-        ftype = chan.field_type()
-        info = chan.getw(dbf_type_to_DBR_TIME(ftype))
+        entry, chan = CaChannelWrapper._get_cached_channel(name)
+        with entry.lock:
+            chan.setTimeout(timeout)
+            if not chan.read_access():
+                raise ReadAccessException(name)
+            ftype = chan.field_type()
+            info = chan.getw(dbf_type_to_DBR_TIME(ftype))
         assert isinstance(info, dict)
         return info["pv_seconds"], info["pv_nseconds"]
 
@@ -355,8 +1301,7 @@ class CaChannelWrapper(object):
             True if exists, otherwise False.
         """
         try:
-            chan = CaChannelWrapper.get_chan(name, timeout)
-            CaChannelWrapper.connect_to_pv(chan)
+            CaChannelWrapper._get_cached_channel(name, timeout)
             return True
         except UnableToConnectToPVException:
             return False
@@ -389,14 +1334,7 @@ class CaChannelWrapper(object):
         ca_channel.flush_io()
 
         # we do not need to call pend_event / poll as we are using preemptive callbacks
-        time_elapsed = 0.0
-        interval = 0.1
-        while True:
-            time_elapsed += interval
-            if event.wait(interval) or time_elapsed >= ca_channel.getTimeout():
-                break
-
-        if not event.is_set():
+        if not CaChannelWrapper._wait_for_event(event, ca_channel.getTimeout()):
             raise UnableToConnectToPVException(ca_channel.name(), "Connection timeout (event)")
 
         if ca_channel.state() != ca.cs_conn:
@@ -420,18 +1358,370 @@ class CaChannelWrapper(object):
         """
         # If PV is MBBI/BI type, search list of enum values and iterate to find a match
         if ca.dbr_type_is_ENUM(chan.field_type()) and isinstance(value, str):
-            chan.array_get(ca.DBR_CTRL_ENUM)
-            chan.pend_io()
-            channel_properties = chan.getValue()
-            for index, enum_value in enumerate(channel_properties["pv_statestrings"]):
+            enum_strings = CaChannelWrapper._get_metadata(CACHE.entry(name), chan).enum_strings
+            for index, enum_value in enumerate(enum_strings):
                 if enum_value.lower() == value.lower():
                     # Replace user input with enum index value
                     return index
             # If the string entered isn't valid then throw
-            raise InvalidEnumStringException(name, channel_properties["pv_statestrings"])
+            raise InvalidEnumStringException(name, str(enum_strings))
+
+        return value
+
+    @staticmethod
+    def get_metadata(name: str, timeout: float = EXIST_TIMEOUT) -> ChannelMetadata:
+        """
+        Get the properties of a channel which do not change while it is connected: field type,
+        element count and enum strings. These are read once per connection and then cached.
+
+        Args:
+            name: the PV name
+            timeout: how long to wait for the PV to connect
+
+        Returns:
+            the metadata of the channel
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV.
+        """
+        entry, chan = CaChannelWrapper._get_cached_channel(name, timeout)
+        return CaChannelWrapper._get_metadata(entry, chan)
+
+    @staticmethod
+    def get_units(name: str) -> str:
+        """
+        Get the engineering units of a PV from its EGU field. These are read once per connection
+        of the PV and then cached.
+
+        Args:
+            name: the PV name, without a field
+
+        Returns:
+            the units
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to the PV or its EGU field.
+        """
+        metadata = CaChannelWrapper.get_metadata(name)
+        if metadata.units is None:
+            metadata.units = str(CaChannelWrapper.get_pv_value("{}.EGU".format(name)))
+        return metadata.units
+
+    @staticmethod
+    def _get_metadata(entry: _CachedChannel, chan: CaChannel) -> ChannelMetadata:
+        """
+        Get the metadata of a channel, reading it if it is not cached.
+
+        Args:
+            entry: the cache entry of the channel
+            chan: the connected channel
+
+        Returns:
+            the metadata of the channel
+        """
+        with entry.lock:
+            metadata = entry.metadata
+            if metadata is not None and entry.channel is chan:
+                return metadata
+
+            generation = entry.metadata_generation
+            field_type = chan.field_type()
+            enum_strings: Tuple[str, ...] = ()
+            if ca.dbr_type_is_ENUM(field_type):
+                chan.array_get(ca.DBR_CTRL_ENUM)
+                chan.pend_io()
+                channel_properties = chan.getValue()
+                enum_strings = tuple(channel_properties["pv_statestrings"])
+            metadata = ChannelMetadata(field_type, chan.element_count(), enum_strings)
+            # Do not cache metadata read from a channel which has since reconnected
+            if entry.channel is chan and entry.metadata_generation == generation:
+                entry.metadata = metadata
+            return metadata
+
+    @staticmethod
+    def add_metadata_monitor(name: str) -> Callable[[], None]:
+        """
+        Keep the cached metadata of a PV up to date while it is connected, by forgetting it
+        whenever the PV posts a property change (DBE_PROPERTY), e.g. new enum strings or units.
+        Without this the metadata is only refreshed when the PV reconnects.
+
+        The property subscription is shared with any other property monitors of the PV.
+
+        Args:
+            name: the PV name
+
+        Returns:
+            unsubscribe function
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV.
+        """
+        entry = CACHE.acquire(name)
+        try:
+            field_type = CaChannelWrapper._get_cached_channel(name)[1].field_type()
+
+            def _properties_changed(epics_args: dict[str, str], _: Tuple[T, ...]) -> None:
+                entry.invalidate_metadata()
+
+            _, unsubscribe_properties = CaChannelWrapper._subscribe(
+                name, dbf_type_to_DBR_STS(field_type), ca.DBE_PROPERTY, _properties_changed
+            )
+        except Exception:
+            CACHE.release(name)
+            raise
+
+        subscribed = True
+
+        def _unsubscribe() -> None:
+            nonlocal subscribed
+            if subscribed:
+                subscribed = False
+                unsubscribe_properties()
+                CACHE.release(name)
+
+        return _unsubscribe
+
+    @staticmethod
+    def _subscribe(
+        name: str,
+        req_type: int,
+        mask: Optional[int],
+        callback: SubscriptionCallback,
+        use_numpy: bool | None = None,
+    ) -> Tuple[_SharedSubscription, Callable[[], None]]:
+        """
+        Add a callback to the subscription to a PV with a DBR type and event mask, subscribing if
+        there is not one already. There is only ever one channel access subscription for each
+        combination, however many callbacks are added. If the subscription has already had an
+        update, the callback is called with it straight away.
+
+        Args:
+            name: the PV name
+            req_type: the DBR type to subscribe with
+            mask: the event mask to subscribe with; None for the default
+            callback: called with each update
+            use_numpy: True use numpy to return arrays, False return a list; None for the default
+
+        Returns:
+            tuple of: (the subscription, function to remove the callback, which removes the
+            subscription once no callbacks are left)
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV.
+        """
+        key = (name, req_type, mask, use_numpy)
+        with SUBSCRIPTIONS_LOCK:
+            subscription = SUBSCRIPTIONS.get(key)
+            if subscription is None:
+                subscription = SUBSCRIPTIONS[key] = _SharedSubscription(key)
+            subscription.references += 1
+
+        subscribed = True
+
+        def _unsubscribe() -> None:
+            nonlocal subscribed
+            with SUBSCRIPTIONS_LOCK:
+                if not subscribed:
+                    return
+                subscribed = False
+                with subscription.lock:
+                    if callback in subscription.callbacks:
+                        subscription.callbacks.remove(callback)
+                subscription.references -= 1
+                if subscription.references > 0:
+                    return
+                if SUBSCRIPTIONS.get(key) is subscription:
+                    del SUBSCRIPTIONS[key]
+            subscription.close()
+
+        try:
+            with subscription.lock:
+                if subscription.channel is None:
+                    # A CaChannel holds only one subscription, so each has a channel of its own
+                    chan = CaChannelWrapper._create_subscription_channel(name)
+                    if use_numpy is None:
+                        chan.add_masked_array_event(req_type, None, mask, subscription.update)
+                    else:
+                        chan.add_masked_array_event(
+                            req_type, None, mask, subscription.update, use_numpy=use_numpy
+                        )
+                    chan.flush_io()
+                    subscription.channel = chan
+                subscription.callbacks.append(callback)
+                last_update = subscription.last_update
+        except Exception:
+            _unsubscribe()
+            raise
+
+        if last_update is not None:
+            callback(last_update, ())
+        return subscription, _unsubscribe
+
+    @staticmethod
+    def _create_subscription_channel(name: str) -> CaChannel:
+        """
+        Create and connect a channel of its own for a subscription. A CaChannel holds only one
+        subscription, so subscriptions on the shared cached channel would replace each other.
+
+        Args:
+            name: the PV name
+
+        Returns:
+            the connected channel
+
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV.
+        """
+        chan = CaChannel(name)
+        # do not install handlers if server
+        if os.getenv("EPICS_CAS_INTF_ADDR_LIST") is None:
+            # noinspection PyTypeChecker
+            CaChannelWrapper.installHandlers(chan)
+        chan.setTimeout(EXIST_TIMEOUT)
+        try:
+            chan.searchw()
+        except CaChannelException as e:
+            chan.clear_channel()
+            raise UnableToConnectToPVException(name, str(e))
+        return chan
+
+    @staticmethod
+    def get_monitored_value(
+        name: str,
+        max_age: Optional[float] = None,
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: bool | None = None,
+    ) -> MonitoredValue:
+        """
+        Get the latest value of a PV along with its alarm and timestamp from a monitor. The first
+        read of a PV subscribes to it and later reads return the value from the subscription, so
+        PVs which are read repeatedly are only sent when they change. Subscriptions not read for
+        MONITORED_READ_IDLE_TIMEOUT seconds are removed.
+
+        Args:
+            name: The PV.
+            max_age (optional): If the value was received longer ago than this many seconds, get
+                it from the PV instead; None to always use the monitored value while connected.
+            to_string (bool, optional): Whether to convert the value to a string.
+            timeout (optional): How long to wait for the PV to connect etc.
+            use_numpy (None|boolean): True use numpy to return arrays, False return a list;
+            None for use the default
+
+        Returns:
+            the value, alarm severity, alarm status and timestamp of the PV
 
+        Raises:
+            UnableToConnectToPVException: If cannot connect to PV.
+            ReadAccessException: If read access is denied.
+        """
+        now = time.monotonic()
+        key = (name, to_string, use_numpy)
+        with MONITORED_READS_LOCK:
+            for idle_key, idle_read in list(MONITORED_READS.items()):
+                if idle_key != key and now - idle_read.last_read > MONITORED_READ_IDLE_TIMEOUT:
+                    del MONITORED_READS[idle_key]
+                    idle_read.close()
+            read = MONITORED_READS.get(key)
+            if read is None:
+                read = MONITORED_READS[key] = _MonitoredRead(name)
+            read.last_read = now
+
+        with read.lock:
+            if read.subscription is None:
+                CaChannelWrapper._subscribe_monitored_read(read, to_string, use_numpy)
+            value = read.value
+            connected = read.subscription is not None and read.subscription.connected()
+            if (
+                value is None
+                or not connected
+                or (max_age is not None and now - read.received > max_age)
+            ):
+                value = CaChannelWrapper._get_time_value(name, to_string, timeout, use_numpy)
+                read.update(value)
         return value
 
+    @staticmethod
+    def _subscribe_monitored_read(
+        read: _MonitoredRead, to_string: bool, use_numpy: bool | None
+    ) -> None:
+        """
+        Subscribe to the PV of a monitored read.
+
+        Args:
+            read: the monitored read
+            to_string: whether the values should be strings
+            use_numpy: True use numpy to return arrays, False return a list; None for the default
+        """
+        entry, chan = CaChannelWrapper._get_cached_channel(read.name)
+        with entry.lock:
+            req_type, as_string = CaChannelWrapper._request_type(chan, to_string)
+            if req_type is None:
+                req_type = chan.field_type()
+
+        def _value_changed(epics_args: dict[str, Any], _: Tuple[T, ...]) -> None:
+            read.update(CaChannelWrapper._to_monitored_value(epics_args, as_string))
+
+        read.subscription, read.unsubscribe = CaChannelWrapper._subscribe(
+            read.name,
+            dbf_type_to_DBR_TIME(req_type),
+            None,
+            _value_changed,
+            None if as_string else use_numpy,
+        )
+
+    @staticmethod
+    def _get_time_value(
+        name: str, to_string: bool, timeout: float, use_numpy: bool | None
+    ) -> MonitoredValue:
+        """
+        Get the value of a PV along with its alarm and timestamp.
+
+        Args:
+            name: The PV.
+            to_string: Whether to convert the value to a string.
+            timeout: How long to wait for the PV to connect etc.
+            use_numpy: True use numpy to return arrays, False return a list; None for the default
+
+        Returns:
+            the value, alarm severity, alarm status and timestamp of the PV
+        """
+        entry, chan = CaChannelWrapper._get_cached_channel(name)
+        with entry.lock:
+            chan.setTimeout(timeout)
+            if not chan.read_access():
+                raise ReadAccessException(name)
+            req_type, as_string = CaChannelWrapper._request_type(chan, to_string)
+            if req_type is None:
+                req_type = chan.field_type()
+            start = time.perf_counter()
+            if as_string or use_numpy is None:
+                info = chan.getw(dbf_type_to_DBR_TIME(req_type))
+            else:
+                info = chan.getw(dbf_type_to_DBR_TIME(req_type), use_numpy=use_numpy)
+        assert isinstance(info, dict)
+        INSTRUMENTATION.record(name, GET, time.perf_counter() - start, info)
+        return CaChannelWrapper._to_monitored_value(info, as_string)
+
+    @staticmethod
+    def _to_monitored_value(info: dict[str, Any], to_string: bool) -> MonitoredValue:
+        """
+        Convert the result of a DBR_TIME request to a monitored value.
+
+        Args:
+            info: the result of the request
+            to_string: whether to return the value as a string
+
+        Returns:
+            the value, alarm severity, alarm status and timestamp
+        """
+        return MonitoredValue(
+            CaChannelWrapper._format_value(info.get("pv_value"), to_string),
+            info.get("pv_severity", AlarmSeverity.No),
+            info.get("pv_status", AlarmCondition.No),
+            (info.get("pv_seconds", 0), info.get("pv_nseconds", 0)),
+        )
+
     @staticmethod
     def add_monitor(
         name: str,
@@ -439,10 +1729,17 @@ class CaChannelWrapper(object):
         link_alarm_on_disconnect: bool = True,
         to_string: bool = False,
         use_numpy: bool | None = None,
+        dispatch: bool = False,
+        coalesce: bool = False,
     ) -> Callable[[], None]:
         """
         Add a callback to a pv which responds on a monitor (i.e. value change).
-        This currently only tested for numbers.
+        This currently only tested for numbers. Monitors of the same pv share one channel access
+        subscription, so each update is only sent once by the IOC however many monitors there are.
+
+        Callbacks are called on a channel access thread, so a slow callback delays the updates of
+        every pv. Slow callbacks should be added with dispatch, which runs them on the worker
+        threads of MONITOR_DISPATCHER instead.
         Args:
             name: name of the pv
             call_back_function: the callback function, arguments are value, alarm severity
@@ -451,24 +1748,42 @@ class CaChannelWrapper(object):
                 when the pv disconnects
             use_numpy (bool, optional): True use numpy to return arrays,
                  False return a list; None for use the default
+            dispatch: True to run the callback on the monitor dispatcher rather than on a channel
+                access thread
+            coalesce: True to run the callback on the monitor dispatcher with only the latest of
+                any updates waiting to be run; updates the callback could not keep up with are
+                skipped
         Returns:
             unsubscribe event function
         """
         from CaChannel import USE_NUMPY
 
+        dispatched = None
+        if dispatch or coalesce:
+            dispatched = MONITOR_DISPATCHER.wrap(call_back_function, coalesce)
+            call_back_function = dispatched
+
         if use_numpy is None:
             use_numpy = USE_NUMPY
-        chan = CaChannelWrapper.get_chan(name)
-        if not chan.read_access():
-            raise ReadAccessException(name)
+        # Hold a reference so the channel is not evicted from the cache while it is monitored
+        CACHE.acquire(name)
+        try:
+            entry, chan = CaChannelWrapper._get_cached_channel(name)
+            if not chan.read_access():
+                raise ReadAccessException(name)
+        except Exception:
+            CACHE.release(name)
+            raise
         field_type = chan.field_type()
         # if this is an enum field return the monitor as a string (not an int)
         if ca.dbr_type_is_ENUM(field_type):
             field_type = ca.DBR_STRING
         # Modify the field type from monitor the value to includes the alarm severity and status
         field_type_with_status = dbf_type_to_DBR_STS(field_type)
+        last_value: "PVValue" = None
 
-        def _process_call_back(epics_args: dict[str, str], _: dict[str, str]) -> None:
+        def _process_call_back(epics_args: Dict[str, Any], _: Tuple[Any, ...]) -> None:
+            nonlocal last_value
             value = epics_args.get("pv_value", None)
 
             if to_string:
@@ -477,7 +1792,7 @@ class CaChannelWrapper(object):
                     value = waveform_to_string(value)
                 else:
                     value = str(value)
-            chan.last_value = value
+            last_value = value
 
             call_back_function(
                 value,
@@ -485,21 +1800,37 @@ class CaChannelWrapper(object):
                 epics_args.get("pv_status", AlarmCondition.No),
             )
 
-        def _connection_callback(epics_args: Tuple[T, ...], _: dict[str, str]) -> None:
-            if epics_args[1] == ca.CA_OP_CONN_DOWN:
-                call_back_function(chan.last_value, AlarmSeverity.Invalid, AlarmCondition.Link)
-
-        chan.add_masked_array_event(
-            field_type_with_status,
-            count=None,
-            mask=None,
-            callback=_process_call_back,
-            use_numpy=use_numpy,
-        )
-        if link_alarm_on_disconnect:
-            chan.change_connection_event(_connection_callback)
+        def _connection_callback(connected: bool) -> None:
+            if not connected:
+                call_back_function(last_value, AlarmSeverity.Invalid, AlarmCondition.Link)
 
-        return chan.clear_event
+        try:
+            # The subscription is shared with other monitors of the PV with the same type
+            _, unsubscribe_updates = CaChannelWrapper._subscribe(
+                name, field_type_with_status, None, _process_call_back, use_numpy
+            )
+        except Exception:
+            CACHE.release(name)
+            raise
+
+        def _unsubscribe() -> None:
+            with entry.lock:
+                if _unsubscribe not in entry.unsubscribe_functions:
+                    return
+                entry.unsubscribe_functions.remove(_unsubscribe)
+                if _connection_callback in entry.connection_callbacks:
+                    entry.connection_callbacks.remove(_connection_callback)
+            unsubscribe_updates()
+            if dispatched is not None:
+                dispatched.close()
+            CACHE.release(name)
+
+        with entry.lock:
+            if link_alarm_on_disconnect:
+                entry.connection_callbacks.append(_connection_callback)
+            entry.unsubscribe_functions.append(_unsubscribe)
+
+        return _unsubscribe
 
     @staticmethod
     def poll() -> None:
@@ -507,51 +1838,65 @@ class CaChannelWrapper(object):
         Flush the send buffer and execute any outstanding background activity for all connected pvs.
         NB Connected pv is one which is in the cache
         """
-        # pick first channel and perform flush on it.
-        try:
-            for key, value in CACHE.map.items():
-                value.poll()
-                break
-        except AttributeError:
-            # There are no channels so we do not need to poll them
-            pass
+        # pick first channel and perform flush on it; with no channels there is nothing to poll
+        for chan in CACHE.channels():
+            chan.poll()
+            break
+
+    @staticmethod
+    def _wait_for_event(
+        event: Event, timeout: Optional[float], chan: Optional[CaChannel] = None
+    ) -> bool:
+        """
+        Block until an event posted by a channel access callback is set, returning as soon as it
+        is. The wait is split into slices of at most BREAK_CHECK_INTERVAL so that the user can
+        still interrupt it.
+
+        Args:
+            event: the event to wait for
+            timeout: maximum time to wait for the event, None means wait forever
+            chan (optional): if given, channel access is polled on this channel between slices,
+                so that callbacks are still delivered by a context without preemptive callbacks;
+                the slices then start short and double, so a quick reply is picked up quickly
+
+        Returns:
+            True if the event was set; False on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = POLL_INTERVAL if chan is not None else BREAK_CHECK_INTERVAL
+        while True:
+            if chan is not None:
+                status = chan.poll()  # equivalent to pend_event() with a small timeout
+                if status != ca.ECA_TIMEOUT:
+                    raise CaChannelException(status)
+            if deadline is None:
+                wait = interval
+            else:
+                wait = min(interval, max(deadline - time.monotonic(), 0))
+            if event.wait(wait):
+                return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            check_break(2)
+            interval = min(interval * 2, BREAK_CHECK_INTERVAL)
 
     @staticmethod
     def _wait_for_pend_event(
-        chan: CaChannel, event: Event, timeout: Optional[float] = None, interval: float = 0.1
+        chan: CaChannel, event: Event, timeout: Optional[float] = None
     ) -> None:
         """
-        Wait for a pending event to occur in short intervals to allow for keyboard interrupt;
-        has possible timeout for maximum time to wait. This should be used for put operation
-        callbacks.
+        Wait for a put completion callback; has possible timeout for maximum time to wait.
+
+        The first poll flushes the send buffer so the request goes out. With preemptive callbacks
+        the callback then sets the event from a channel access thread and the wait returns
+        immediately, rather than at the next poll.
 
         Args:
             chan: channel to use
             event: the event posted by the callback to wait for
             timeout: maximum time to wait for the event, None means wait forever.
-            interval: time to poll channel access
         """
-
-        time_elapsed = 0
-
-        while True:
-            # Should use overall timeout somehow? need to make sure it is long enough for
-            # all requests to complete did try flush_io() followed by event.wait(1.0) inside the
-            # loop for set pv, but a send got missed (this is what util/caput in CaChannel does with
-            # its wait is set to True)So looks like pend_event() / pend_io() / poll() is needed
-            # CaChannel example uses pend_event, pyepics seems to do both pend_io and pend_event
-            # According to docs, if using preemptive callbacks then only an initial flush_io()
-            # should be needed
-
-            status = chan.poll()  # equivalent to pend_event() with a small timeout
-            if status != ca.ECA_TIMEOUT:
-                raise CaChannelException(status)
-
-            time_elapsed += interval
-            if event.wait(interval) or (timeout is not None and time_elapsed >= timeout):
-                break
-
-        if not event.is_set():
+        if not CaChannelWrapper._wait_for_event(event, timeout, chan):
             raise UnableToConnectToPVException(chan.name(), "Pend event timeout")
 
     @staticmethod
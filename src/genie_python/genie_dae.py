@@ -13,7 +13,7 @@ from datetime import datetime, timedelta
 from io import open
 from stat import S_IREAD, S_IWUSR
 from time import sleep, strftime
-from typing import TYPE_CHECKING, Generator, cast
+from typing import TYPE_CHECKING, Generator, Iterable, NamedTuple, cast
 
 import numpy as np
 import numpy.typing as npt
@@ -36,7 +36,7 @@ from genie_python.utilities import (
 )
 
 if TYPE_CHECKING:
-    from genie_python.genie import PVValue, _GetspectrumReturn
+    from genie_python.genie import PVValue, _GetdashboardReturn, _GetspectrumReturn
     from genie_python.genie_epics_api import API
 
 ## for beginrun etc. there exists both the PV specified here and also a PV with
@@ -131,6 +131,30 @@ DAE_PVS_LOOKUP = {
     "autosave_freq_sp": "DAE:AUTOSAVE:FREQ:SP",
 }
 
+# DAE variables shown on the dashboard
+DASHBOARD_FIELDS = (
+    "runstate",
+    "runnumber",
+    "rbnum",
+    "users_dae_sp",
+    "title",
+    "display_title",
+    "runduration",
+    "goodframes",
+    "goodframesperiod",
+    "rawframes",
+    "rawframesperiod",
+    "beamcurrent",
+    "totaluamps",
+    "numspectra",
+    "numperiods",
+    "numtimechannels",
+    "monitorspectrum",
+    "monitorfrom",
+    "monitorto",
+    "monitorcounts",
+)
+
 DAE_CONFIG_FILE_PATHS = [
     r"C:\Labview modules\dae\icp_config.xml",
     r"C:\Instrument\Apps\EPICS\ICP_Binaries\icp_config.xml",
@@ -149,6 +173,58 @@ EXT3_VETO = "ext3"
 FIFO_VETO = "fifo"
 
 
+class DaeSnapshot(NamedTuple):
+    """
+    The values of several DAE variables read together, see Dae.snapshot.
+    """
+
+    # When the values were read
+    timestamp: datetime
+    # Value of each variable read, by its short name in DAE_PVS_LOOKUP
+    values: "dict[str, PVValue]"
+    # Exception raised for each variable which could not be read, by its short name
+    errors: dict[str, Exception]
+
+    def get(self, name: str) -> "PVValue":
+        """
+        Gets the value of a variable.
+
+        Args:
+            name: the short name of the DAE variable
+
+        Returns:
+            object: the value
+
+        Raises:
+            Exception: the exception raised reading the variable if it could not be read
+        """
+        name = name.lower()
+        if name in self.errors:
+            raise self.errors[name]
+        return self.values[name]
+
+    def get_string(self, name: str) -> str:
+        """
+        Gets the value of a variable as a string; character waveforms are converted to the
+        string they hold.
+
+        Args:
+            name: the short name of the DAE variable
+
+        Returns:
+            string: the value
+
+        Raises:
+            Exception: the exception raised reading the variable if it could not be read
+        """
+        value = self.get(name)
+        if isinstance(value, str):
+            return value
+        if isinstance(value, (list, np.ndarray)):
+            return waveform_to_string(cast("list[int]", value))
+        return str(value)
+
+
 class Dae(object):
     """
     Communications with the DAE pvs.
@@ -219,6 +295,20 @@ class Dae(object):
         """
         return self.api.get_pv_value(name, to_string, use_numpy=use_numpy)
 
+    def _get_waveform(self, name: str, use_numpy: bool | None = True) -> "PVValue":
+        """
+        Gets the valid (NORD) elements of a waveform PV.
+
+        Args:
+            name: the PV name
+            use_numpy (None|boolean): True use numpy to return arrays, False return a list;
+                                      None for use the default
+
+        Returns:
+            object: the valid elements of the waveform
+        """
+        return self.api.get_waveform(name, use_numpy=use_numpy)
+
     def _set_pv_value(self, name: str, value: "PVValue", wait: bool = False) -> None:
         """
         Sets a PV value via the API.
@@ -666,6 +756,78 @@ class Dae(object):
         if verbose or self.verbose:
             self._print_verbose_messages()
 
+    def snapshot(self, names: "Iterable[str]") -> DaeSnapshot:
+        """
+        Reads several DAE variables together in one bulk read, rather than one after another,
+        so that they are all read at the same time.
+
+        If monitored reads are enabled, each variable is read from its monitor instead.
+
+        Args:
+            names: the short names of the DAE variables, as in DAE_PVS_LOOKUP
+
+        Returns:
+            DaeSnapshot: the values read, and any errors
+        """
+        pv_names = {name.lower(): self._get_dae_pv_name(name) for name in names}
+        values: "dict[str, PVValue]" = {}
+        errors: dict[str, Exception] = {}
+        if self.api.monitored_reads:
+            for name, pv_name in pv_names.items():
+                try:
+                    values[name] = self._get_pv_value(pv_name)
+                except Exception as e:
+                    errors[name] = e
+        else:
+            pv_values, pv_errors = self.api.get_pv_values(pv_names.values())
+            for name, pv_name in pv_names.items():
+                if pv_name in pv_values:
+                    values[name] = pv_values[pv_name]
+                else:
+                    errors[name] = pv_errors.get(
+                        pv_name, IOError("Could not read {}".format(pv_name))
+                    )
+        return DaeSnapshot(datetime.now(), values, errors)
+
+    def get_dashboard(self) -> "_GetdashboardReturn":
+        """
+        Gets the current experiment values, read together in one snapshot.
+
+        Returns:
+            dict: the experiment values
+        """
+        snapshot = self.snapshot(DASHBOARD_FIELDS)
+        try:
+            users = self._format_users(snapshot.get_string("users_dae_sp"))
+        except Exception:
+            users = ""
+        return cast(
+            "_GetdashboardReturn",
+            {
+                "status": snapshot.get_string("runstate"),
+                "run_number": snapshot.get("runnumber"),
+                "rb_number": snapshot.get("rbnum"),
+                "user": users,
+                "title": snapshot.get_string("title"),
+                "display_title": snapshot.get("display_title"),
+                "run_time": snapshot.get("runduration"),
+                "good_frames_total": snapshot.get("goodframes"),
+                "good_frames_period": snapshot.get("goodframesperiod"),
+                "raw_frames_total": snapshot.get("rawframes"),
+                "raw_frames_period": snapshot.get("rawframesperiod"),
+                "beam_current": snapshot.get("beamcurrent"),
+                "total_current": snapshot.get("totaluamps"),
+                "spectra": snapshot.get("numspectra"),
+                # dae_memory_used is not implemented in EPICS system
+                "periods": snapshot.get("numperiods"),
+                "time_channels": snapshot.get("numtimechannels"),
+                "monitor_spectrum": snapshot.get("monitorspectrum"),
+                "monitor_from": snapshot.get("monitorfrom"),
+                "monitor_to": snapshot.get("monitorto"),
+                "monitor_counts": snapshot.get("monitorcounts"),
+            },
+        )
+
     def get_run_state(self) -> str:
         """
         Gets the current state of the DAE.
@@ -919,20 +1081,33 @@ class Dae(object):
             string: the names
         """
         try:
-            # Data comes as comma separated list
             raw = str(self._get_pv_value(self._get_dae_pv_name("users_dae_sp"), to_string=True))
-            names_list = [x.strip() for x in raw.split(",")]
-            if len(names_list) > 1:
-                last = names_list.pop(-1)
-                names = ", ".join(names_list)
-                names += " and " + last
-                return names
-            else:
-                # Will throw if empty - that is okay
-                return names_list[0]
+            return self._format_users(raw)
         except Exception:
             return ""
 
+    @staticmethod
+    def _format_users(raw: str) -> str:
+        """
+        Formats the users for display.
+
+        Args:
+            raw: the users as a comma separated list
+
+        Returns:
+            string: the names, the last joined by "and"
+        """
+        # Data comes as comma separated list
+        names_list = [x.strip() for x in raw.split(",")]
+        if len(names_list) > 1:
+            last = names_list.pop(-1)
+            names = ", ".join(names_list)
+            names += " and " + last
+            return names
+        else:
+            # Will throw if empty - that is okay
+            return names_list[0]
+
     def set_users(self, users: str) -> None:
         """
         Set the users for the current run.
@@ -1114,17 +1289,7 @@ class Dae(object):
         Returns:
             numpy int array: the spectrum integrals
         """
-        # this return waveform NELM elements, but only NORD are valid
-        data = cast(
-            npt.NDArray, self._get_pv_value(self._get_dae_pv_name("specintegrals"), use_numpy=True)
-        )
-        spec_size = self._get_pv_value(self._get_dae_pv_name("specintegrals_size"))
-        assert isinstance(spec_size, (int, float))
-        size = int(spec_size)
-        # this is an EPICS waveform so NORD <= NELM
-        if size < data.size:
-            data.resize(size)
-        return data
+        return cast(npt.NDArray, self._get_waveform(self._get_dae_pv_name("specintegrals")))
 
     def get_spec_data(self) -> npt.NDArray:
         """
@@ -1135,17 +1300,7 @@ class Dae(object):
             numpy int array: the spectrum data
         """
         self._set_pv_value(self._get_dae_pv_name("specdata") + ".PROC", 1, wait=True)
-        # this return waveform NELM elements, but only NORD are valid
-        data = cast(
-            npt.NDArray, self._get_pv_value(self._get_dae_pv_name("specdata"), use_numpy=True)
-        )
-        spec_size = self._get_pv_value(self._get_dae_pv_name("specdata_size"))
-        assert isinstance(spec_size, (int, float))
-        size = int(spec_size)
-        # this is an EPICS waveform so NORD <= NELM
-        if size < data.size:
-            data.resize(size)
-        return data
+        return cast(npt.NDArray, self._get_waveform(self._get_dae_pv_name("specdata")))
 
     def change_start(self) -> None:
         """
@@ -1902,30 +2057,24 @@ class Dae(object):
         Returns:
             dict: all the spectrum data
         """
+        # Only the valid (NORD) elements of the waveforms are read
         if dist:
-            y_data = self._get_pv_value(
+            y_data = self._get_waveform(
                 self._get_dae_pv_name("getspectrum_y").format(period, spectrum), use_numpy=use_numpy
             )
-            y_size = self._get_pv_value(
-                self._get_dae_pv_name("getspectrum_y_size").format(period, spectrum)
-            )
-            y_data = y_data[:y_size]
             mode = "distribution"
-            x_size = y_size
+            x_size = len(y_data)
         else:
-            y_data = self._get_pv_value(
+            y_data = self._get_waveform(
                 self._get_dae_pv_name("getspectrum_yc").format(period, spectrum),
                 use_numpy=use_numpy,
             )
-            y_size = self._get_pv_value(
-                self._get_dae_pv_name("getspectrum_yc_size").format(period, spectrum)
-            )
-            y_data = y_data[:y_size]
             mode = "non-distribution"
-            x_size = y_size + 1
-        x_data = self._get_pv_value(
+            x_size = len(y_data) + 1
+        x_data = self._get_waveform(
             self._get_dae_pv_name("getspectrum_x").format(period, spectrum), use_numpy=use_numpy
         )
+        # slicing a numpy array gives a view rather than a copy
         x_data = x_data[:x_size]
 
         return {"time": x_data, "signal": y_data, "sum": None, "mode": mode}
@@ -2,19 +2,26 @@ from __future__ import absolute_import, print_function
 
 import contextlib
 import os
-import re
 import sys
 import typing
 import urllib.parse
 import urllib.request
 from builtins import str
 from collections import OrderedDict
+from concurrent.futures import Future
 from io import open
-from typing import TYPE_CHECKING, Any, Callable
+from typing import TYPE_CHECKING, Any
 
-from genie_python.block_names import BlockNames, BlockNamesManager
+from genie_python.block_names import BlockNameIndex, BlockNames, BlockNamesManager
 from genie_python.channel_access_exceptions import UnableToConnectToPVException
-from genie_python.genie_blockserver import BlockServer
+from genie_python.genie_blockserver import (
+    BLOCK_PREFIX,
+    RC_ENABLE,
+    RC_HIGH,
+    RC_LOW,
+    BlockServer,
+    ParameterIndex,
+)
 from genie_python.genie_cachannel_wrapper import CaChannelWrapper as Wrapper
 from genie_python.genie_dae import Dae
 from genie_python.genie_experimental_data import GetExperimentData
@@ -38,10 +45,6 @@ if TYPE_CHECKING:
         _GetSampleParsReturn,
     )
 
-RC_ENABLE = ":RC:ENABLE"
-RC_LOW = ":RC:LOW"
-RC_HIGH = ":RC:HIGH"
-
 
 # Block names and its manager which automatically gets populated
 # with the names of the current blocks
@@ -73,12 +76,16 @@ class API(object):
         self.instrument_name = ""
         self.machine_name = ""
         self.localmod = None
-        self.block_prefix = "CS:SB:"
+        self.block_prefix = BLOCK_PREFIX
         self.motion_suffix = "CS:MOT:MOVING"
         self.pre_post_cmd_manager = PrePostCmdManager()
         self.logger = GenieLogger()
-        self._sample_par_names_cache = None
-        self._beamline_par_names_cache = None
+        # Whether get_pv_value reads from monitors, and the oldest monitored value it accepts
+        self.monitored_reads = False
+        self.monitored_read_max_age: float | None = None
+        # Block PV to the PV its value is written to, for the block names index it was made for
+        self._setpoint_pvs: dict[str, str] = {}
+        self._setpoint_pvs_index: BlockNameIndex | None = None
 
         if environment_details is None:
             self._environment_details = EnvironmentDetails()
@@ -151,7 +158,7 @@ class API(object):
         try:
             input_list = self.get_pv_value("CS:INSTLIST")
             assert isinstance(input_list, str | bytes)
-            instrument_list = dehex_decompress_and_dejson(input_list)
+            instrument_list = dehex_decompress_and_dejson(input_list, cached=True)
             instrument_details = next(
                 (inst for inst in instrument_list if inst["pvPrefix"] == machine_identifier), None
             )
@@ -233,8 +240,11 @@ class API(object):
 
         self.wait_for_move = WaitForMoveController(self, pv_prefix + self.motion_suffix)
         self.waitfor = WaitForController(self)
+        if self.blockserver is not None:
+            self.blockserver.stop_monitors()
         self.blockserver = BlockServer(self)
         BLOCK_NAMES_MANAGER.update_prefix(pv_prefix)
+        self._search_for_common_pvs()
 
         # Set instrument for logging purposes
         logging_filter.instrument = instrument
@@ -242,6 +252,23 @@ class API(object):
         # Whatever machine we're on, try to initialize and fall back if unsuccessful
         self.init_instrument(instrument, machine, globs, import_instrument_init)
 
+    def _search_for_common_pvs(self) -> None:
+        """
+        Start searching for PVs which most scripts use, so they are connected by the time they
+        are first needed.
+        """
+        try:
+            Wrapper.search_for_pvs(
+                [
+                    self.prefix_pv_name(self.motion_suffix),
+                    self.prefix_pv_name("CS:MANAGER"),
+                    self.prefix_pv_name("DAE:RUNSTATE"),
+                    self.prefix_pv_name("DAE:RUNSTATE_STR"),
+                ]
+            )
+        except Exception as e:
+            self.logger.log_error_msg("Could not search for common PVs: {}".format(e))
+
     def _get_pv_prefix(self, instrument: str, is_instrument: bool) -> str:
         """
         Create the pv prefix based on instrument name and whether it is an
@@ -371,6 +398,72 @@ class API(object):
                     self.logger.log_error_msg("set_pv_value exception {!r}".format(e))
                     raise e
 
+    def set_pv_value_async(
+        self, name: str, value: "PVValue|bytes", is_local: bool = False
+    ) -> "Future[None]":
+        """
+        Start setting a PV to a value without waiting for the put to complete.
+
+        Args:
+            name: the PV name
+            value: the value to set
+            is_local (bool, optional): whether to automatically prepend the
+                                       local inst prefix to the PV name
+
+        Returns:
+            a future which is done when the put completes
+        """
+        if is_local and not name.startswith(self.inst_prefix):
+            name = self.prefix_pv_name(name)
+        self.logger.log_info_msg("set_pv_value_async %s %s" % (name, str(value)))
+        return Wrapper.put_async(name, value)
+
+    def set_pv_values(
+        self,
+        values: typing.Mapping[str, "PVValue|bytes"],
+        wait: bool = False,
+        attempts: int = 3,
+        is_local: bool = False,
+    ) -> None:
+        """
+        Set several PVs in one bulk put, rather than one round trip per PV.
+
+        Args:
+            values: dictionary of PV name to the value to set it to; PVs with a value of None
+                    are not set
+            wait: wait for every put to complete before returning
+            attempts: number of attempts to try to set each pv value
+            is_local (bool, optional): whether to automatically prepend the
+                                       local inst prefix to the PV names
+
+        Raises:
+            the exception of the first PV which could not be set once all attempts are used up;
+            the other PVs are still set
+        """
+        values = {
+            (
+                self.prefix_pv_name(name)
+                if is_local and not name.startswith(self.inst_prefix)
+                else name
+            ): value
+            for name, value in values.items()
+            if value is not None
+        }
+        for name, value in values.items():
+            self.logger.log_info_msg("set_pv_value %s %s" % (name, str(value)))
+
+        while values:
+            errors = Wrapper.set_pv_values(values, wait=wait)
+            if not errors:
+                return
+            attempts -= 1
+            if attempts < 1:
+                for error in errors.values():
+                    self.logger.log_error_msg("set_pv_value exception {!r}".format(error))
+                raise next(iter(errors.values()))
+            # Only retry the PVs which failed
+            values = {name: values[name] for name in errors}
+
     @typing.overload
     def get_pv_value(
         self,
@@ -414,22 +507,84 @@ class API(object):
                                        to the PV name
             use_numpy (None|boolean): True use numpy to return arrays, False return a list;
                                       None for use the default
+
+        If monitored reads are enabled, the value comes from a monitor on the PV which is created
+        by the first read, see Wrapper.get_monitored_value.
+
+        Raises:
+            UnableToConnectToPVException: if the PV can not be connected to; this is not retried
         """
         if is_local:
             if not name.startswith(self.inst_prefix):
                 name = self.prefix_pv_name(name)
 
-        if not self.pv_exists(name):
-            raise UnableToConnectToPVException(name, "does not exist")
-
+        # The wrapper connects to the PV as part of the read, so a PV which is already connected is
+        # read without first checking that it exists
         while True:
             try:
+                if self.monitored_reads:
+                    return Wrapper.get_monitored_value(
+                        name, self.monitored_read_max_age, to_string, use_numpy=use_numpy
+                    ).value
                 return Wrapper.get_pv_value(name, to_string, use_numpy=use_numpy)
+            except UnableToConnectToPVException:
+                # Another attempt would only wait for the PV to connect again
+                raise
             except Exception as e:
                 attempts -= 1
                 if attempts < 1:
                     raise e
 
+    def get_waveform(
+        self, name: str, is_local: bool = False, use_numpy: bool | None = True
+    ) -> "PVValue":
+        """
+        Get the valid (NORD) elements of a waveform PV in a single request, rather than reading
+        all NELM elements and then NORD to slice them.
+
+        Args:
+            name: the PV name
+            is_local (bool, optional): whether to automatically prepend the local inst prefix
+                                       to the PV name
+            use_numpy (None|boolean): True use numpy to return arrays, False return a list;
+                                      None for use the default
+
+        Returns:
+            the valid elements of the waveform
+        """
+        if is_local and not name.startswith(self.inst_prefix):
+            name = self.prefix_pv_name(name)
+        return Wrapper.get_waveform(name, use_numpy=use_numpy)
+
+    def get_pv_values(
+        self,
+        names: typing.Iterable[str],
+        to_string: bool = False,
+        is_local: bool = False,
+        use_numpy: bool | None = None,
+    ) -> tuple[dict[str, "PVValue"], dict[str, Exception]]:
+        """
+        Get the current values of several PVs in one bulk read, rather than one round trip per PV.
+
+        Args:
+            names: the PV names
+            to_string (bool, optional): whether to cast the values to strings
+            is_local (bool, optional): whether to automatically prepend the local inst prefix
+                                       to the PV names
+            use_numpy (None|boolean): True use numpy to return arrays, False return a list;
+                                      None for use the default
+
+        Returns:
+            tuple of: (dictionary of PV name to value, dictionary of PV name to the exception
+            raised for each PV that could not be read); the PV names include any added prefix
+        """
+        if is_local:
+            names = [
+                name if name.startswith(self.inst_prefix) else self.prefix_pv_name(name)
+                for name in names
+            ]
+        return Wrapper.get_pv_values(names, to_string, use_numpy=use_numpy)
+
     def pv_exists(self, name: str, fail_fast: bool = False, is_local: bool = False) -> bool:
         """
         See if the PV exists.
@@ -462,27 +617,18 @@ class API(object):
                                        local inst prefix to the PV names
 
         Returns:
-            bool: True if all PVs are connected
+            list: the PVs in the list which are connected, as given
         """
-
-        # do this with multiprocessing to speed up
-        import multiprocessing.dummy as multiprocessing
-
-        pool = multiprocessing.Pool()
-
-        # make the mapping work with correct params for
-        # def pv_exists(self, name, fail_fast=False, is_local=False):
-        # to avoid this eror: def pv_exists(self, name, fail_fast=False, is_local=False):
-        def pv_exists_wrapper(name: str) -> str | None:
-            if self.pv_exists(name, fail_fast=False, is_local=is_local):
-                return name
+        full_names = {}
+        for name in pv_list:
+            if is_local and not name.startswith(self.inst_prefix):
+                full_names[name] = self.prefix_pv_name(name)
             else:
-                return None
+                full_names[name] = name
 
-        connected_pv_list = [pv for pv in pool.map(pv_exists_wrapper, pv_list) if pv is not None]
-        pool.close()
-        pool.join()
-        return connected_pv_list
+        # All the PVs are searched for at once, so this takes as long as the slowest one
+        connected = set(Wrapper.connected_pvs(full_names.values()))
+        return [name for name in pv_list if full_names[name] in connected]
 
     def reload_current_config(self) -> None:
         """
@@ -495,12 +641,12 @@ class API(object):
         """
         Corrects the casing of the block.
         """
-        for true_block_name in self.get_block_names():
-            if name.lower() == true_block_name.lower():
-                if add_prefix:
-                    return self.inst_prefix + self.block_prefix + true_block_name
-                else:
-                    return true_block_name
+        true_block_name = BLOCK_NAMES_MANAGER.index.get_name(name)
+        if true_block_name is not None:
+            if add_prefix:
+                return self.inst_prefix + self.block_prefix + true_block_name
+            else:
+                return true_block_name
         # If we get here then the block does not exist
         # but this should be picked up elsewhere
         return name
@@ -511,7 +657,7 @@ class API(object):
 
         Note: does not include the prefix
         """
-        return [name for name in BLOCK_NAMES.__dict__.keys()]
+        return list(BLOCK_NAMES_MANAGER.index.names)
 
     def block_exists(self, name: str, fail_fast: bool = False) -> bool:
         """
@@ -565,26 +711,23 @@ class API(object):
                 )
 
         if value is not None:
-            # Write to SP if it exists
-            if self.pv_exists(full_name + ":SP"):
-                self.set_pv_value(full_name + ":SP", value)
-            else:
-                self.set_pv_value(full_name, value)
+            self.set_pv_value(self._get_setpoint_pv(full_name), value)
 
         if wait:
             assert self.waitfor is not None
             self.waitfor.start_waiting(name, value, lowlimit, highlimit)
             return
 
+        enable_pv, low_pv, high_pv = self._get_runcontrol_pvs(name)
         if runcontrol is not None:
             enable = 1 if runcontrol else 0
-            self.set_pv_value(full_name + RC_ENABLE, enable)
+            self.set_pv_value(enable_pv, enable)
 
         # Set limits
         if lowlimit is not None:
-            self.set_pv_value(full_name + RC_LOW, lowlimit)
+            self.set_pv_value(low_pv, lowlimit)
         if highlimit is not None:
-            self.set_pv_value(full_name + RC_HIGH, highlimit)
+            self.set_pv_value(high_pv, highlimit)
 
     def get_block_value(self, name: str, to_string: bool = False, attempts: int = 3) -> "PVValue":
         """
@@ -594,14 +737,92 @@ class API(object):
 
     def set_multiple_blocks(self, names: list[str], values: list["PVValue"]) -> None:
         """
-        Sets values for multiple blocks.
+        Sets values for multiple blocks. The setpoints are written together in one bulk put.
+        """
+        block_values: dict[str, "PVValue"] = {}
+        for name, value in zip(names, values):
+            if not self.pre_post_cmd_manager.cset_precmd(runcontrol=None, wait=None):
+                print("cset cancelled by pre-command")
+                continue
+            if value is not None:
+                block_values[self.get_pv_from_block(name)] = value
+        if not block_values:
+            return
+
+        setpoint_pvs = self._get_setpoint_pvs_for_index()
+        unknown = [full_name for full_name in block_values if full_name not in setpoint_pvs]
+        if unknown:
+            # Look for all the SP PVs at once rather than waiting for each in turn
+            connected = set(
+                self.connected_pvs_in_list([full_name + ":SP" for full_name in unknown] + unknown)
+            )
+            for full_name in unknown:
+                if full_name + ":SP" in connected:
+                    setpoint_pvs[full_name] = full_name + ":SP"
+                elif full_name in connected:
+                    setpoint_pvs[full_name] = full_name
+        self.set_pv_values(
+            {
+                setpoint_pvs.get(full_name, full_name): value
+                for full_name, value in block_values.items()
+            }
+        )
+
+    def _get_setpoint_pvs_for_index(self) -> dict[str, str]:
+        """
+        Gets the known PVs to write block values to, emptied if the block names have changed
+        since they were found, as a block may then be a different PV.
+
+        Returns:
+            the PV to write the value of each block to, by block PV
+        """
+        index = BLOCK_NAMES_MANAGER.index
+        if index is not self._setpoint_pvs_index:
+            self._setpoint_pvs = {}
+            self._setpoint_pvs_index = index
+        return self._setpoint_pvs
+
+    def _get_setpoint_pv(self, full_name: str) -> str:
+        """
+        Gets the PV to write a block's value to; this is the SP PV if it exists. The PV is only
+        looked for the first time a block is written to until the block names change. A block is
+        only known to have no SP PV if the block PV itself is connected, so that a block which is
+        not connected yet is looked for again.
+
+        Args:
+            full_name: the full PV name of the block
+
+        Returns:
+            the PV name to write the block value to
+        """
+        setpoint_pvs = self._get_setpoint_pvs_for_index()
+        setpoint_pv = setpoint_pvs.get(full_name)
+        if setpoint_pv is not None:
+            return setpoint_pv
+        if self.pv_exists(full_name + ":SP"):
+            setpoint_pvs[full_name] = full_name + ":SP"
+        elif self.pv_exists(full_name, fail_fast=True):
+            setpoint_pvs[full_name] = full_name
+        return setpoint_pvs.get(full_name, full_name)
+
+    def _get_runcontrol_pvs(self, block_name: str) -> tuple[str, str, str]:
+        """
+        Gets the run-control PVs of a block; for a current block these are made when the block
+        names change.
+
+        Args:
+            block_name: the name of the block
+
+        Returns:
+            the enable, low limit and high limit PV names
         """
-        # With LabVIEW we could set values then press go after all values are set
-        # Not sure we are going to do something similar for EPICS
-        temp = list(zip(names, values))
-        # Set the values
-        for name, value in temp:
-            self.set_block_value(name, value)
+        index = BLOCK_NAMES_MANAGER.index
+        if index.pv_prefix == self.inst_prefix:
+            pv_names = index.get_runcontrol_pv_names(block_name)
+            if pv_names is not None:
+                return pv_names
+        block_pv = self.get_pv_from_block(block_name)
+        return block_pv + RC_ENABLE, block_pv + RC_LOW, block_pv + RC_HIGH
 
     def get_block_units(self, block_name: str) -> str | None:
         """
@@ -620,7 +841,6 @@ class API(object):
         if "." in pv_name:
             # Remove any headers
             pv_name = pv_name.split(".")[0]
-        unit_name = pv_name + ".EGU"
         # pylint: disable=protected-access
         if not self.block_exists(block_name) and block_name.upper() not in (
             existing_block.upper() for existing_block in self.get_block_names()
@@ -632,37 +852,50 @@ class API(object):
                 )
             )
 
-        field_type = Wrapper.dbf_type_to_string(Wrapper.get_chan(pv_name).field_type())
+        return self._get_pv_units(pv_name)
+
+    def _get_pv_units(self, pv_name: str) -> str | None:
+        """
+        Get the physical measurement units of a PV.
+
+        Args:
+            pv_name: the PV name, without a field
+
+        Returns:
+            the units; None for a string, char or enum PV
+        """
+        # Field type and units are cached for as long as the PV stays connected
+        field_type = Wrapper.dbf_type_to_string(Wrapper.get_metadata(pv_name).field_type)
 
         if field_type in ["DBF_STRING", "DBF_CHAR", "DBF_UCHAR", "DBF_ENUM"]:
             return None
         # Only return block units if PV field type is _not_ STRING, CHAR, UCHAR or ENUM
         # as they're unlikely to have .EGU fields
-        return typing.cast(str | None, Wrapper.get_pv_value(unit_name))
+        return Wrapper.get_units(pv_name)
 
-    def _get_pars(
-        self, pv_prefix_identifier: str, get_names_from_blockserver: Callable[[], Any]
-    ) -> "dict[str, PVValue]":
+    def _get_pars(self, index: ParameterIndex) -> "dict[str, PVValue]":
         """
-        Get the current parameter values for a given pv subset as a dictionary.
+        Get the current values of a set of parameters as a dictionary. The values are read
+        together in one bulk read, or from monitors if monitored reads are enabled.
+
+        Args:
+            index: the index of the parameter pvs
+
+        Returns:
+            the value of each parameter by name
         """
-        names = get_names_from_blockserver()
-        ans = {}
-        if (
-            names is not None
-            and isinstance(names, list)
-            and all(isinstance(elem, str) for elem in names)
-        ):
-            for n in names:
-                val = self.get_pv_value(self.prefix_pv_name(n))
-                m = re.match(".+:" + pv_prefix_identifier + ":(.+)", n)
-                if m is not None:
-                    ans[m.groups()[0]] = val
-                else:
-                    self.logger.log_error_msg(
-                        "Unexpected PV found whilst retrieving parameters: {0}".format(n)
-                    )
-        return ans
+        for pv_name in index.unexpected:
+            self.logger.log_error_msg(
+                "Unexpected PV found whilst retrieving parameters: {0}".format(pv_name)
+            )
+        if self.monitored_reads:
+            return {name: self.get_pv_value(pv_name) for name, pv_name in index.pvs.items()}
+
+        values, errors = Wrapper.get_pv_values(index.pvs.values())
+        for pv_name in index.pvs.values():
+            if pv_name in errors:
+                raise errors[pv_name]
+        return {name: values[pv_name] for name, pv_name in index.pvs.items()}
 
     def get_sample_pars(self) -> "_GetSampleParsReturn":
         """
@@ -670,7 +903,7 @@ class API(object):
         """
         assert self.blockserver is not None
         sample_pars = typing.cast(
-            "_GetSampleParsReturn", self._get_pars("SAMPLE", self.blockserver.get_sample_par_names)
+            "_GetSampleParsReturn", self._get_pars(self.blockserver.sample_pars.get_index())
         )
         return sample_pars
 
@@ -684,20 +917,10 @@ class API(object):
         """
 
         assert self.blockserver is not None
-        try:
-            names = self.blockserver.get_sample_par_names()
-            self._sample_par_names_cache = names
-        except Exception:
-            names = self._sample_par_names_cache
-        if names is not None and isinstance(names, list):
-            for n in names:
-                if isinstance(n, str):
-                    m = re.match(".+:SAMPLE:%s" % name.upper(), n)
-                    if m is not None:
-                        # Found it!
-                        self.set_pv_value(self.prefix_pv_name(n), value)
-                        return
-        raise Exception("Sample parameter %s does not exist" % name)
+        pv_name = self.blockserver.sample_pars.get_index().get_pv_name(name)
+        if pv_name is None:
+            raise Exception("Sample parameter %s does not exist" % name)
+        self.set_pv_value(pv_name, value)
 
     def get_beamline_pars(self) -> "_GetbeamlineparsReturn":
         """
@@ -705,7 +928,7 @@ class API(object):
         """
         assert self.blockserver is not None
         return typing.cast(
-            "_GetbeamlineparsReturn", self._get_pars("BL", self.blockserver.get_beamline_par_names)
+            "_GetbeamlineparsReturn", self._get_pars(self.blockserver.beamline_pars.get_index())
         )
 
     def set_beamline_par(self, name: str, value: "PVValue") -> None:
@@ -718,19 +941,10 @@ class API(object):
         """
 
         assert self.blockserver is not None
-        try:
-            names = self.blockserver.get_beamline_par_names()
-            self._beamline_par_names_cache = names
-        except Exception:
-            names = self._beamline_par_names_cache
-
-        if names is not None:
-            for n in names:
-                m = re.match(".+:BL:%s" % name.upper(), n)
-                if m is not None:
-                    self.set_pv_value(self.prefix_pv_name(n), value)
-                    return
-        raise Exception("Beamline parameter %s does not exist" % name)
+        pv_name = self.blockserver.beamline_pars.get_index().get_pv_name(name)
+        if pv_name is None:
+            raise Exception("Beamline parameter %s does not exist" % name)
+        self.set_pv_value(pv_name, value)
 
     def get_runcontrol_settings(self, block_name: str) -> tuple["PVValue", "PVValue", "PVValue"]:
         """
@@ -743,10 +957,10 @@ class API(object):
             tuple: (enabled, low_limit, high_limit)
         """
         try:
-            block_pv = self.get_pv_from_block(block_name)
-            enabled = self.get_pv_value(block_pv + RC_ENABLE) == "YES"
-            low_limit = self.get_pv_value(block_pv + RC_LOW)
-            high_limit = self.get_pv_value(block_pv + RC_HIGH)
+            enable_pv, low_pv, high_pv = self._get_runcontrol_pvs(block_name)
+            enabled = self.get_pv_value(enable_pv) == "YES"
+            low_limit = self.get_pv_value(low_pv)
+            high_limit = self.get_pv_value(high_pv)
             return enabled, low_limit, high_limit
         except UnableToConnectToPVException:
             return "UNKNOWN", "UNKNOWN", "UNKNOWN"
@@ -814,6 +1028,12 @@ class API(object):
             pv_name (str): The pv name as a string
 
         """
+        # The PV names of the current blocks are made when the block names change
+        index = BLOCK_NAMES_MANAGER.index
+        if index.pv_prefix == self.inst_prefix:
+            pv_name = index.get_pv_name(block_name)
+            if pv_name is not None:
+                return pv_name
         return self.inst_prefix + self.block_prefix + block_name.upper()
 
     def _alert_http_request(
@@ -991,3 +1211,77 @@ class API(object):
         ans["alarm"] = "UNKNOWN" if fail_fast_and_disconnected else self.get_alarm_from_block(block)
 
         return typing.cast("_CgetReturn", ans)
+
+    def get_blocks_data(self, blocks: list[str], fail_fast: bool = False) -> list["_CgetReturn"]:
+        """
+        Gets the useful values associated with several blocks, as get_block_data does for one
+        block. The value, runcontrol and alarm PVs of all the blocks are read together in one bulk
+        read, rather than one after another for each block. Units are cached for as long as a
+        block is connected, so are only read the first time.
+
+        If monitored reads are enabled, each block is read as get_block_data does, from monitors.
+
+        Args:
+            blocks: the names of the blocks
+            fail_fast: if True the function will not attempt to wait for disconnected PVs
+
+        Returns:
+            the details of each block, in the order given; see get_block_data
+
+        Raises:
+            Exception: if a block does not exist
+        """
+        if self.monitored_reads:
+            return [self.get_block_data(block, fail_fast) for block in blocks]
+
+        block_pvs = [self.get_pv_from_block(block) for block in blocks]
+        blocks_runcontrol_pvs = [self._get_runcontrol_pvs(block) for block in blocks]
+        connected = set(Wrapper.connected_pvs(block_pvs, 0)) if fail_fast else set(block_pvs)
+        names = []
+        for block_pv, runcontrol_pvs in zip(block_pvs, blocks_runcontrol_pvs):
+            if block_pv in connected:
+                names += [block_pv, "{}.SEVR".format(remove_field_from_pv(block_pv))]
+            names += runcontrol_pvs
+        values, errors = Wrapper.get_pv_values(names)
+
+        upper_block_names = None
+        blocks_data = []
+        for block, block_pv, runcontrol_pvs in zip(blocks, block_pvs, blocks_runcontrol_pvs):
+            ans = OrderedDict()
+            ans["connected"] = block_pv in values
+            if not ans["connected"]:
+                error = errors.get(block_pv)
+                if error is not None and not isinstance(error, UnableToConnectToPVException):
+                    raise error
+                if upper_block_names is None:
+                    upper_block_names = {name.upper() for name in self.get_block_names()}
+                if block.upper() not in upper_block_names:
+                    # Can't find block at all
+                    raise Exception(
+                        "No block with the name '{}' exists\nCurrent blocks are {}".format(
+                            block, self.get_block_names()
+                        )
+                    )
+
+            ans["name"] = block
+            ans["value"] = values[block_pv] if ans["connected"] else None
+
+            try:
+                ans["unit"] = (
+                    self._get_pv_units(block_pv.split(".")[0]) if ans["connected"] else None
+                )
+            except UnableToConnectToPVException:
+                ans["unit"] = "Unable to connect to .EGU PV"
+
+            if all(name in values for name in runcontrol_pvs):
+                ans["runcontrol"] = values[runcontrol_pvs[0]] == "YES"
+                ans["lowlimit"] = values[runcontrol_pvs[1]]
+                ans["highlimit"] = values[runcontrol_pvs[2]]
+            else:
+                ans["runcontrol"], ans["lowlimit"], ans["highlimit"] = ("UNKNOWN",) * 3
+
+            alarm = values.get("{}.SEVR".format(remove_field_from_pv(block_pv)))
+            ans["alarm"] = "UNKNOWN" if alarm is None else str(alarm)
+
+            blocks_data.append(typing.cast("_CgetReturn", ans))
+        return blocks_data
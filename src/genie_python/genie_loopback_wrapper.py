@@ -0,0 +1,627 @@
+"""
+In-memory loopback PV backend. PVs are held in this process rather than served by IOCs, so the
+genie_python API, DAE and waitfor code can be run and timed without any IOCs, e.g. on a laptop.
+
+PVs are added with LoopbackWrapper.add_pv and changed "on the IOC side" with
+LoopbackWrapper.update_pv. The loopback_backend context manager makes the API use the loopback
+backend in place of channel access.
+"""
+
+import contextlib
+import random
+import threading
+import time
+from collections.abc import Callable, Generator, Iterable, Mapping
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import numpy as np
+from CaChannel import ca
+
+from .channel_access_exceptions import (
+    InvalidEnumStringException,
+    UnableToConnectToPVException,
+    WriteAccessException,
+)
+from .genie_cachannel_wrapper import TIMEOUT, CaChannelWrapper, ChannelMetadata
+from .genie_monitor_dispatcher import MonitorDispatcher
+from .genie_pv_connection_protocol import MonitoredValue
+from .utilities import waveform_to_string
+
+if TYPE_CHECKING:
+    from genie_python.genie import PVValue
+
+NO_ALARM = "NO_ALARM"
+# Fields of a record served from the record itself, rather than held as PVs of their own
+RECORD_FIELDS = ("VAL", "SEVR", "STAT", "DISP", "NORD", "NELM", "EGU")
+# Runs the callbacks of monitors added with dispatch
+MONITOR_DISPATCHER = MonitorDispatcher(
+    error_handler=lambda message: LoopbackWrapper.log_error(message)
+)
+
+
+class LoopbackPv:
+    """
+    A PV held in memory: a record with a value, alarm, units, DISP field and, for waveforms, the
+    number of valid elements.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        value: "PVValue" = 0.0,
+        enum_strings: Optional[Iterable[str]] = None,
+        nelm: Optional[int] = None,
+        units: str = "",
+        disp: bool = False,
+        read_only: bool = False,
+        process_time: float = 0.0,
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            name: the PV name
+            value: the initial value; for an enum the state string or index
+            enum_strings: the state strings of an enum PV; None if not an enum
+            nelm: the number of elements of a waveform PV; None if not a waveform
+            units: the engineering units
+            disp: whether DISP is set, so that checked writes are refused
+            read_only: whether writes are refused
+            process_time: seconds a put waiting for completion takes to complete, e.g. the time
+                for a motor to move
+        """
+        self.name = name
+        self.enum_strings = tuple(enum_strings) if enum_strings is not None else None
+        self.nelm = nelm
+        self.units = units
+        self.disp = disp
+        self.read_only = read_only
+        self.process_time = process_time
+        self.severity = NO_ALARM
+        self.status = NO_ALARM
+        self.value: Any = None
+        self.nord = 0
+        self.timestamp = (0, 0)
+        # Monitors: field (None for the value), callback, to_string and link_alarm_on_disconnect
+        self.monitors: list[Tuple[Optional[str], Callable[..., None], bool, bool]] = []
+        self.lock = threading.RLock()
+        self.set_value(value)
+
+    def set_value(self, value: Any) -> None:
+        """
+        Set the value, converting it to the type of the PV.
+
+        Args:
+            value: the new value
+
+        Raises:
+            InvalidEnumStringException: if the PV is an enum and the value is not one of its states
+        """
+        if self.enum_strings is not None:
+            if isinstance(value, str):
+                if value not in self.enum_strings:
+                    raise InvalidEnumStringException(self.name, str(list(self.enum_strings)))
+                value = self.enum_strings.index(value)
+            self.value = int(value)
+        elif self.nelm is not None:
+            if isinstance(value, str):
+                value = [ord(character) for character in value] + [0]
+            elif isinstance(value, (bytes, bytearray)):
+                value = list(value) + [0]
+            elements = np.asarray(value).ravel()[: self.nelm]
+            # The element type is set by the first value, as the FTVL of a waveform record
+            dtype = self.value.dtype if isinstance(self.value, np.ndarray) else elements.dtype
+            array = np.zeros(self.nelm, dtype=dtype)
+            array[: elements.size] = elements
+            self.value = array
+            self.nord = int(elements.size)
+        else:
+            self.value = value
+        now = time.time()
+        self.timestamp = (int(now), int((now % 1) * 1e9))
+
+    def get(self, field: Optional[str], to_string: bool = False, valid_only: bool = False) -> Any:
+        """
+        Get the value of the record or of one of its fields.
+
+        Args:
+            field: the field name; None for the value
+            to_string: whether to convert the value to a string
+            valid_only: for a waveform, return only the NORD valid elements
+
+        Returns:
+            the value
+        """
+        if field == "SEVR":
+            return self.severity
+        if field == "STAT":
+            return self.status
+        if field == "DISP":
+            return "1" if self.disp else "0"
+        if field == "NORD":
+            return self.nord
+        if field == "NELM":
+            return self.nelm if self.nelm is not None else 1
+        if field == "EGU":
+            return self.units
+
+        value = self.value
+        if self.enum_strings is not None:
+            return self.enum_strings[int(value)]
+        if isinstance(value, np.ndarray):
+            value = value[: self.nord] if valid_only else value.copy()
+            if to_string:
+                return waveform_to_string(value.tolist())
+            return value
+        return str(value) if to_string else value
+
+    def metadata(self) -> ChannelMetadata:
+        """
+        Returns:
+            the field type, element count and enum strings of the PV
+        """
+        if self.enum_strings is not None:
+            field_type = ca.DBF_ENUM
+        elif isinstance(self.value, str):
+            field_type = ca.DBF_STRING
+        elif isinstance(self.value, np.ndarray) and self.value.dtype.kind in "iu":
+            field_type = ca.DBF_CHAR if self.value.dtype.itemsize == 1 else ca.DBF_LONG
+        elif isinstance(self.value, (bool, int)):
+            field_type = ca.DBF_LONG
+        else:
+            field_type = ca.DBF_DOUBLE
+        metadata = ChannelMetadata(field_type, self.nelm or 1, self.enum_strings or ())
+        metadata.units = self.units
+        return metadata
+
+
+# PVs by name
+PVS: Dict[str, LoopbackPv] = {}
+PVS_LOCK = threading.Lock()
+
+
+class LoopbackWrapper:
+    """
+    A PV connection wrapper over PVs held in memory, with the same interface as CaChannelWrapper.
+    Each request to the "IOC" can be given a latency and jitter to stand in for the network.
+    """
+
+    error_log_func: Optional[Callable[[str], None]] = None
+    # Seconds added to every request, plus a random extra of up to jitter seconds
+    latency = 0.0
+    jitter = 0.0
+
+    @staticmethod
+    def log_error(message: str) -> None:
+        """
+        Log an error.
+
+        Args:
+            message: the message to log
+        """
+        if LoopbackWrapper.error_log_func is not None:
+            LoopbackWrapper.error_log_func(message)
+        else:
+            print("CAERROR: {}".format(message))
+
+    @staticmethod
+    def set_latency(latency: float, jitter: float = 0.0) -> None:
+        """
+        Set the time taken by each request to the "IOC".
+
+        Args:
+            latency: seconds added to every request
+            jitter: most seconds randomly added to the latency of each request
+        """
+        LoopbackWrapper.latency = latency
+        LoopbackWrapper.jitter = jitter
+
+    @staticmethod
+    def add_pv(name: str, value: "PVValue" = 0.0, **kwargs: Any) -> LoopbackPv:
+        """
+        Add a PV, replacing any PV of the same name.
+
+        Args:
+            name: the PV name
+            value: the initial value
+            kwargs: the other properties of the PV, see LoopbackPv
+
+        Returns:
+            the PV
+        """
+        pv = LoopbackPv(name, value, **kwargs)
+        with PVS_LOCK:
+            PVS[name] = pv
+        return pv
+
+    @staticmethod
+    def remove_pv(name: str) -> None:
+        """
+        Remove a PV, as if its IOC had stopped; monitors of the PV are sent a disconnection alarm.
+
+        Args:
+            name: the PV name
+        """
+        with PVS_LOCK:
+            pv = PVS.pop(name, None)
+        if pv is not None:
+            with pv.lock:
+                pv.severity, pv.status = "INVALID", "LINK"
+                LoopbackWrapper._notify(pv, disconnected=True)
+
+    @staticmethod
+    def clear() -> None:
+        """
+        Remove all the PVs and reset the latency.
+        """
+        with PVS_LOCK:
+            PVS.clear()
+        LoopbackWrapper.set_latency(0.0)
+
+    @staticmethod
+    def update_pv(
+        name: str,
+        value: "PVValue|bytes" = None,
+        severity: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> None:
+        """
+        Change a PV as its IOC would, without the checks of a put, and send the change to its
+        monitors.
+
+        Args:
+            name: the PV name
+            value: the new value; None to leave it unchanged
+            severity: the new alarm severity; None to leave it unchanged
+            status: the new alarm status; None to leave it unchanged
+        """
+        pv, _ = LoopbackWrapper._find(name)
+        with pv.lock:
+            if value is not None:
+                pv.set_value(value)
+            if severity is not None:
+                pv.severity = severity
+            if status is not None:
+                pv.status = status
+            LoopbackWrapper._notify(pv)
+
+    @staticmethod
+    def _delay(extra: float = 0.0) -> None:
+        """
+        Wait for the latency of a request to the "IOC", plus any extra time.
+        """
+        delay = extra + LoopbackWrapper.latency
+        if LoopbackWrapper.jitter:
+            delay += random.uniform(0, LoopbackWrapper.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    @staticmethod
+    def _find(name: str) -> Tuple[LoopbackPv, Optional[str]]:
+        """
+        Find the record of a PV name.
+
+        Args:
+            name: the PV name, possibly with a field
+
+        Returns:
+            the record, and the field of it named; None for the value
+
+        Raises:
+            UnableToConnectToPVException: if there is no such PV
+        """
+        with PVS_LOCK:
+            pv = PVS.get(name)
+            if pv is not None:
+                return pv, None
+            record, _, field = name.rpartition(".")
+            pv = PVS.get(record)
+        if pv is None or field not in RECORD_FIELDS:
+            raise UnableToConnectToPVException(name, "Not found (loopback)")
+        return pv, None if field == "VAL" else field
+
+    @staticmethod
+    def _notify(pv: LoopbackPv, disconnected: bool = False) -> None:
+        """
+        Send the current state of a PV to its monitors; called with the PV lock held.
+
+        Args:
+            pv: the PV
+            disconnected: whether the PV has gone; only monitors with a link alarm are told
+        """
+        for field, callback, to_string, link_alarm in list(pv.monitors):
+            if disconnected and not link_alarm:
+                continue
+            try:
+                callback(pv.get(field, to_string), pv.severity, pv.status)
+            except Exception as e:
+                LoopbackWrapper.log_error("Monitor callback for {} failed: {}".format(pv.name, e))
+
+    @staticmethod
+    def _put(name: str, value: "PVValue|bytes", safe_not_quick: bool) -> LoopbackPv:
+        """
+        Write a value to a PV and send it to the PV's monitors.
+
+        Returns:
+            the PV written to
+        """
+        pv, field = LoopbackWrapper._find(name)
+        if pv.read_only or field not in (None, "DISP"):
+            raise WriteAccessException(name)
+        if safe_not_quick and pv.disp and field is None:
+            raise WriteAccessException("{} (DISP is set)".format(name))
+        with pv.lock:
+            if field == "DISP":
+                pv.disp = str(value) not in ("0", "False")
+            else:
+                pv.set_value(value)
+            LoopbackWrapper._notify(pv)
+        return pv
+
+    @staticmethod
+    def set_pv_value(
+        name: str,
+        value: "PVValue|bytes",
+        wait: bool = False,
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> None:
+        """
+        Set a PV to a value; with wait, returns once the PV's process time has passed.
+        """
+        pv = LoopbackWrapper._put(name, value, safe_not_quick)
+        LoopbackWrapper._delay(pv.process_time if wait else 0.0)
+
+    @staticmethod
+    def set_pv_values(
+        values: "Mapping[str, PVValue|bytes]",
+        wait: bool = False,
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> Dict[str, Exception]:
+        """
+        Set several PVs in a single request.
+
+        Returns:
+            dictionary of PV name to the exception raised for each PV that could not be set
+        """
+        errors: Dict[str, Exception] = {}
+        process_time = 0.0
+        for name, value in values.items():
+            try:
+                process_time = max(
+                    process_time, LoopbackWrapper._put(name, value, safe_not_quick).process_time
+                )
+            except Exception as e:
+                errors[name] = e
+        LoopbackWrapper._delay(process_time if wait else 0.0)
+        return errors
+
+    @staticmethod
+    def put_async(
+        name: str,
+        value: "PVValue|bytes",
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> "Future[None]":
+        """
+        Set a PV to a value without waiting for the put to complete.
+
+        Returns:
+            a future which is done once the PV's process time has passed
+        """
+        pv = LoopbackWrapper._put(name, value, safe_not_quick)
+        future: "Future[None]" = Future()
+        future.set_running_or_notify_cancel()
+        completion = threading.Timer(
+            LoopbackWrapper.latency + pv.process_time, future.set_result, (None,)
+        )
+        completion.daemon = True
+        completion.start()
+        return future
+
+    @staticmethod
+    def clear_monitor(name: str, timeout: float = TIMEOUT) -> None:
+        """
+        Remove all the monitors of a PV.
+        """
+        pv, _ = LoopbackWrapper._find(name)
+        with pv.lock:
+            pv.monitors = []
+
+    @staticmethod
+    def get_pv_value(
+        name: str, to_string: bool = False, timeout: float = TIMEOUT, use_numpy: bool | None = None
+    ) -> "PVValue":
+        """
+        Get the current value of a PV.
+        """
+        LoopbackWrapper._delay()
+        pv, field = LoopbackWrapper._find(name)
+        with pv.lock:
+            value = pv.get(field, to_string)
+        if use_numpy is False and isinstance(value, np.ndarray):
+            return value.tolist()
+        return value
+
+    @staticmethod
+    def get_waveform(
+        name: str, timeout: float = TIMEOUT, use_numpy: bool | None = True
+    ) -> "PVValue":
+        """
+        Get the valid elements of a waveform PV.
+        """
+        LoopbackWrapper._delay()
+        pv, field = LoopbackWrapper._find(name)
+        with pv.lock:
+            value = pv.get(field, valid_only=True)
+        if use_numpy is False and isinstance(value, np.ndarray):
+            return value.tolist()
+        return value
+
+    @staticmethod
+    def get_pv_values(
+        names: Iterable[str],
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: bool | None = None,
+    ) -> Tuple[Dict[str, "PVValue"], Dict[str, Exception]]:
+        """
+        Get the current values of several PVs in a single request.
+
+        Returns:
+            tuple of: (dictionary of PV name to value, dictionary of PV name to the exception
+            raised for each PV that could not be read)
+        """
+        LoopbackWrapper._delay()
+        values: Dict[str, "PVValue"] = {}
+        errors: Dict[str, Exception] = {}
+        for name in names:
+            try:
+                pv, field = LoopbackWrapper._find(name)
+                with pv.lock:
+                    value = pv.get(field, to_string)
+                if use_numpy is False and isinstance(value, np.ndarray):
+                    value = value.tolist()
+                values[name] = value
+            except Exception as e:
+                errors[name] = e
+        return values, errors
+
+    @staticmethod
+    def get_monitored_value(
+        name: str,
+        max_age: Optional[float] = None,
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: bool | None = None,
+    ) -> MonitoredValue:
+        """
+        Get the value of a PV along with its alarm and timestamp; monitors are always up to date,
+        so there is no request to the "IOC".
+        """
+        pv, field = LoopbackWrapper._find(name)
+        with pv.lock:
+            return MonitoredValue(pv.get(field, to_string), pv.severity, pv.status, pv.timestamp)
+
+    @staticmethod
+    def get_pv_timestamp(name: str, timeout: float = TIMEOUT) -> Tuple[int, int]:
+        """
+        Get the time a PV last changed, as (seconds, nanoseconds).
+        """
+        LoopbackWrapper._delay()
+        return LoopbackWrapper._find(name)[0].timestamp
+
+    @staticmethod
+    def pv_exists(name: str, timeout: float = TIMEOUT) -> bool:
+        """
+        Find whether a PV exists.
+        """
+        try:
+            LoopbackWrapper._find(name)
+            return True
+        except UnableToConnectToPVException:
+            return False
+
+    @staticmethod
+    def connected_pvs(names: Iterable[str], timeout: float = TIMEOUT) -> list[str]:
+        """
+        Find which of several PVs exist.
+
+        Returns:
+            the names of the PVs which exist, in the order given
+        """
+        return [name for name in names if LoopbackWrapper.pv_exists(name, timeout)]
+
+    @staticmethod
+    def search_for_pvs(names: Iterable[str], timeout: float = TIMEOUT) -> None:
+        """
+        Does nothing; loopback PVs need no search.
+        """
+
+    @staticmethod
+    def add_monitor(
+        name: str,
+        call_back_function: "Callable[[PVValue, Optional[str], Optional[str]], None]",
+        link_alarm_on_disconnect: bool = True,
+        to_string: bool = False,
+        use_numpy: bool | None = None,
+        dispatch: bool = False,
+        coalesce: bool = False,
+    ) -> Callable[[], None]:
+        """
+        Monitor a PV; the callback is called with the current state of the PV at once, as channel
+        access does, and then on every change.
+
+        Returns:
+            unsubscribe function
+        """
+        pv, field = LoopbackWrapper._find(name)
+        callback: Callable[..., None] = call_back_function
+        if dispatch or coalesce:
+            callback = MONITOR_DISPATCHER.wrap(call_back_function, coalesce)
+        monitor = (field, callback, to_string, link_alarm_on_disconnect)
+        with pv.lock:
+            pv.monitors.append(monitor)
+            callback(pv.get(field, to_string), pv.severity, pv.status)
+
+        def _unsubscribe() -> None:
+            with pv.lock:
+                if monitor in pv.monitors:
+                    pv.monitors.remove(monitor)
+
+        return _unsubscribe
+
+    @staticmethod
+    def get_metadata(name: str, timeout: float = TIMEOUT) -> ChannelMetadata:
+        """
+        Get the field type, element count and enum strings of a PV.
+        """
+        pv, field = LoopbackWrapper._find(name)
+        if field is not None:
+            return ChannelMetadata(ca.DBF_STRING, 1, ())
+        return pv.metadata()
+
+    @staticmethod
+    def get_units(name: str) -> str:
+        """
+        Get the engineering units of a PV.
+        """
+        return LoopbackWrapper._find(name)[0].units
+
+    @staticmethod
+    def dbf_type_to_string(typ: int) -> str:
+        """
+        Convert a DBF type to its name, e.g. DBF_DOUBLE.
+        """
+        return CaChannelWrapper.dbf_type_to_string(typ)
+
+
+@contextlib.contextmanager
+def loopback_backend() -> Generator["type[LoopbackWrapper]", None, None]:
+    """
+    Use the loopback backend in place of channel access in the API, DAE, block server and block
+    names manager for the duration of a with block.
+
+    Example:
+        with loopback_backend() as wrapper:
+            wrapper.add_pv("IN:DEMO:CS:SB:TEMP", 10.0)
+            api.get_pv_value("IN:DEMO:CS:SB:TEMP")
+    """
+    from genie_python import block_names, genie_blockserver, genie_dae, genie_epics_api
+
+    modules: list[Tuple[Any, str]] = [
+        (genie_epics_api, "Wrapper"),
+        (genie_dae, "CaChannelWrapper"),
+        (genie_blockserver, "CaChannelWrapper"),
+        (block_names, "CaChannelWrapper"),
+    ]
+    previous = [getattr(module, attribute) for module, attribute in modules]
+    for module, attribute in modules:
+        setattr(module, attribute, LoopbackWrapper)
+    try:
+        yield LoopbackWrapper
+    finally:
+        for (module, attribute), wrapper in zip(modules, previous):
+            setattr(module, attribute, wrapper)
@@ -0,0 +1,207 @@
+"""
+Dispatch of monitor callbacks away from the channel access threads, so that a slow callback only
+delays the updates of its own monitor rather than those of every PV.
+"""
+
+from __future__ import absolute_import, print_function
+
+import sys
+import threading
+from builtins import object
+from collections import deque
+from collections.abc import Callable
+from typing import Any, Deque, Optional, Tuple
+
+DEFAULT_WORKERS = 4  # Worker threads running callbacks
+DEFAULT_MAX_QUEUED = 10000  # Updates queued across all callbacks before updates are dropped
+
+
+class DispatchedCallback(object):
+    """
+    A callback whose calls are queued on a dispatcher and run by its workers. Calls of one
+    dispatched callback are run one at a time and in order.
+
+    In coalescing mode only the latest queued call is kept, so a callback which cannot keep up
+    with its monitor skips to the latest value rather than falling further behind.
+    """
+
+    def __init__(
+        self, dispatcher: "MonitorDispatcher", callback: Callable[..., None], coalesce: bool
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            dispatcher: the dispatcher to queue calls on
+            callback: the callback to run
+            coalesce: True to keep only the latest queued call; False to run every call
+        """
+        self.dispatcher = dispatcher
+        self.callback = callback
+        self.coalesce = coalesce
+        self.pending: Deque[Tuple[Any, ...]] = deque()
+        # Whether the callback is waiting for, or being run by, a worker
+        self.scheduled = False
+        self.closed = False
+        # Calls replaced by a later call before they were run
+        self.coalesced = 0
+        # Calls not run because the dispatcher queue was full
+        self.dropped = 0
+
+    def __call__(self, *args: Any) -> None:
+        self.dispatcher.submit(self, args)
+
+    def close(self) -> None:
+        """
+        Stop running the callback; calls still queued are discarded.
+        """
+        self.dispatcher.discard(self)
+
+
+class MonitorDispatcher(object):
+    """
+    Runs monitor callbacks on a pool of worker threads, fed by a bounded queue.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        error_handler: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Constructor. The worker threads are started on first use.
+
+        Args:
+            workers: the number of worker threads
+            max_queued: the most calls queued at once; further calls are dropped
+            error_handler: called with a message when a callback raises; None to print it
+        """
+        self.workers = workers
+        self.max_queued = max_queued
+        self.error_handler = error_handler
+        self._ready: Deque[DispatchedCallback] = deque()
+        self._condition = threading.Condition()
+        self._threads: list[threading.Thread] = []
+        self._queued = 0
+        self._dispatched = 0
+        self._coalesced = 0
+        self._dropped = 0
+
+    def wrap(self, callback: Callable[..., None], coalesce: bool = False) -> DispatchedCallback:
+        """
+        Wrap a callback so that calling it queues the call on this dispatcher.
+
+        Args:
+            callback: the callback to run
+            coalesce: True to keep only the latest queued call; False to run every call
+
+        Returns:
+            the dispatched callback
+        """
+        return DispatchedCallback(self, callback, coalesce)
+
+    def submit(self, dispatched: DispatchedCallback, args: Tuple[Any, ...]) -> None:
+        """
+        Queue a call of a dispatched callback.
+
+        Args:
+            dispatched: the dispatched callback
+            args: the arguments to call it with
+        """
+        with self._condition:
+            if dispatched.closed:
+                return
+            if dispatched.coalesce and dispatched.pending:
+                dispatched.pending[-1] = args
+                dispatched.coalesced += 1
+                self._coalesced += 1
+                return
+            if self._queued >= self.max_queued:
+                dispatched.dropped += 1
+                self._dropped += 1
+                return
+            dispatched.pending.append(args)
+            self._queued += 1
+            if not dispatched.scheduled:
+                dispatched.scheduled = True
+                self._ready.append(dispatched)
+                self._condition.notify()
+            if len(self._threads) < self.workers:
+                self._start_worker()
+
+    def discard(self, dispatched: DispatchedCallback) -> None:
+        """
+        Stop running a dispatched callback, discarding its queued calls.
+
+        Args:
+            dispatched: the dispatched callback
+        """
+        with self._condition:
+            dispatched.closed = True
+            self._queued -= len(dispatched.pending)
+            dispatched.pending.clear()
+
+    def statistics(self) -> dict[str, int]:
+        """
+        Returns:
+            the number of calls run (dispatched), replaced by a later call (coalesced), not run
+            because the queue was full (dropped) and waiting to be run (queued)
+        """
+        with self._condition:
+            return {
+                "dispatched": self._dispatched,
+                "coalesced": self._coalesced,
+                "dropped": self._dropped,
+                "queued": self._queued,
+            }
+
+    def _start_worker(self) -> None:
+        """
+        Start a worker thread; called with the condition held.
+        """
+        thread = threading.Thread(
+            target=self._run_worker,
+            name="MonitorDispatcher-{}".format(len(self._threads)),
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _run_worker(self) -> None:
+        """
+        Run queued calls, one call of a callback at a time.
+        """
+        while True:
+            with self._condition:
+                while not self._ready:
+                    self._condition.wait()
+                dispatched = self._ready.popleft()
+                if not dispatched.pending:
+                    # Discarded while waiting
+                    dispatched.scheduled = False
+                    continue
+                args = dispatched.pending.popleft()
+                self._queued -= 1
+
+            try:
+                dispatched.callback(*args)
+            except Exception as e:
+                self._report_error("Monitor callback failed: {}".format(e))
+
+            with self._condition:
+                self._dispatched += 1
+                if dispatched.pending:
+                    self._ready.append(dispatched)
+                    self._condition.notify()
+                else:
+                    dispatched.scheduled = False
+
+    def _report_error(self, message: str) -> None:
+        """
+        Report an error from a callback.
+        """
+        if self.error_handler is not None:
+            self.error_handler(message)
+        else:
+            print(message, file=sys.stderr)
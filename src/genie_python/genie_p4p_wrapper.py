@@ -5,14 +5,20 @@ Wrapping of p4p in genie_python
 from __future__ import absolute_import, print_function
 
 import threading
+import time
 from builtins import object
-from collections.abc import Callable
-from typing import TYPE_CHECKING, Optional, Tuple
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, cast
 
+import numpy as np
 from p4p import Value
 from p4p.client.thread import Context, Subscription
 
-from .channel_access_exceptions import WriteAccessException
+from .channel_access_exceptions import UnableToConnectToPVException, WriteAccessException
+from .genie_monitor_dispatcher import DispatchedCallback, MonitorDispatcher
+from .genie_pv_connection_protocol import MonitoredValue
+from .genie_pv_instrumentation import GET, INSTRUMENTATION, MONITOR, PUT, PUT_CALLBACK
 from .utilities import waveform_to_string
 
 if TYPE_CHECKING:
@@ -20,12 +26,81 @@ if TYPE_CHECKING:
 
 TIMEOUT = 15  # Default timeout for PV set/get
 EXIST_TIMEOUT = 3  # Separate smaller timeout for pv_exists() and searchw() operations
-CACHE = threading.local()
-CACHE_LOCK = threading.local()
+# Request for only the timestamp of a PV, used to find whether it exists with the least data
+EXIST_REQUEST = "field(timeStamp)"
+# The process-wide contexts, by whether they wrap normative types; a context is thread safe
+CONTEXTS: dict[bool, Context] = {}
+CONTEXT_LOCK = threading.Lock()
+# Monitors added by add_monitor, by PV name, so they can be cleared by name
+SUBSCRIPTIONS: dict[str, list["_Monitor"]] = {}
+SUBSCRIPTIONS_LOCK = threading.Lock()
+# Whether DISP is set on each record that has been written to, kept up to date by a monitor;
+# None when not known, e.g. while the DISP field is disconnected
+DISP_STATES: dict[str, Optional[bool]] = {}
+DISP_SUBSCRIPTIONS: dict[str, Subscription] = {}
+DISP_LOCK = threading.Lock()
+MONITORED_READ_IDLE_TIMEOUT = 60  # Monitored reads not read for this many seconds are unsubscribed
+# Waits for the completion of puts started by put_async
+PUT_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="P4PPut")
+# Runs the callbacks of monitors added with dispatch, off the p4p worker threads
+MONITOR_DISPATCHER = MonitorDispatcher(error_handler=lambda message: P4PWrapper._log_error(message))
+
+
+class _MonitoredRead(object):
+    """
+    A subscription holding the latest value of a PV, so that reads need no request to the server.
+    """
+
+    def __init__(self) -> None:
+        self.subscription: Optional[Subscription] = None
+        self.value: Optional[MonitoredValue] = None
+        # When the value was last received, from the monitor or from a get; None when disconnected
+        self.received: Optional[float] = None
+        self.last_read = time.monotonic()
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        if self.subscription is not None:
+            self.subscription.close()
+            self.subscription = None
+        self.value = None
+        self.received = None
+
+
+class _Monitor(object):
+    """
+    A monitor added by add_monitor. Closing it, or calling it as the function returned by the CA
+    wrapper is called, closes its subscription and removes it from SUBSCRIPTIONS.
+    """
+
+    def __init__(
+        self, name: str, subscription: Subscription, dispatched: Optional[DispatchedCallback]
+    ) -> None:
+        self.name = name
+        self.subscription = subscription
+        self.dispatched = dispatched
+
+    def __call__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with SUBSCRIPTIONS_LOCK:
+            monitors = SUBSCRIPTIONS.get(self.name, [])
+            if self in monitors:
+                monitors.remove(self)
+                if not monitors:
+                    del SUBSCRIPTIONS[self.name]
+        self.subscription.close()
+        if self.dispatched is not None:
+            self.dispatched.close()
+
+
+# Monitored reads by PV name and whether they are read as strings
+MONITORED_READS: dict[Tuple[str, bool], _MonitoredRead] = {}
+MONITORED_READS_LOCK = threading.Lock()
 
 
 class P4PWrapper(object):
-    context: Optional[Context] = None
     error_log_function: Optional[Callable[[str], None]] = None
 
     # noinspection PyPep8Naming
@@ -55,21 +130,83 @@ class P4PWrapper(object):
         if safe_not_quick:
             P4PWrapper._check_for_disp(name)
         context = P4PWrapper.get_context()
+        start = time.perf_counter()
         context.put(name, value, timeout=timeout, wait=wait)
+        INSTRUMENTATION.record(
+            name, PUT_CALLBACK if wait else PUT, time.perf_counter() - start, value
+        )
 
     @staticmethod
-    def clear_monitor(name: str, timeout: float) -> None:
-        try:
-            lock = CACHE_LOCK.lock
-        except AttributeError:
-            lock = CACHE_LOCK.lock = threading.RLock()
-        with lock:
+    def set_pv_values(
+        values: "Mapping[str, PVValue|bytes]",
+        wait: bool = False,
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> Dict[str, Exception]:
+        """
+        Set several PVs at once, in a single request to the context.
+
+        Returns:
+            dictionary of PV name to the exception raised for each PV that could not be set
+        """
+        errors: Dict[str, Exception] = {}
+        names = []
+        for name in values:
             try:
-                subscriptions = CACHE.subscriptions
-                if name in subscriptions:
-                    subscriptions.pop(name).close()
-            except AttributeError:
-                return
+                if safe_not_quick:
+                    P4PWrapper._check_for_disp(name)
+                names.append(name)
+            except Exception as e:
+                errors[name] = e
+        if not names:
+            return errors
+
+        context = P4PWrapper.get_context()
+        start = time.perf_counter()
+        # With throw=False each failed put is returned as its exception rather than raised
+        outputs = cast(
+            "list[Exception | None]",
+            context.put(
+                names, [values[name] for name in names], timeout=timeout, wait=wait, throw=False
+            ),
+        )
+        # The puts are made together, so each takes as long as all of them
+        latency = time.perf_counter() - start
+        for name, output in zip(names, outputs):
+            if isinstance(output, Exception):
+                errors[name] = output
+            else:
+                INSTRUMENTATION.record(name, PUT_CALLBACK if wait else PUT, latency, values[name])
+        return errors
+
+    @staticmethod
+    def put_async(
+        name: str,
+        value: "PVValue|bytes",
+        timeout: float = TIMEOUT,
+        safe_not_quick: bool = True,
+    ) -> "Future[None]":
+        """
+        Start setting a PV to a value, without waiting for the put to complete. The thread
+        Context only has blocking puts, so each put is waited for on a worker thread.
+
+        Returns:
+            a future whose result is set when the put completes, or whose exception is set if the
+            put fails
+        """
+        if safe_not_quick:
+            P4PWrapper._check_for_disp(name)
+        return PUT_EXECUTOR.submit(P4PWrapper.set_pv_value, name, value, True, timeout, False)
+
+    @staticmethod
+    def clear_monitor(name: str, timeout: float) -> None:
+        """
+        Close all the monitors added to a PV by add_monitor.
+        """
+        with SUBSCRIPTIONS_LOCK:
+            monitors = SUBSCRIPTIONS.pop(name, [])
+        for monitor in monitors:
+            monitor.close()
 
     @staticmethod
     def get_pv_value(
@@ -79,7 +216,11 @@ class P4PWrapper(object):
         use_numpy: Optional[bool] = None,
     ) -> "PVValue":
         context = P4PWrapper.get_context()
-        output = context.get(name, timeout=timeout)
+        start = time.perf_counter()
+        try:
+            output = context.get(name, timeout=timeout)
+        except TimeoutError:
+            raise UnableToConnectToPVException(name, "Connection timeout")
         if isinstance(output, Exception):
             raise output
 
@@ -87,7 +228,62 @@ class P4PWrapper(object):
         # to a list of names. This should be replaced by proper handling for [Value] and [Exception]
         # In a non-minimal/equivalent to CaChannel implementation.
         assert isinstance(output, Value)
+        value = P4PWrapper._convert_value(output, to_string)
+        INSTRUMENTATION.record(name, GET, time.perf_counter() - start, value)
+        return value
+
+    @staticmethod
+    def get_waveform(
+        name: str, timeout: float = TIMEOUT, use_numpy: Optional[bool] = True
+    ) -> "PVValue":
+        """
+        Get the valid elements of a waveform PV; PV access always sends only the current elements
+        of an array, as a numpy array.
+        """
+        value = P4PWrapper.get_pv_value(name, timeout=timeout)
+        if use_numpy is False and isinstance(value, np.ndarray):
+            return value.tolist()
+        return value
+
+    @staticmethod
+    def get_pv_values(
+        names: Iterable[str],
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: Optional[bool] = None,
+    ) -> Tuple[Dict[str, "PVValue"], Dict[str, Exception]]:
+        """
+        Get the current values of several PVs at once, in a single request to the context.
+
+        Returns:
+            tuple of: (dictionary of PV name to value, dictionary of PV name to the exception
+            raised for each PV that could not be read)
+        """
+        names = list(dict.fromkeys(names))
+        values: Dict[str, "PVValue"] = {}
+        errors: Dict[str, Exception] = {}
+        if not names:
+            return values, errors
+
+        context = P4PWrapper.get_context()
+        start = time.perf_counter()
+        # With throw=False each failed get is returned as its exception rather than raised
+        outputs = cast("list[Value | Exception]", context.get(names, timeout=timeout, throw=False))
+        # The gets are made together, so each takes as long as all of them
+        latency = time.perf_counter() - start
+        for name, output in zip(names, outputs):
+            if isinstance(output, Exception):
+                errors[name] = output
+            else:
+                values[name] = P4PWrapper._convert_value(output, to_string)
+                INSTRUMENTATION.record(name, GET, latency, values[name])
+        return values, errors
 
+    @staticmethod
+    def _convert_value(output: Value, to_string: bool) -> "PVValue":
+        """
+        Get the value from a response.
+        """
         val = output.value
 
         # If it's still a Value type then it's an Enum, so get the index or choice.
@@ -98,6 +294,82 @@ class P4PWrapper(object):
             val = str(val)
         return val
 
+    @staticmethod
+    def get_monitored_value(
+        name: str,
+        max_age: Optional[float] = None,
+        to_string: bool = False,
+        timeout: float = TIMEOUT,
+        use_numpy: Optional[bool] = None,
+    ) -> MonitoredValue:
+        """
+        Get the latest value of a PV along with its alarm and timestamp from a monitor, which is
+        created on the first read. If the value is older than max_age seconds, or the monitor is
+        disconnected, the PV is read instead. Monitors not read for MONITORED_READ_IDLE_TIMEOUT
+        seconds are closed.
+        """
+        now = time.monotonic()
+        key = (name, to_string)
+        with MONITORED_READS_LOCK:
+            for idle_key, idle_read in list(MONITORED_READS.items()):
+                if idle_key != key and now - idle_read.last_read > MONITORED_READ_IDLE_TIMEOUT:
+                    del MONITORED_READS[idle_key]
+                    idle_read.close()
+            read = MONITORED_READS.get(key)
+            if read is None:
+                read = MONITORED_READS[key] = _MonitoredRead()
+            read.last_read = now
+
+        with read.lock:
+            if read.subscription is None:
+                read.subscription = P4PWrapper._monitor_read(name, read, to_string)
+            value, received = read.value, read.received
+            if (
+                value is None
+                or received is None
+                or (max_age is not None and now - received > max_age)
+            ):
+                output = P4PWrapper.get_context().get(name, timeout=timeout)
+                if isinstance(output, Exception):
+                    raise output
+                assert isinstance(output, Value)
+                value = P4PWrapper._to_monitored_value(output, to_string)
+                read.value, read.received = value, time.monotonic()
+        return value
+
+    @staticmethod
+    def _monitor_read(name: str, read: _MonitoredRead, to_string: bool) -> Subscription:
+        """
+        Monitor a PV, keeping the value of a monitored read up to date.
+        """
+
+        def _value_changed(response: Value | Exception) -> None:
+            if isinstance(response, Exception):
+                read.received = None
+            else:
+                read.value = P4PWrapper._to_monitored_value(response, to_string)
+                read.received = time.monotonic()
+
+        return P4PWrapper.get_context().monitor(name, _value_changed, notify_disconnect=True)
+
+    @staticmethod
+    def _to_monitored_value(output: Value, to_string: bool) -> MonitoredValue:
+        """
+        Get the value, alarm and timestamp from a response.
+        """
+        alarm = output.get("alarm")
+        timestamp = output.get("timeStamp")
+        return MonitoredValue(
+            P4PWrapper._convert_value(output, to_string),
+            alarm.get("severity") if alarm is not None else None,
+            alarm.get("status") if alarm is not None else None,
+            (
+                (timestamp.get("secondsPastEpoch"), timestamp.get("nanoseconds"))
+                if timestamp is not None
+                else (0, 0)
+            ),
+        )
+
     @staticmethod
     def get_pv_timestamp(name: str, timeout: float = TIMEOUT) -> Tuple[int, int]:
         context = P4PWrapper.get_context()
@@ -115,11 +387,48 @@ class P4PWrapper(object):
 
     @staticmethod
     def pv_exists(name: str, timeout: float) -> bool:
-        try:
-            P4PWrapper.get_pv_value(name, timeout=timeout)
-            return True
-        except TimeoutError:
-            return False
+        """
+        Find whether a PV exists. A PV with a monitored read that has a value exists without
+        asking the server; otherwise only the timestamp of the PV is requested.
+        """
+        with MONITORED_READS_LOCK:
+            if any(
+                key[0] == name and read.received is not None
+                for key, read in MONITORED_READS.items()
+            ):
+                return True
+        output = P4PWrapper.get_context().get(
+            name, request=EXIST_REQUEST, timeout=timeout, throw=False
+        )
+        # Any other error is a reply from the server, so the PV is there
+        return not isinstance(output, TimeoutError)
+
+    @staticmethod
+    def connected_pvs(names: Iterable[str], timeout: float = EXIST_TIMEOUT) -> list[str]:
+        """
+        Find which of several PVs exist, with a single request to the context.
+
+        Returns:
+            the names of the PVs which exist, in the order given
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return []
+        context = P4PWrapper.get_context()
+        outputs = cast(
+            "list[Value | Exception]",
+            # A list of names needs a request for each
+            context.get(names, request=[EXIST_REQUEST] * len(names), timeout=timeout, throw=False),
+        )
+        return [
+            name for name, output in zip(names, outputs) if not isinstance(output, TimeoutError)
+        ]
+
+    @staticmethod
+    def search_for_pvs(names: Iterable[str], timeout: float = EXIST_TIMEOUT) -> None:
+        """
+        Does nothing; the context creates and connects channels on their first use.
+        """
 
     @staticmethod
     def add_monitor(
@@ -128,7 +437,14 @@ class P4PWrapper(object):
         link_alarm_on_disconnect: bool = True,
         to_string: bool = False,
         use_numpy: Optional[bool] = None,
-    ) -> Subscription:
+        dispatch: bool = False,
+        coalesce: bool = False,
+    ) -> _Monitor:
+        dispatched = None
+        if dispatch or coalesce:
+            dispatched = MONITOR_DISPATCHER.wrap(call_back_function, coalesce)
+            call_back_function = dispatched
+
         def _process_call_back(response: Value | Exception) -> None:
             if isinstance(response, Exception):
                 P4PWrapper._log_error(str(response))
@@ -144,6 +460,7 @@ class P4PWrapper(object):
                     value = str(value)
             elif isinstance(value, Value):
                 value = value.index
+            INSTRUMENTATION.record(name, MONITOR, value=value)
 
             call_back_function(
                 value,
@@ -154,40 +471,38 @@ class P4PWrapper(object):
         context = P4PWrapper.get_context()
         subscription = context.monitor(name, _process_call_back, notify_disconnect=True)
 
-        # Add to a dict of subscriptions to reproduce ability to close a monitor by its name.
-        try:
-            lock = CACHE_LOCK.lock
-        except AttributeError:
-            lock = CACHE_LOCK.lock = threading.RLock()
-        with lock:
-            try:
-                subscriptions = CACHE.subscriptions
-                subscriptions.update({name: subscription})
-            except AttributeError:
-                CACHE.subscriptions = {name: Subscription}
-        return subscription
+        monitor = _Monitor(name, subscription, dispatched)
+        # Add to a dict of monitors to reproduce ability to close a monitor by its name.
+        with SUBSCRIPTIONS_LOCK:
+            SUBSCRIPTIONS.setdefault(name, []).append(monitor)
+        return monitor
 
     @staticmethod
     def get_context(autowrap: bool = False) -> Context:
-        try:
-            lock = CACHE_LOCK.lock
-        except AttributeError:
-            lock = CACHE_LOCK.lock = threading.RLock()
+        """
+        Get the context shared by all threads, creating it on first use. Sharing one context
+        means channels are searched for and connected once per process rather than per thread.
 
-        with lock:
-            try:
-                thread_context = CACHE.context
-            except AttributeError:
-                thread_context = CACHE.context = Context("pva", nt=autowrap)
-            if thread_context is None:
-                thread_context = Context("pva", nt=autowrap)
-        return thread_context
+        Args:
+            autowrap: whether the context wraps normative type values
+
+        Returns:
+            the context
+        """
+        with CONTEXT_LOCK:
+            context = CONTEXTS.get(autowrap)
+            if context is None:
+                context = CONTEXTS[autowrap] = Context("pva", nt=autowrap)
+        return context
 
     @staticmethod
     def _check_for_disp(name: str) -> None:
         """
         Check if DISP is set on a PV. If passed a field instead of a PV, do nothing.
         Only check DISP if it exists.
+
+        The DISP field is monitored from the first time a record is written to, so later checks
+        only need a lookup. A record without a DISP field is remembered as such until one appears.
         """
         if (
             ".DISP" not in name
@@ -195,9 +510,65 @@ class P4PWrapper(object):
             if "." in name:  # If given a field on a PV, check the PV itself if DISP is set
                 name = name.split(".")[0]
             _disp_name = "{}.DISP".format(name)
-            if P4PWrapper.pv_exists(_disp_name, 0) and P4PWrapper.get_pv_value(_disp_name) != "0":
+            with DISP_LOCK:
+                if name not in DISP_SUBSCRIPTIONS:
+                    DISP_SUBSCRIPTIONS[name] = P4PWrapper._monitor_disp(name, _disp_name)
+                disabled = DISP_STATES.get(name)
+            if disabled is None:
+                # Give the DISP field the usual time to connect, as the answer is remembered
+                disabled = (
+                    P4PWrapper.pv_exists(_disp_name, EXIST_TIMEOUT)
+                    and P4PWrapper.get_pv_value(_disp_name) != "0"
+                )
+                with DISP_LOCK:
+                    # The monitor may already have a newer value
+                    if DISP_STATES.get(name) is None:
+                        DISP_STATES[name] = disabled
+            if disabled:
                 raise WriteAccessException("{} (DISP is set)".format(name))
 
+    @staticmethod
+    def _monitor_disp(name: str, disp_name: str) -> Subscription:
+        """
+        Monitor the DISP field of a record, keeping its entry in DISP_STATES up to date. If the
+        field does not exist the monitor waits for it to appear.
+        """
+
+        connected = False
+
+        def _disp_changed(response: Value | Exception) -> None:
+            nonlocal connected
+            with DISP_LOCK:
+                if isinstance(response, Exception):
+                    # Only forget the state if it came from the monitor, so that a record without
+                    # a DISP field stays remembered as such
+                    if connected:
+                        DISP_STATES[name] = None
+                    connected = False
+                else:
+                    connected = True
+                    DISP_STATES[name] = P4PWrapper._convert_value(response, False) != "0"
+
+        return P4PWrapper.get_context().monitor(disp_name, _disp_changed, notify_disconnect=True)
+
     @staticmethod
     def close_context() -> None:
-        P4PWrapper.get_context().close()
+        """
+        Close the shared contexts, and with them every monitor; a new context is created on next
+        use.
+        """
+        with CONTEXT_LOCK:
+            contexts = list(CONTEXTS.values())
+            CONTEXTS.clear()
+        with SUBSCRIPTIONS_LOCK:
+            monitors = [monitor for monitors in SUBSCRIPTIONS.values() for monitor in monitors]
+            SUBSCRIPTIONS.clear()
+        for monitor in monitors:
+            monitor.close()
+        with MONITORED_READS_LOCK:
+            MONITORED_READS.clear()
+        with DISP_LOCK:
+            DISP_SUBSCRIPTIONS.clear()
+            DISP_STATES.clear()
+        for context in contexts:
+            context.close()
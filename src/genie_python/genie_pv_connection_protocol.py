@@ -1,10 +1,38 @@
-from collections.abc import Callable
-from typing import TYPE_CHECKING, Optional, Protocol, Tuple, runtime_checkable
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, Optional, Protocol, Tuple, runtime_checkable
 
 if TYPE_CHECKING:
     from genie_python.genie import PVValue
 
 
+class MonitoredValue(object):
+    """
+    The latest value of a PV along with its alarm and timestamp, as returned by a monitored read.
+    """
+
+    def __init__(
+        self,
+        value: "PVValue",
+        severity: object,
+        status: object,
+        timestamp: Tuple[int, int],
+    ) -> None:
+        """
+        Constructor.
+
+        Args:
+            value: the value of the PV
+            severity: the alarm severity of the PV
+            status: the alarm status of the PV
+            timestamp: the time the PV was processed, as (seconds, nanoseconds)
+        """
+        self.value = value
+        self.severity = severity
+        self.status = status
+        self.timestamp = timestamp
+
+
 @runtime_checkable
 class GeniePvConnectionProtocol(Protocol):
     @staticmethod
@@ -12,6 +40,16 @@ class GeniePvConnectionProtocol(Protocol):
         name: str, value: "PVValue|bytes", wait: bool, timeout: float, safe_not_quick: bool
     ) -> None: ...
 
+    @staticmethod
+    def set_pv_values(
+        values: "Mapping[str, PVValue|bytes]", wait: bool, timeout: float, safe_not_quick: bool
+    ) -> Dict[str, Exception]: ...
+
+    @staticmethod
+    def put_async(
+        name: str, value: "PVValue|bytes", timeout: float, safe_not_quick: bool
+    ) -> "Future[None]": ...
+
     @staticmethod
     def clear_monitor(name: str, timeout: float) -> None: ...
 
@@ -20,12 +58,35 @@ class GeniePvConnectionProtocol(Protocol):
         name: str, to_string: bool, timeout: float, use_numpy: bool | None
     ) -> "PVValue": ...
 
+    @staticmethod
+    def get_waveform(name: str, timeout: float, use_numpy: bool | None) -> "PVValue": ...
+
+    @staticmethod
+    def get_pv_values(
+        names: Iterable[str], to_string: bool, timeout: float, use_numpy: bool | None
+    ) -> Tuple[Dict[str, "PVValue"], Dict[str, Exception]]: ...
+
+    @staticmethod
+    def get_monitored_value(
+        name: str,
+        max_age: Optional[float],
+        to_string: bool,
+        timeout: float,
+        use_numpy: bool | None,
+    ) -> MonitoredValue: ...
+
     @staticmethod
     def get_pv_timestamp(name: str, timeout: float) -> Tuple[int, int]: ...
 
     @staticmethod
     def pv_exists(name: str, timeout: float) -> bool: ...
 
+    @staticmethod
+    def connected_pvs(names: Iterable[str], timeout: float) -> list[str]: ...
+
+    @staticmethod
+    def search_for_pvs(names: Iterable[str], timeout: float) -> None: ...
+
     @staticmethod
     def add_monitor(
         name: str,
@@ -33,4 +94,6 @@ class GeniePvConnectionProtocol(Protocol):
         link_alarm_on_disconnect: bool = True,
         to_string: bool = False,
         use_numpy: bool | None = None,
+        dispatch: bool = False,
+        coalesce: bool = False,
     ) -> Callable[[], None]: ...
@@ -0,0 +1,258 @@
+"""
+Optional instrumentation of PV access: counts, payload sizes and latency histograms for each PV and
+type of operation, recorded by the connection wrappers. Used to find which IOC or gateway is slow
+without capturing network traffic.
+"""
+
+from __future__ import absolute_import, print_function
+
+import json
+import threading
+from builtins import object
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from genie_python.genie import PVValue
+
+# Operation types
+CONNECT = "connect"
+GET = "get"
+PUT = "put"
+PUT_CALLBACK = "put_callback"
+MONITOR = "monitor"
+
+# Upper bounds in seconds of the latency histogram buckets; a last bucket holds slower operations
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, 2.0, 5.0)
+# Size assumed for a number, the size of a DBR_DOUBLE
+NUMBER_SIZE = 8
+
+
+def payload_size(value: "PVValue|bytes|dict[Any, Any]") -> int:
+    """
+    Estimate how many bytes of data a PV value takes on the network; protocol headers and alarm
+    and time fields are not counted.
+
+    Args:
+        value: the value, or a dictionary holding it as pv_value
+
+    Returns:
+        the estimated size in bytes
+    """
+    if value is None:
+        return 0
+    if isinstance(value, dict):
+        return payload_size(value.get("pv_value"))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="replace"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(payload_size(item) for item in value)
+    return NUMBER_SIZE
+
+
+class OperationStatistics(object):
+    """
+    Statistics of one type of operation on one PV.
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.bytes = 0
+        # Operations with a latency; monitor updates have none
+        self.timed = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def add(self, latency: Optional[float], size: int) -> None:
+        """
+        Add an operation.
+
+        Args:
+            latency: how long the operation took in seconds; None if not timed
+            size: the payload size of the operation in bytes
+        """
+        self.count += 1
+        self.bytes += size
+        if latency is None:
+            return
+        self.timed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS) and latency > LATENCY_BUCKETS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        """
+        Estimate a latency percentile from the histogram.
+
+        Args:
+            fraction: the fraction of operations, e.g. 0.95 for the 95th percentile
+
+        Returns:
+            the upper bound of the bucket holding the percentile (the longest latency for the last
+            bucket); None if there are no timed operations
+        """
+        if self.timed == 0:
+            return None
+        needed = fraction * self.timed
+        total = 0
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS):
+            total += self.histogram[bucket]
+            if total >= needed and self.histogram[bucket] > 0:
+                return LATENCY_BUCKETS[bucket]
+            bucket += 1
+        return self.max_latency
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            the statistics as a dictionary which can be written as JSON
+        """
+        return {
+            "count": self.count,
+            "bytes": self.bytes,
+            "timed": self.timed,
+            "total_latency": self.total_latency,
+            "mean_latency": self.total_latency / self.timed if self.timed else None,
+            "p95_latency": self.percentile(0.95),
+            "max_latency": self.max_latency if self.timed else None,
+            "histogram": dict(
+                zip([str(bound) for bound in LATENCY_BUCKETS] + ["inf"], self.histogram)
+            ),
+        }
+
+
+class PvInstrumentation(object):
+    """
+    Statistics of PV access by PV name and operation type. Nothing is recorded until enabled.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._statistics: Dict[Tuple[str, str], OperationStatistics] = {}
+
+    def enable(self, enabled: bool = True) -> None:
+        """
+        Start or stop recording.
+
+        Args:
+            enabled: True to record operations; False to stop recording
+        """
+        self.enabled = enabled
+
+    def reset(self) -> None:
+        """
+        Forget everything recorded so far.
+        """
+        with self._lock:
+            self._statistics.clear()
+
+    def record(
+        self,
+        name: str,
+        operation: str,
+        latency: Optional[float] = None,
+        value: "PVValue|bytes|dict[Any, Any]" = None,
+    ) -> None:
+        """
+        Record an operation, if enabled.
+
+        Args:
+            name: the PV name
+            operation: the operation type, e.g. GET
+            latency: how long the operation took in seconds; None if not timed
+            value: the value sent or received, used to estimate the payload size
+        """
+        if not self.enabled:
+            return
+        size = payload_size(value)
+        with self._lock:
+            statistics = self._statistics.get((name, operation))
+            if statistics is None:
+                statistics = self._statistics[(name, operation)] = OperationStatistics()
+            statistics.add(latency, size)
+
+    def summary(self) -> list[Dict[str, Any]]:
+        """
+        Returns:
+            the statistics of each PV and operation type, slowest in total first
+        """
+        with self._lock:
+            rows = [
+                dict(pv=name, operation=operation, **statistics.to_dict())
+                for (name, operation), statistics in self._statistics.items()
+            ]
+        return sorted(rows, key=lambda row: (-row["total_latency"], -row["count"], row["pv"]))
+
+    def format_summary(self, max_rows: Optional[int] = None) -> str:
+        """
+        Format the statistics as a table, slowest in total first.
+
+        Args:
+            max_rows: the most rows to show; None for all of them
+
+        Returns:
+            the table
+        """
+        rows = self.summary()
+        if max_rows is not None:
+            rows = rows[:max_rows]
+        header = ("PV", "Operation", "Count", "Bytes", "Mean (ms)", "P95 (ms)", "Max (ms)")
+        lines = [header] + [
+            (
+                row["pv"],
+                row["operation"],
+                str(row["count"]),
+                str(row["bytes"]),
+                _format_milliseconds(row["mean_latency"]),
+                _format_milliseconds(row["p95_latency"]),
+                _format_milliseconds(row["max_latency"]),
+            )
+            for row in rows
+        ]
+        widths = [max(len(line[column]) for line in lines) for column in range(len(header))]
+        return "\n".join(
+            "  ".join(
+                cell.ljust(width) if column < 2 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(line, widths))
+            ).rstrip()
+            for line in lines
+        )
+
+    def to_json(self) -> str:
+        """
+        Returns:
+            the statistics as JSON: a list of the statistics of each PV and operation type
+        """
+        return json.dumps(self.summary(), indent=2)
+
+    def export(self, filename: str) -> None:
+        """
+        Write the statistics to a file as JSON.
+
+        Args:
+            filename: the file to write
+        """
+        with open(filename, "w") as f:
+            f.write(self.to_json())
+
+
+def _format_milliseconds(seconds: Optional[float]) -> str:
+    """
+    Format a latency in seconds as milliseconds; "-" if there is none.
+    """
+    return "-" if seconds is None else "{:.1f}".format(seconds * 1000)
+
+
+# Instrumentation shared by all the connection wrappers
+INSTRUMENTATION = PvInstrumentation()
@@ -7,6 +7,7 @@ import typing
 import xml.etree.ElementTree as ET
 from builtins import object, str
 from collections import OrderedDict
+from concurrent.futures import Future
 from datetime import timedelta
 from typing import TYPE_CHECKING, Callable
 
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
         PVValue,
         _CgetReturn,
         _GetbeamlineparsReturn,
+        _GetdashboardReturn,
         _GetSampleParsReturn,
         _GetspectrumReturn,
     )
@@ -307,6 +309,39 @@ class Dae(object):
         self.change_cache = ChangeCache()
         self.autosave_freq = 10
 
+    def get_dashboard(self) -> "_GetdashboardReturn":
+        """
+        Gets the current experiment values.
+
+        Returns:
+            dict: the experiment values
+        """
+        return typing.cast(
+            "_GetdashboardReturn",
+            {
+                "status": self.get_run_state(),
+                "run_number": self.get_run_number(),
+                "rb_number": self.get_rb_number(),
+                "user": self.get_users(),
+                "title": self.get_title(),
+                "display_title": self.get_display_title(),
+                "run_time": self.get_run_duration(),
+                "good_frames_total": self.get_good_frames(),
+                "good_frames_period": self.get_good_frames(True),
+                "raw_frames_total": self.get_raw_frames(),
+                "raw_frames_period": self.get_raw_frames(True),
+                "beam_current": self.get_beam_current(),
+                "total_current": self.get_total_uamps(),
+                "spectra": self.get_num_spectra(),
+                "periods": self.get_num_periods(),
+                "time_channels": self.get_num_timechannels(),
+                "monitor_spectrum": self.get_monitor_spectrum(),
+                "monitor_from": self.get_monitor_from(),
+                "monitor_to": self.get_monitor_to(),
+                "monitor_counts": self.get_monitor_counts(),
+            },
+        )
+
     @require_runstate(["SETUP"])
     def begin_run(
         self,
@@ -1126,6 +1161,8 @@ class API(object):
         self.strict_block = strict_block
         self.logger = GenieLogger(sim_mode=True)
         self.exp_data = None
+        self.monitored_reads = False
+        self.monitored_read_max_age: float | None = None
 
     def set_instrument(
         self, pv_prefix: str, globs: dict | None, import_instrument_init: bool
@@ -1153,6 +1190,16 @@ class API(object):
             % (name, value, wait, is_local)
         )
 
+    def set_pv_value_async(
+        self, name: str, value: "PVValue", is_local: bool = False
+    ) -> "Future[None]":
+        if is_local:
+            name = self.prefix_pv_name(name)
+        print("set_pv_value_async called (name=%s value=%s is_local=%s)" % (name, value, is_local))
+        future: "Future[None]" = Future()
+        future.set_result(None)
+        return future
+
     def get_pv_value(
         self,
         name: str,
@@ -1168,6 +1215,30 @@ class API(object):
             % (name, to_string, attempts, is_local, use_numpy)
         )
 
+    def get_pv_values(
+        self,
+        names: list[str],
+        to_string: bool = False,
+        is_local: bool = False,
+        use_numpy: bool = False,
+    ) -> tuple[dict[str, None], dict[str, Exception]]:
+        if is_local:
+            names = [self.prefix_pv_name(name) for name in names]
+        print(
+            "get_pv_values called (names=%s to_string=%s is_local=%s use_numpy=%s)"
+            % (names, to_string, is_local, use_numpy)
+        )
+        return {name: None for name in names}, {}
+
+    def get_waveform(
+        self, name: str, is_local: bool = False, use_numpy: bool | None = True
+    ) -> None:
+        if is_local:
+            name = self.prefix_pv_name(name)
+        print(
+            "get_waveform called (name=%s is_local=%s use_numpy=%s)" % (name, is_local, use_numpy)
+        )
+
     def pv_exists(self, name: str, is_local: bool = False) -> bool:
         return True
 
@@ -1241,6 +1312,9 @@ class API(object):
         ans["alarm"] = self.get_alarm_from_block(block)
         return typing.cast("_CgetReturn", ans)
 
+    def get_blocks_data(self, blocks: list[str], fail_fast: bool = False) -> list["_CgetReturn"]:
+        return [self.get_block_data(block, fail_fast) for block in blocks]
+
     def get_pv_from_block(self, block_name: str) -> str:
         return block_name
 
@@ -16,16 +16,25 @@ from ._ca import *
 if os.environ.get("CACHANNEL_BACKEND") == "caffi": ...
 else: ...
 
+ECA_NORMAL: int
 ECA_TIMEOUT: int
-DBR_STRING: str
-DBR_CHAR: str
+DBR_STRING: int
+DBR_CHAR: int
 DBR_CTRL_ENUM: Enum
+DBF_STRING: int
+DBF_CHAR: int
+DBF_LONG: int
+DBF_ENUM: int
+DBF_DOUBLE: int
+DBE_PROPERTY: int
 cs_conn: Enum
+CA_OP_CONN_UP: int
 CA_OP_CONN_DOWN: int
 
 PVBaseValue: TypeAlias = bool | int | float | str
 PVValue: TypeAlias = PVBaseValue | list[PVBaseValue] | NDArray | None
 
+def message(status: int) -> str: ...
 def dbr_type_is_CHAR(PVValue) -> bool: ...
 def dbr_type_is_ENUM(PVValue) -> bool: ...
 def dbr_type_is_STRING(PVValue) -> bool: ...
@@ -1,11 +1,14 @@
 from __future__ import absolute_import, print_function
 
 import codecs
+import hashlib
 import json
 import os
 import re
+import threading
 import unicodedata
 import zlib
+from collections import OrderedDict
 from datetime import timedelta
 from functools import wraps
 from typing import TYPE_CHECKING, Any, Callable, Concatenate, Iterable, ParamSpec, TypeVar
@@ -75,9 +78,18 @@ def compress_and_hex(value: str) -> bytes:
     return codecs.encode(compr, "hex_codec")
 
 
+# Hexed compressed values longer than this are dehexed and decompressed a chunk at a time
+STREAMING_DECOMPRESS_THRESHOLD = 1024 * 1024
+# Number of hex characters dehexed at a time when streaming; must be even
+STREAMING_DECOMPRESS_CHUNK = 256 * 1024
+# Number of decoded values held by the decoded JSON cache
+DECODED_JSON_CACHE_SIZE = 32
+
+
 def dehex_and_decompress(value: bytes | str) -> str:
     """
-    Dehex and decompress a string and return it
+    Dehex and decompress a string and return it. Large values are decompressed a chunk at a
+    time, so the whole compressed value is never held dehexed.
     :param value: compressed hexed string
     :return: value as a strinnng
     """
@@ -85,15 +97,113 @@ def dehex_and_decompress(value: bytes | str) -> str:
         # If it comes as bytes then cast to string
         value = value.decode("utf-8")
 
-    return zlib.decompress(bytes.fromhex(value)).decode("utf-8")
+    if len(value) <= STREAMING_DECOMPRESS_THRESHOLD:
+        return zlib.decompress(bytes.fromhex(value)).decode("utf-8")
+
+    decompressor = zlib.decompressobj()
+    parts = [
+        decompressor.decompress(bytes.fromhex(value[start : start + STREAMING_DECOMPRESS_CHUNK]))
+        for start in range(0, len(value), STREAMING_DECOMPRESS_CHUNK)
+    ]
+    parts.append(decompressor.flush())
+    if not decompressor.eof:
+        raise zlib.error("Error -5 while decompressing data: incomplete or truncated stream")
+    return b"".join(parts).decode("utf-8")
+
+
+# Returned by the decoded json cache for values it does not hold, because None is valid json
+_NOT_CACHED = object()
+
+
+class DecodedJsonCache(object):
+    """
+    Cache of values decoded from zipped hexed json, keyed by a hash of the raw value, so that a
+    value which has not changed since it was last read is not decoded again. The least recently
+    used values are dropped once the cache is full.
+
+    Decoded values are shared by everything reading the same raw value so must not be changed.
+    """
+
+    def __init__(self, max_entries: int = DECODED_JSON_CACHE_SIZE) -> None:
+        """
+        Constructor.
+        :param max_entries: the most decoded values to hold
+        """
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        self._values: OrderedDict[bytes, Any] = OrderedDict()
+
+    @staticmethod
+    def _key(value: str | bytes) -> bytes:
+        """
+        The key of a raw value: a hash of it.
+        """
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        return hashlib.blake2b(value, digest_size=16).digest()
 
+    def get(self, value: str | bytes, default: Any = None) -> Any:  # No known type
+        """
+        Get the decoded value of a raw value if it is held.
+        :param value: the raw zipped hexed json
+        :param default: returned if the value is not held
+        :return: the decoded value; default if it is not held
+        """
+        key = self._key(value)
+        with self._lock:
+            if key not in self._values:
+                return default
+            self._values.move_to_end(key)
+            return self._values[key]
+
+    def put(self, value: str | bytes, decoded: Any) -> None:  # noqa: ANN401
+        """
+        Hold the decoded value of a raw value.
+        :param value: the raw zipped hexed json
+        :param decoded: the value it decodes to
+        """
+        key = self._key(value)
+        with self._lock:
+            self._values[key] = decoded
+            self._values.move_to_end(key)
+            while len(self._values) > self._max_entries:
+                self._values.popitem(last=False)
+
+    def decode(self, value: str | bytes) -> Any:  # No known type
+        """
+        Decode zipped hexed json, or get the decoded value if the same raw value was decoded
+        before.
+        :param value: the raw zipped hexed json
+        :return: python representation of json, which must not be changed
+        """
+        decoded = self.get(value, _NOT_CACHED)
+        if decoded is _NOT_CACHED:
+            decoded = json.loads(dehex_and_decompress(value))
+            self.put(value, decoded)
+        return decoded
 
-def dehex_decompress_and_dejson(value: str | bytes) -> Any:  # No known type
+    def clear(self) -> None:
+        """
+        Drop all the decoded values.
+        """
+        with self._lock:
+            self._values.clear()
+
+
+# Cache shared by all readers of zipped hexed json
+DECODED_JSON_CACHE = DecodedJsonCache()
+
+
+def dehex_decompress_and_dejson(value: str | bytes, cached: bool = False) -> Any:  # No known type
     """
     Convert string from zipped hexed json to a python representation
     :param value: value to convert
+    :param cached: True to take the value from DECODED_JSON_CACHE if it was decoded before; the
+        value returned is then shared so must not be changed
     :return: python representation of json
     """
+    if cached:
+        return DECODED_JSON_CACHE.decode(value)
     return json.loads(dehex_and_decompress(value))
 
 
@@ -268,7 +378,9 @@ def crc8(value: str) -> str:
     return "{0:02X}".format(crc)
 
 
-def get_json_pv_value(pv_name: str, api: "API", attempts: int = 3) -> Any:  # No known type
+def get_json_pv_value(
+    pv_name: str, api: "API", attempts: int = 3, cached: bool = False
+) -> Any:  # No known type
     """
     Get the pv value decompress and convert from JSON.
 
@@ -276,6 +388,8 @@ def get_json_pv_value(pv_name: str, api: "API", attempts: int = 3) -> Any:  # No
         pv_name: name of the pv to read
         api: the api to use to read it
         attempts: number of attempts to try to read PV
+        cached: True to take the value from DECODED_JSON_CACHE if the same raw value was
+            decoded before; the value returned is then shared so must not be changed
 
     Returns:
         pv value as python objects
@@ -292,16 +406,23 @@ def get_json_pv_value(pv_name: str, api: "API", attempts: int = 3) -> Any:  # No
     if not isinstance(raw, (str, bytes)):
         raise PVReadException("Expected reading PV {} to give a string".format(pv_name))
 
+    if cached:
+        result = DECODED_JSON_CACHE.get(raw, _NOT_CACHED)
+        if result is not _NOT_CACHED:
+            return result
+
     try:
-        raw = dehex_and_decompress(raw)
+        decompressed = dehex_and_decompress(raw)
     except Exception:
         raise PVReadException("Can not decompress '{0}'".format(pv_name))
 
     try:
-        result = json.loads(raw)
+        result = json.loads(decompressed)
     except Exception:
         raise PVReadException("Can not unmarshal '{0}'".format(pv_name))
 
+    if cached:
+        DECODED_JSON_CACHE.put(raw, result)
     return result
 
 
@@ -415,10 +536,10 @@ class EnvironmentDetails(object):
             api: api to use to get a pv value
 
         Returns:
-            the current instrument list
+            the current instrument list, shared so must not be changed
         """
         try:
-            return get_json_pv_value(self.INSTRUMENT_LIST_PV, api, attempts=1)
+            return get_json_pv_value(self.INSTRUMENT_LIST_PV, api, attempts=1, cached=True)
         except PVReadException as ex:
             print("Error: {!r}. Using internal instrument list.".format(ex))
             return self.DEFAULT_INST_LIST
@@ -0,0 +1,420 @@
+"""
+Benchmarks of the genie_python hot paths: block commands, DAE commands, waitfor and script loading.
+They run against the in-memory loopback backend, so they need no IOCs and time genie_python itself
+rather than the network.
+
+The benchmarks run with the other tests, a few repeats each. To compare releases:
+    set GENIE_BENCHMARK_REPEATS for more repeats, e.g. 50
+    set GENIE_BENCHMARK_RESULTS to the file to write the results to as JSON
+    python -m pytest tests/test_benchmarks.py --no-cov
+then compare the results with those of another release with:
+    python -m tests.test_benchmarks baseline.json results.json
+"""
+
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import unittest
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+from hamcrest import assert_that, close_to, contains_string, has_length, is_
+
+import genie_python.genie_api_setup
+from genie_python import genie
+from genie_python.genie_loopback_wrapper import LoopbackWrapper, loopback_backend
+from genie_python.utilities import compress_and_hex
+from genie_python.version import VERSION
+
+# Number of times each benchmark is run
+BENCHMARK_REPEATS = int(os.environ.get("GENIE_BENCHMARK_REPEATS", "5"))
+# File to write the results to; None to not write them
+BENCHMARK_RESULTS_FILE = os.environ.get("GENIE_BENCHMARK_RESULTS")
+# Format of the results file, increased if the results are no longer comparable with older files
+RESULTS_FORMAT = 1
+
+PREFIX = "IN:BENCH:"
+BLOCKS = ["BLOCK_{}".format(index) for index in range(20)]
+NUM_PERIODS = 2
+NUM_SPECTRA = 100
+NUM_TIME_CHANNELS = 1000
+# Time for the IOC to change a block value in the waitfor benchmark, after waitfor has started
+WAITFOR_CHANGE_DELAY = 0.05
+
+SCRIPT = os.path.join(os.path.abspath(os.path.dirname(__file__)), "test_scripts", "valid.py")
+
+# Results of the benchmarks run, by name
+RESULTS: dict[str, dict[str, Any]] = {}
+
+
+def record_benchmark(name: str, timings: list[float]) -> dict[str, Any]:
+    """
+    Record the timings of a benchmark.
+
+    Args:
+        name: the benchmark name
+        timings: the time each run took in seconds
+
+    Returns:
+        the statistics of the timings
+    """
+    RESULTS[name] = {
+        "repeats": len(timings),
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.mean(timings),
+        "max": max(timings),
+    }
+    return RESULTS[name]
+
+
+def time_benchmark(
+    name: str,
+    function: Callable[[], Any],
+    repeats: int = BENCHMARK_REPEATS,
+) -> dict[str, Any]:
+    """
+    Time a function, once for a warm up then repeatedly, and record the timings.
+
+    Args:
+        name: the benchmark name
+        function: the function to time
+        repeats: the number of times to time it
+
+    Returns:
+        the statistics of the timings
+    """
+    timings = []
+    for run in range(repeats + 1):
+        start = time.perf_counter()
+        function()
+        if run > 0:
+            timings.append(time.perf_counter() - start)
+    return record_benchmark(name, timings)
+
+
+def write_results(filename: str) -> None:
+    """
+    Write the recorded results as JSON, with the genie_python and python versions they are for.
+
+    Args:
+        filename: the file to write
+    """
+    results = {
+        "format": RESULTS_FORMAT,
+        "genie_python_version": VERSION,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "benchmarks": dict(sorted(RESULTS.items())),
+    }
+    with open(filename, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def compare_results(baseline: dict[str, Any], results: dict[str, Any]) -> list[str]:
+    """
+    Compare the median timings of two sets of results.
+
+    Args:
+        baseline: the results to compare against, as read from a results file
+        results: the results to compare, as read from a results file
+
+    Returns:
+        a line for each benchmark, with its median times and the ratio of them
+    """
+    lines = [
+        "{:<30} {:>14} {:>14} {:>7}".format(
+            "Benchmark",
+            "{} (ms)".format(baseline["genie_python_version"])[:14],
+            "{} (ms)".format(results["genie_python_version"])[:14],
+            "Ratio",
+        )
+    ]
+    for name in sorted(set(baseline["benchmarks"]) | set(results["benchmarks"])):
+        old = baseline["benchmarks"].get(name, {}).get("median")
+        new = results["benchmarks"].get(name, {}).get("median")
+        lines.append(
+            "{:<30} {:>14} {:>14} {:>7}".format(
+                name,
+                "-" if old is None else "{:.3f}".format(old * 1000),
+                "-" if new is None else "{:.3f}".format(new * 1000),
+                "-" if not old or new is None else "{:.2f}".format(new / old),
+            )
+        )
+    return lines
+
+
+def _settings_xml(elements: list[tuple[str, str, Any]], name: str) -> str:
+    """
+    Create the XML of a cluster of DAE settings.
+
+    Args:
+        elements: the type, name and value of each element
+        name: the cluster name
+    """
+    return "<Cluster><Name>{}</Name><NumElts>{}</NumElts>{}</Cluster>".format(
+        name,
+        len(elements),
+        "".join(
+            "<{0}><Name>{1}</Name><Val>{2}</Val></{0}>".format(*element) for element in elements
+        ),
+    )
+
+
+DAE_SETTINGS_XML = _settings_xml(
+    [
+        ("I32", "Monitor Spectrum", 1),
+        ("DBL", "from", 1000.0),
+        ("DBL", "to", 2000.0),
+        ("String", "Wiring Table", "C:/tables/wiring.dat"),
+        ("String", "Detector Table", "C:/tables/detector.dat"),
+        ("String", "Spectra Table", "C:/tables/spectra.dat"),
+    ],
+    "Data Acquisition",
+)
+
+TCB_SETTINGS_XML = _settings_xml(
+    [("String", "Time Channel File", "")]
+    + [
+        (element_type, "TR{} {} {}".format(regime, setting, trange), 0)
+        for regime in range(1, 7)
+        for trange in range(1, 6)
+        for element_type, setting in [("DBL", "From"), ("DBL", "To"), ("DBL", "Steps")]
+    ]
+    + [
+        ("U16", "TR{} In Mode {}".format(regime, trange), 0)
+        for regime in range(1, 7)
+        for trange in range(1, 6)
+    ],
+    "Time Channels",
+)
+
+PERIOD_SETTINGS_XML = _settings_xml(
+    [
+        ("I32", "Number Of Software Periods", NUM_PERIODS),
+        ("DBL", "Hardware Period Sequences", 0),
+        ("String", "Period File", ""),
+    ]
+    + [
+        (element_type, "{} {}".format(setting, period), 0)
+        for period in range(1, 9)
+        for element_type, setting in [("I32", "Frames"), ("U16", "Output"), ("String", "Label")]
+    ],
+    "Hardware Periods",
+)
+
+
+def _add_pvs(wrapper: "type[LoopbackWrapper]") -> None:
+    """
+    Add the PVs of an instrument with blocks and a DAE to the loopback backend.
+    """
+    wrapper.add_pv(
+        PREFIX + "CS:BLOCKSERVER:BLOCKNAMES",
+        compress_and_hex(json.dumps(BLOCKS)),
+        nelm=16000,
+    )
+    for block in BLOCKS:
+        block_pv = PREFIX + "CS:SB:" + block
+        wrapper.add_pv(block_pv, 0.0, units="K")
+        wrapper.add_pv(block_pv + ":SP", 0.0, units="K")
+        wrapper.add_pv(block_pv + ":RC:ENABLE", "NO", enum_strings=["NO", "YES"])
+        wrapper.add_pv(block_pv + ":RC:LOW", 0.0)
+        wrapper.add_pv(block_pv + ":RC:HIGH", 0.0)
+
+    for name, value in [
+        ("RUNSTATE", "SETUP"),
+        ("RUNSTATE_STR", "SETUP"),
+        ("STATETRANS", "No"),
+        ("RUNNUMBER", "00001234"),
+        ("TITLE", "Benchmark"),
+        ("TITLE:DISPLAY", 1),
+        ("RUNDURATION", 100),
+        ("RUNDURATION_PD", 50),
+        ("GOODFRAMES", 1000),
+        ("GOODFRAMES_PD", 500),
+        ("RAWFRAMES", 1001),
+        ("RAWFRAMES_PD", 501),
+        ("BEAMCURRENT", 150.0),
+        ("TOTALUAMPS", 10.0),
+        ("NUMSPECTRA", NUM_SPECTRA),
+        ("NUMPERIODS", NUM_PERIODS),
+        ("NUMTIMECHANNELS", NUM_TIME_CHANNELS),
+        ("MONITORSPECTRUM", 1),
+        ("MONITORFROM", 1000.0),
+        ("MONITORTO", 2000.0),
+        ("MONITORCOUNTS", 12345),
+        ("SPECDATA.PROC", 0),
+    ]:
+        wrapper.add_pv(PREFIX + "DAE:" + name, value)
+    wrapper.add_pv(PREFIX + "ED:RBNUMBER", "1920001")
+    wrapper.add_pv(PREFIX + "ED:USERNAME:DAE:SP", "A User, B User")
+
+    for name, xml in [
+        ("DAESETTINGS", DAE_SETTINGS_XML),
+        ("TCBSETTINGS", compress_and_hex(TCB_SETTINGS_XML)),
+        ("HARDWAREPERIODS", PERIOD_SETTINGS_XML),
+    ]:
+        wrapper.add_pv(PREFIX + "DAE:" + name, xml, nelm=65536)
+        wrapper.add_pv(PREFIX + "DAE:" + name + ":SP", np.zeros(0, dtype=np.uint8), nelm=65536)
+
+    time_channels = np.linspace(0.0, 20000.0, NUM_TIME_CHANNELS + 1)
+    for period in range(1, NUM_PERIODS + 1):
+        for spectrum in range(1, 4):
+            spectrum_pv = PREFIX + "DAE:SPEC:{}:{}:".format(period, spectrum)
+            counts = np.ones(NUM_TIME_CHANNELS, dtype=np.float32)
+            wrapper.add_pv(spectrum_pv + "X", time_channels.astype(np.float32), nelm=10000)
+            wrapper.add_pv(spectrum_pv + "Y", counts / np.diff(time_channels), nelm=10000)
+            wrapper.add_pv(spectrum_pv + "YC", counts, nelm=10000)
+    spectrum_data = np.arange(
+        NUM_PERIODS * (NUM_SPECTRA + 1) * (NUM_TIME_CHANNELS + 1), dtype=np.int32
+    )
+    wrapper.add_pv(PREFIX + "DAE:SPECDATA", spectrum_data, nelm=spectrum_data.size)
+
+
+class TestBenchmarks(unittest.TestCase):
+    """
+    Benchmarks of genie commands; the results are checked so that a broken benchmark is noticed.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.exit_stack = contextlib.ExitStack()
+        cls.exit_stack.callback(genie.set_instrument, None, import_instrument_init=False)
+        cls.exit_stack.callback(LoopbackWrapper.clear)
+        cls.wrapper = cls.exit_stack.enter_context(loopback_backend())
+        _add_pvs(cls.wrapper)
+
+        exceptions_raised = genie_python.genie_api_setup._exceptions_raised
+        genie_python.genie_api_setup._exceptions_raised = True
+        cls.exit_stack.callback(
+            setattr, genie_python.genie_api_setup, "_exceptions_raised", exceptions_raised
+        )
+        genie.set_instrument(PREFIX, import_instrument_init=False)
+
+        # The block names are read by a monitor in the background
+        deadline = time.monotonic() + 10
+        while len(genie.get_blocks()) < len(BLOCKS) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.exit_stack.close()
+        if BENCHMARK_RESULTS_FILE is not None:
+            write_results(BENCHMARK_RESULTS_FILE)
+
+    def test_cget(self):
+        time_benchmark("cget", lambda: genie.cget(BLOCKS[0]))
+
+        assert_that(genie.cget(BLOCKS[0])["unit"], is_("K"))
+
+    def test_cshow_of_all_blocks(self):
+        output = io.StringIO()
+
+        with contextlib.redirect_stdout(output):
+            time_benchmark("cshow_all_blocks", genie.cshow)
+
+        assert_that(output.getvalue(), contains_string("{} = 0.0".format(BLOCKS[-1])))
+
+    def test_cset_of_several_blocks(self):
+        values = {block: 1.0 for block in BLOCKS[:10]}
+
+        time_benchmark("cset_multiple_blocks", lambda: genie.cset(**values))
+
+        assert_that(self.wrapper.get_pv_value(PREFIX + "CS:SB:" + BLOCKS[9] + ":SP"), is_(1.0))
+
+    def test_get_dashboard(self):
+        time_benchmark("get_dashboard", genie.get_dashboard)
+
+        assert_that(genie.get_dashboard()["user"], is_("A User and B User"))
+
+    def test_get_spectrum(self):
+        time_benchmark("get_spectrum", lambda: genie.get_spectrum(1, 2))
+
+        assert_that(genie.get_spectrum(1, 2)["signal"], has_length(NUM_TIME_CHANNELS))
+
+    def test_integrate_spectrum(self):
+        time_benchmark("integrate_spectrum", lambda: genie.integrate_spectrum(2, 1, 100.0, 150.0))
+
+        assert_that(genie.integrate_spectrum(2, 1, 100.0, 150.0), is_(close_to(2.5, 1e-3)))
+
+    def test_get_spectrum_data(self):
+        time_benchmark("get_spectrum_data", genie.get_spectrum_data)
+
+        assert_that(
+            genie.get_spectrum_data(with_spec_zero=False).shape,
+            is_((NUM_PERIODS, NUM_SPECTRA, NUM_TIME_CHANNELS)),
+        )
+
+    def test_change_settings(self):
+        def change():
+            genie.change_start()
+            genie.change_monitor(2, 500.0, 1500.0)
+            genie.change_tcb(0.0, 20000.0, 20.0, trange=1, regime=1)
+            genie.change_number_soft_periods(4)
+            genie.change_finish()
+            # Put back the settings, as the IOC would on reading its set points
+            for name in ["DAESETTINGS", "TCBSETTINGS", "HARDWAREPERIODS"]:
+                self.wrapper.update_pv(
+                    PREFIX + "DAE:" + name,
+                    self.wrapper.get_pv_value(PREFIX + "DAE:" + name + ":SP", to_string=True),
+                )
+
+        time_benchmark("change_start_finish", change)
+
+        assert_that(
+            genie.get_pv("DAE:DAESETTINGS", to_string=True, is_local=True),
+            is_(genie.get_pv("DAE:DAESETTINGS:SP", to_string=True, is_local=True)),
+        )
+
+    def test_waitfor_block_wake_up(self):
+        block_pv = PREFIX + "CS:SB:" + BLOCKS[1]
+        timings = []
+        for _ in range(BENCHMARK_REPEATS):
+            self.wrapper.update_pv(block_pv, 0.0)
+            changed = []
+
+            def change_block():
+                changed.append(time.perf_counter())
+                self.wrapper.update_pv(block_pv, 1.0)
+
+            timer = threading.Timer(WAITFOR_CHANGE_DELAY, change_block)
+            timer.start()
+            genie.waitfor_block(BLOCKS[1], 1.0, maxwait=10, quiet=True)
+            timings.append(time.perf_counter() - changed[0])
+            timer.join()
+
+        results = record_benchmark("waitfor_wake_up", timings)
+
+        assert_that(results["repeats"], is_(BENCHMARK_REPEATS))
+
+    def test_load_script_with_checks(self):
+        time_benchmark(
+            "load_script_checked",
+            lambda: genie.load_script(SCRIPT, check_script=True),
+            repeats=max(1, BENCHMARK_REPEATS // 5),
+        )
+
+
+def main(baseline_filename: str, results_filename: str) -> None:
+    """
+    Print a comparison of two results files.
+    """
+    with open(baseline_filename) as f:
+        baseline = json.load(f)
+    with open(results_filename) as f:
+        results = json.load(f)
+    for line in compare_results(baseline, results):
+        print(line)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
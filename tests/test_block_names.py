@@ -199,6 +199,18 @@ class TestGenieAutoCompletePyConsole(unittest.TestCase):
 
         assert_that(result, has_length(0))
 
+    def test_GIVEN_blocks_WHEN_callback_given_non_string_THEN_blocks_cleared(
+        self, add_monitor_mock, get_pv_value_mock
+    ):
+        block_names, block_names_manager = create_block_names(get_pv_value_mock, [])
+        _activate_monitor(add_monitor_mock, ["block_name"])
+        callback = add_monitor_mock.call_args[0][1]
+
+        callback([1, 2, 3], None, None)
+
+        assert_that(block_names.__dict__, has_length(0))
+        assert_that(block_names_manager.index.names, is_(()))
+
     def test_GIVEN_pv_doesnt_exist_on_add_monitor_WHEN_setup_THEN_add_monitor_is_retried_later(
         self, add_monitor_mock, get_pv_value_mock
     ):
@@ -243,3 +255,46 @@ class TestGenieAutoCompletePyConsole(unittest.TestCase):
         result = block_names.class__
 
         assert_that(result, is_(expected_block_name))
+
+    def test_GIVEN_blocks_WHEN_looked_up_in_index_THEN_found_in_any_case_with_pv_name(
+        self, add_monitor_mock, get_pv_value_mock
+    ):
+        _, block_names_manager = create_block_names(
+            get_pv_value_mock, ["Block_Name"], instrument_prefix="IN:INST:"
+        )
+
+        index = block_names_manager.index
+
+        assert_that(index.names, is_(("Block_Name",)))
+        assert_that(index.get_name("BLOCK_NAME"), is_("Block_Name"))
+        assert_that(index.get_pv_name("block_name"), is_("IN:INST:CS:SB:BLOCK_NAME"))
+        assert_that(
+            index.get_runcontrol_pv_names("Block_name"),
+            is_(
+                (
+                    "IN:INST:CS:SB:BLOCK_NAME:RC:ENABLE",
+                    "IN:INST:CS:SB:BLOCK_NAME:RC:LOW",
+                    "IN:INST:CS:SB:BLOCK_NAME:RC:HIGH",
+                )
+            ),
+        )
+        assert_that(index.get_name("other"), is_(None))
+
+    def test_GIVEN_index_WHEN_block_names_change_THEN_new_index_made_and_old_one_unchanged(
+        self, add_monitor_mock, get_pv_value_mock
+    ):
+        _, block_names_manager = create_block_names(get_pv_value_mock, ["old_block"])
+        old_index = block_names_manager.index
+
+        _activate_monitor(add_monitor_mock, ["new_block"])
+
+        assert_that(old_index.names, is_(("old_block",)))
+        assert_that("new_block" in block_names_manager.index, is_(True))
+        assert_that("old_block" in block_names_manager.index, is_(False))
+
+    def test_GIVEN_block_is_keyword_WHEN_looked_up_in_index_THEN_block_name_is_unchanged(
+        self, add_monitor_mock, get_pv_value_mock
+    ):
+        _, block_names_manager = create_block_names(get_pv_value_mock, ["class"])
+
+        assert_that(block_names_manager.index.names, is_(("class",)))
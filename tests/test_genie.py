@@ -457,10 +457,10 @@ class TestGenieMockedAPI(unittest.TestCase):
         }
 
         genie.cset(**blocks)
-        for block_name, value in blocks.items():
-            self.mocked_api.set_block_value.assert_any_call(
-                block_name, value, None, None, None, None
-            )
+        self.mocked_api.set_multiple_blocks.assert_called_once_with(
+            list(blocks.keys()), list(blocks.values())
+        )
+        self.mocked_api.set_block_value.assert_not_called()
 
     def test_WHEN_cset_is_called_with_string_blockname_THEN_exactly_one_call_to_get_alarms(self):
         block_name, value = "MY_BLOCK_NAME", 3
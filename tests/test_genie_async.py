@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from hamcrest import assert_that, calling, has_length, is_, is_not, raises
+
+from genie_python.genie_async import AsyncPvAccess
+
+
+class TestAsyncPvAccess(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.wrapper = MagicMock()
+        self.callbacks = {}
+        self.unsubscribe = MagicMock(spec=[])
+
+        self.monitor_threads = []
+
+        def _add_monitor(name, callback, **kwargs):
+            self.monitor_threads.append(threading.current_thread())
+            self.callbacks[name] = callback
+            return self.unsubscribe
+
+        self.wrapper.add_monitor.side_effect = _add_monitor
+        self.access = AsyncPvAccess(self.wrapper)
+
+    def _send_from_ca_thread(self, name, *values):
+        def _send():
+            for value in values:
+                self.callbacks[name](value, "NO_ALARM", "NO_ALARM")
+
+        thread = threading.Thread(target=_send)
+        thread.start()
+        thread.join()
+
+    async def test_GIVEN_several_pvs_WHEN_aget_pv_gathered_THEN_all_values_returned(self):
+        self.wrapper.get_pv_value.side_effect = lambda name, *args: name.lower()
+
+        values = await asyncio.gather(*(self.access.aget_pv(name) for name in ["A", "B", "C"]))
+
+        assert_that(values, is_(["a", "b", "c"]))
+
+    async def test_WHEN_aset_pv_with_wait_THEN_value_set_with_wait(self):
+        await self.access.aset_pv("PV", 1.0, wait=True)
+
+        self.wrapper.set_pv_value.assert_called_once_with("PV", 1.0, True, 15, True)
+
+    async def test_GIVEN_monitor_WHEN_values_sent_from_ca_thread_THEN_iterated_in_order(self):
+        received = []
+        async with self.access.monitor("PV") as updates:
+            self._send_from_ca_thread("PV", 1, 2, 3)
+            async for value, severity, status in updates:
+                received.append(value)
+                if len(received) == 3:
+                    break
+
+        assert_that(received, is_([1, 2, 3]))
+        self.unsubscribe.assert_called_once_with()
+
+    async def test_WHEN_monitor_entered_THEN_subscribed_off_the_event_loop_thread(self):
+        async with self.access.monitor("PV"):
+            pass
+
+        assert_that(self.monitor_threads, has_length(1))
+        assert_that(self.monitor_threads[0], is_not(threading.current_thread()))
+
+    async def test_WHEN_monitor_awaited_THEN_values_iterated(self):
+        updates = await self.access.monitor("PV")
+        self._send_from_ca_thread("PV", 1)
+
+        assert_that(await updates.__anext__(), is_((1, "NO_ALARM", "NO_ALARM")))
+        await updates.aclose()
+        self.unsubscribe.assert_called_once_with()
+
+    async def test_GIVEN_monitor_being_iterated_WHEN_closed_THEN_iteration_stops(self):
+        received = []
+        updates = await self.access.monitor("PV")
+
+        async def _iterate():
+            async for value, _, _ in updates:
+                received.append(value)
+
+        iteration = asyncio.ensure_future(_iterate())
+        await asyncio.sleep(0)
+        await updates.aclose()
+
+        await asyncio.wait_for(iteration, 1)
+        assert_that(received, is_([]))
+        self.unsubscribe.assert_called_once_with()
+
+    async def test_GIVEN_pv_reaches_value_WHEN_waitfor_THEN_returns_value(self):
+        wait = asyncio.ensure_future(self.access.waitfor("PV", lowlimit=5))
+        while "PV" not in self.callbacks:
+            await asyncio.sleep(0)
+
+        self._send_from_ca_thread("PV", 1, 7)
+
+        assert_that(await wait, is_(7))
+        self.unsubscribe.assert_called_once_with()
+
+    async def test_GIVEN_pv_never_reaches_value_WHEN_waitfor_with_timeout_THEN_timeout(self):
+        with self.assertRaises(TimeoutError):
+            await self.access.waitfor("PV", value="DONE", timeout=0.01)
+
+        self.unsubscribe.assert_called_once_with()
+
+    def test_GIVEN_nothing_to_wait_for_WHEN_waitfor_THEN_exception(self):
+        assert_that(
+            calling(asyncio.run).with_args(self.access.waitfor("PV")),
+            raises(ValueError),
+        )
@@ -17,16 +17,20 @@
 from __future__ import absolute_import
 
 import unittest
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
-from genie_python.genie_blockserver import BlockServer
-from genie_python.utilities import compress_and_hex
+from hamcrest import assert_that, is_, same_instance
+
+from genie_python.channel_access_exceptions import UnableToConnectToPVException
+from genie_python.genie_blockserver import BlockServer, ParameterIndex
+from genie_python.utilities import DecodedJsonCache, compress_and_hex
 
 
 class TestGenieBlockserver(unittest.TestCase):
     def setUp(self):
         self.mock_api = MagicMock()
         self.mock_api.return_value.prefix_pv_name = Mock(side_effect=self._add_prefix)
+        self.mock_api.return_value.inst_prefix = "TEST123"
 
         self.blockserver = BlockServer(self.mock_api.return_value)
 
@@ -46,6 +50,76 @@ class TestGenieBlockserver(unittest.TestCase):
             expected_pv_name, expected_pv_value, expected_wait
         )
 
+    @patch("genie_python.genie_blockserver.CaChannelWrapper")
+    def test_GIVEN_sample_pars_monitored_WHEN_names_change_THEN_index_updated_without_fetching(
+        self, mock_wrapper
+    ):
+        self.mock_api.return_value.get_pv_value.return_value = compress_and_hex(
+            '["PARS:SAMPLE:AOI"]'
+        )
+        first = self.blockserver.sample_pars.get_index()
+        callback = mock_wrapper.add_monitor.call_args[0][1]
+
+        callback(compress_and_hex('["PARS:SAMPLE:AOI", "PARS:SAMPLE:ID"]'), None, None)
+        second = self.blockserver.sample_pars.get_index()
+
+        mock_wrapper.add_monitor.assert_called_once()
+        assert_that(
+            mock_wrapper.add_monitor.call_args[0][0], is_("TEST123CS:BLOCKSERVER:SAMPLE_PARS")
+        )
+        self.mock_api.return_value.get_pv_value.assert_called_once()
+        assert_that(dict(first.pvs), is_({"AOI": "TEST123PARS:SAMPLE:AOI"}))
+        assert_that(list(second.pvs), is_(["AOI", "ID"]))
+
+    @patch("genie_python.genie_blockserver.CaChannelWrapper")
+    def test_GIVEN_names_pv_can_not_be_monitored_WHEN_index_got_THEN_names_fetched(
+        self, mock_wrapper
+    ):
+        mock_wrapper.add_monitor.side_effect = UnableToConnectToPVException("PV", "error")
+        self.mock_api.return_value.get_pv_value.return_value = compress_and_hex('["PARS:BL:A"]')
+
+        index = self.blockserver.beamline_pars.get_index()
+
+        assert_that(index.get_pv_name("a"), is_("TEST123PARS:BL:A"))
+
+    @patch("genie_python.genie_blockserver.CaChannelWrapper")
+    def test_GIVEN_names_pv_could_not_be_monitored_WHEN_index_got_again_THEN_monitor_added(
+        self, mock_wrapper
+    ):
+        mock_wrapper.add_monitor.side_effect = UnableToConnectToPVException("PV", "error")
+        self.mock_api.return_value.get_pv_value.return_value = compress_and_hex('["PARS:BL:A"]')
+        self.blockserver.beamline_pars.get_index()
+        mock_wrapper.add_monitor.side_effect = None
+
+        self.blockserver.beamline_pars.get_index()
+        callback = mock_wrapper.add_monitor.call_args[0][1]
+        callback(compress_and_hex('["PARS:BL:A", "PARS:BL:B"]'), None, None)
+
+        assert_that(mock_wrapper.add_monitor.call_count, is_(2))
+        assert_that(list(self.blockserver.beamline_pars.get_index().pvs), is_(["A", "B"]))
+
+    def test_GIVEN_runcontrol_settings_unchanged_WHEN_read_again_THEN_decoded_settings_reused(
+        self,
+    ):
+        self.mock_api.return_value.get_pv_value.return_value = compress_and_hex(
+            '{"BLOCK": {"LOW": 1.0, "HIGH": 2.0, "ENABLE": true}}'
+        )
+
+        with patch("genie_python.utilities.DECODED_JSON_CACHE", DecodedJsonCache()):
+            first = self.blockserver.get_runcontrol_settings()
+            second = self.blockserver.get_runcontrol_settings()
+
+        assert_that(second, is_(same_instance(first)))
+
+    def test_GIVEN_parameter_pvs_WHEN_indexed_THEN_found_by_name_in_any_case_and_others_unexpected(
+        self,
+    ):
+        index = ParameterIndex(["PARS:SAMPLE:MEAS:ID", "PARS:BL:JAWS"], "SAMPLE", "IN:DEMO:")
+
+        assert_that(index.get_pv_name("meas:id"), is_("IN:DEMO:PARS:SAMPLE:MEAS:ID"))
+        assert_that(index.get_pv_name("MEAS"), is_(None))
+        assert_that(index.unexpected, is_(("PARS:BL:JAWS",)))
+
     def _add_prefix(self, name):
         return "TEST123" + name
 
@@ -0,0 +1,945 @@
+# This file is part of the ISIS IBEX application.
+# Copyright (C) 2012-2016 Science & Technology Facilities Council.
+# All rights reserved.
+#
+# This program is distributed in the hope that it will be useful.
+# This program and the accompanying materials are made available under the
+# terms of the Eclipse Public License v1.0 which accompanies this distribution.
+# EXCEPT AS EXPRESSLY SET FORTH IN THE ECLIPSE PUBLIC LICENSE V1.0, THE PROGRAM
+# AND ACCOMPANYING MATERIALS ARE PROVIDED ON AN "AS IS" BASIS, WITHOUT WARRANTIES
+# OR CONDITIONS OF ANY KIND.  See the Eclipse Public License v1.0 for more details.
+#
+# You should have received a copy of the Eclipse Public License v1.0
+# along with this program; if not, you can obtain a copy from
+# https://www.eclipse.org/org/documents/epl-v10.php or
+# http://opensource.org/licenses/eclipse-1.0.php
+
+import os
+import statistics
+import threading
+import time
+import unittest
+from concurrent.futures import wait
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from CaChannel import CaChannelException, ca
+from hamcrest import (
+    assert_that,
+    calling,
+    has_entries,
+    has_length,
+    instance_of,
+    is_,
+    less_than,
+    not_,
+    not_none,
+    raises,
+)
+
+from genie_python.channel_access_exceptions import (
+    InvalidEnumStringException,
+    ReadAccessException,
+    UnableToConnectToPVException,
+    WriteAccessException,
+)
+from genie_python.genie_cachannel_wrapper import (
+    MONITORED_READ_IDLE_TIMEOUT,
+    MONITORED_READS,
+    SUBSCRIPTIONS,
+    AlarmCondition,
+    AlarmSeverity,
+    CaChannelWrapper,
+    ChannelCache,
+)
+from genie_python.genie_pv_instrumentation import PvInstrumentation
+
+
+class FakeChannel(object):
+    """
+    Stand-in for a CaChannel which connects as soon as it is searched for.
+    """
+
+    def __init__(self, name, pending_callbacks, connects=True, connect_delay=None):
+        self._name = name
+        # delay before the channel connects on a channel access thread; None to connect at once
+        self.connect_delay = connect_delay
+        # callbacks outstanding in the CA context, shared by all channels
+        self.pending_callbacks = pending_callbacks
+        self.connects = connects
+        self.connected = False
+        self.cleared = False
+        self.searches = 0
+        self.timeout = None
+        self.value = 0.0
+        self.readable = True
+        self.requested = None
+        self.pend_io_calls = 0
+        self.flush_io_calls = 0
+        self.put_status = ca.ECA_NORMAL
+        self.dbf_type = ca.DBF_DOUBLE
+        self.enum_strings = ()
+        self.gets = []
+        # delay before a stand-in server replies to a put with callback; None for at the next poll
+        self.reply_delay = None
+        self.preemptive = True
+        self.nord = None
+        self.get_counts = []
+        self.get_status = ca.ECA_NORMAL
+
+    def search_and_connect(self, pv_name, callback, *user_args):
+        self.searches += 1
+        if self.connects and self.connect_delay is not None:
+            server = threading.Timer(self.connect_delay, self._connect, (callback, user_args))
+            server.daemon = True
+            server.start()
+        elif self.connects:
+            self._connect(callback, user_args)
+
+    def _connect(self, callback, user_args):
+        self.connected = True
+        callback((self._name, ca.CA_OP_CONN_UP), user_args)
+
+    def searchw(self):
+        self.searches += 1
+        self.connected = self.connects
+
+    def flush_io(self):
+        self.flush_io_calls += 1
+
+    def poll(self):
+        while self.pending_callbacks:
+            callback, epics_args, user_args = self.pending_callbacks.pop(0)
+            callback(epics_args, user_args)
+        return ca.ECA_TIMEOUT
+
+    def state(self):
+        return ca.cs_conn if self.connected else ca.cs_never_conn
+
+    def setTimeout(self, timeout):
+        self.timeout = timeout
+
+    def getTimeout(self):
+        return self.timeout
+
+    def name(self):
+        return self._name
+
+    def read_access(self):
+        return self.readable
+
+    def write_access(self):
+        return True
+
+    def field_type(self):
+        return self.dbf_type
+
+    def element_count(self):
+        return 1
+
+    def getw(self, req_type=None, count=None, **keywords):
+        self.gets.append(req_type)
+        if req_type is not None and ca.dbr_type_is_TIME(req_type):
+            return {
+                "pv_value": self.value,
+                "pv_severity": ca.AlarmSeverity.No,
+                "pv_status": ca.AlarmCondition.No,
+                "pv_seconds": 100,
+                "pv_nseconds": 0,
+            }
+        return self.value
+
+    def array_get(self, req_type=None, count=None, **keywords):
+        self.gets.append(req_type)
+        self.requested = req_type
+
+    def array_get_callback(self, req_type, count, callback, *user_args, **keywords):
+        self.gets.append(req_type)
+        self.get_counts.append(count)
+        # a count of zero is answered with the valid elements of an array
+        value = self.value[: self.nord] if count == 0 and self.nord is not None else self.value
+        self.pending_callbacks.append(
+            (callback, {"status": self.get_status, "pv_value": value}, user_args)
+        )
+
+    def pend_io(self, timeout=None):
+        self.pend_io_calls += 1
+
+    def getValue(self):
+        if self.requested == ca.DBR_CTRL_ENUM:
+            return {"pv_value": self.value, "pv_statestrings": self.enum_strings}
+        return self.value
+
+    def putw(self, value, req_type=None):
+        self.value = value
+
+    def array_put(self, value, req_type=None, count=None):
+        self.value = value
+
+    def array_put_callback(self, value, req_type, count, callback, *user_args):
+        self.value = value
+        reply = (callback, {"status": self.put_status}, user_args)
+        if self.reply_delay is None:
+            self.pending_callbacks.append(reply)
+            return
+        if self.preemptive:
+            # the reply arrives on a channel access thread, which runs the callback
+            server = threading.Timer(self.reply_delay, callback, reply[1:])
+        else:
+            # the reply arrives and waits for the next poll
+            server = threading.Timer(self.reply_delay, self.pending_callbacks.append, (reply,))
+        server.daemon = True
+        server.start()
+
+    def clear_channel(self):
+        self.cleared = True
+        self.connected = False
+
+    def add_masked_array_event(self, req_type, count, mask, callback, *user_args, **keywords):
+        self.monitor_callback = callback
+
+    def clear_event(self):
+        self.monitor_callback = None
+
+
+class ChannelAccessTestCase(unittest.TestCase):
+    """
+    Runs the wrapper against fake channels in a fresh process-wide cache.
+    """
+
+    def setUp(self):
+        self.channels = []
+        self.pending_callbacks = []
+        self.unconnectable = set()
+        self.initial_values = {}
+        self.connect_delays = {}
+
+        env_patch = patch.dict(os.environ, {"EPICS_CAS_INTF_ADDR_LIST": "localhost"})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+        os.environ.pop("GITHUB_ACTIONS", None)
+
+        self.cache = ChannelCache()
+        cache_patch = patch("genie_python.genie_cachannel_wrapper.CACHE", self.cache)
+        cache_patch.start()
+        self.addCleanup(cache_patch.stop)
+
+        channel_patch = patch(
+            "genie_python.genie_cachannel_wrapper.CaChannel", side_effect=self._create_channel
+        )
+        channel_patch.start()
+        self.addCleanup(channel_patch.stop)
+
+        disp_patch = patch.dict("genie_python.genie_cachannel_wrapper.DISP_STATES", clear=True)
+        disp_patch.start()
+        self.addCleanup(disp_patch.stop)
+
+        reads_patch = patch.dict("genie_python.genie_cachannel_wrapper.MONITORED_READS", clear=True)
+        reads_patch.start()
+        self.addCleanup(reads_patch.stop)
+
+        subscriptions_patch = patch.dict(
+            "genie_python.genie_cachannel_wrapper.SUBSCRIPTIONS", clear=True
+        )
+        subscriptions_patch.start()
+        self.addCleanup(subscriptions_patch.stop)
+
+    def _channel(self, name):
+        return [channel for channel in self.channels if channel.name() == name][0]
+
+    def _monitored_channel(self, name):
+        return [
+            channel
+            for channel in self.channels
+            if channel.name() == name and getattr(channel, "monitor_callback", None) is not None
+        ][0]
+
+    def _create_channel(self, name):
+        channel = FakeChannel(
+            name,
+            self.pending_callbacks,
+            connects=name not in self.unconnectable,
+            connect_delay=self.connect_delays.get(name),
+        )
+        channel.value = self.initial_values.get(name, 0.0)
+        self.channels.append(channel)
+        return channel
+
+
+class TestChannelCache(ChannelAccessTestCase):
+    def test_GIVEN_pv_read_from_several_threads_WHEN_get_chan_THEN_channel_created_once(self):
+        threads = [
+            threading.Thread(target=CaChannelWrapper.get_chan, args=("PV",)) for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_that(self.channels, has_length(1))
+        assert_that(self.channels[0].searches, is_(1))
+
+    def test_GIVEN_connected_pv_WHEN_pv_exists_called_repeatedly_THEN_pv_searched_for_once(self):
+        for _ in range(3):
+            assert_that(CaChannelWrapper.pv_exists("PV"), is_(True))
+
+        assert_that(self.channels, has_length(1))
+        assert_that(self.channels[0].searches, is_(1))
+
+    def test_GIVEN_pv_which_does_not_connect_WHEN_pv_exists_THEN_false_and_channel_kept_searching(
+        self,
+    ):
+        self.unconnectable.add("MISSING")
+
+        assert_that(CaChannelWrapper.pv_exists("MISSING", 0), is_(False))
+        assert_that(CaChannelWrapper.pv_exists("MISSING", 0), is_(False))
+
+        assert_that(self.channels, has_length(1))
+        assert_that(self.channels[0].cleared, is_(False))
+
+    def test_GIVEN_new_pv_which_connects_soon_WHEN_pv_exists_without_waiting_THEN_true(self):
+        self.connect_delays["NEW"] = 0.02
+
+        assert_that(CaChannelWrapper.pv_exists("NEW", 0), is_(True))
+
+    def test_GIVEN_new_pvs_which_connect_soon_WHEN_connected_pvs_without_waiting_THEN_found(
+        self,
+    ):
+        self.connect_delays.update({"B": 0.02, "C": 0.02})
+
+        assert_that(CaChannelWrapper.connected_pvs(["B", "C"], 0), is_(["B", "C"]))
+
+    def test_GIVEN_pv_which_has_disconnected_WHEN_pv_exists_without_waiting_THEN_false_at_once(
+        self,
+    ):
+        CaChannelWrapper.pv_exists("PV")
+        self._channel("PV").connected = False
+        self.cache.entry("PV").connection_changed(("PV", ca.CA_OP_CONN_DOWN), ())
+        start = time.monotonic()
+
+        assert_that(CaChannelWrapper.pv_exists("PV", 0), is_(False))
+        assert_that(time.monotonic() - start, is_(less_than(0.05)))
+
+    def test_GIVEN_pv_which_does_not_connect_WHEN_get_pv_value_THEN_exception(self):
+        self.unconnectable.add("MISSING")
+
+        assert_that(
+            calling(CaChannelWrapper.get_pv_value).with_args("MISSING"),
+            raises(UnableToConnectToPVException),
+        )
+
+    def test_GIVEN_idle_unreferenced_channel_WHEN_other_channel_requested_THEN_idle_one_evicted(
+        self,
+    ):
+        self.cache.idle_timeout = 0
+        CaChannelWrapper.get_chan("OLD")
+
+        CaChannelWrapper.get_chan("NEW")
+
+        assert_that("OLD" in self.cache, is_(False))
+        assert_that(self.channels[0].cleared, is_(True))
+
+    def test_GIVEN_idle_channel_with_monitor_WHEN_other_channel_requested_THEN_not_evicted(self):
+        self.cache.idle_timeout = 0
+        CaChannelWrapper.add_monitor("MONITORED", lambda value, severity, status: None)
+
+        CaChannelWrapper.get_chan("NEW")
+
+        assert_that("MONITORED" in self.cache, is_(True))
+        assert_that(self.channels[0].cleared, is_(False))
+
+    def test_GIVEN_monitor_removed_WHEN_channel_idle_THEN_evicted(self):
+        self.cache.idle_timeout = 0
+        unsubscribe = CaChannelWrapper.add_monitor("MONITORED", lambda value, sev, status: None)
+
+        unsubscribe()
+        CaChannelWrapper.get_chan("NEW")
+
+        assert_that("MONITORED" in self.cache, is_(False))
+
+    def test_GIVEN_cache_full_WHEN_new_channel_requested_THEN_least_recently_used_evicted(self):
+        self.cache.max_channels = 2
+        CaChannelWrapper.get_chan("FIRST")
+        CaChannelWrapper.get_chan("SECOND")
+        CaChannelWrapper.get_chan("FIRST")
+
+        CaChannelWrapper.get_chan("THIRD")
+
+        assert_that("FIRST" in self.cache, is_(True))
+        assert_that("SECOND" in self.cache, is_(False))
+        assert_that("THIRD" in self.cache, is_(True))
+
+    def test_GIVEN_monitored_pv_WHEN_pv_disconnects_THEN_link_alarm_sent_with_last_value(self):
+        updates = []
+        CaChannelWrapper.add_monitor("PV", lambda value, sev, status: updates.append(sev))
+        entry = self.cache.entry("PV")
+
+        entry.connection_changed(("PV", ca.CA_OP_CONN_DOWN), ())
+
+        assert_that(updates, is_([ca.AlarmSeverity.Invalid]))
+        assert_that(entry.connected.is_set(), is_(False))
+
+
+class TestMissingPvs(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestMissingPvs, self).setUp()
+        self.unconnectable.add("MISSING")
+        wait_patch = patch.object(
+            CaChannelWrapper, "_wait_for_event", wraps=CaChannelWrapper._wait_for_event
+        )
+        self.wait = wait_patch.start()
+        self.addCleanup(wait_patch.stop)
+
+    def test_GIVEN_pv_not_found_WHEN_looked_up_again_THEN_missing_without_waiting(self):
+        assert_that(CaChannelWrapper.pv_exists("MISSING", 0.01), is_(False))
+
+        assert_that(CaChannelWrapper.pv_exists("MISSING", 10), is_(False))
+        assert_that(
+            calling(CaChannelWrapper.get_pv_value).with_args("MISSING"),
+            raises(UnableToConnectToPVException),
+        )
+        assert_that(self.wait.call_count, is_(1))
+
+    def test_GIVEN_pv_not_found_WHEN_it_connects_THEN_found(self):
+        CaChannelWrapper.pv_exists("MISSING", 0.01)
+        channel = self._channel("MISSING")
+        channel.connected = True
+
+        self.cache.entry("MISSING").connection_changed(("MISSING", ca.CA_OP_CONN_UP), ())
+
+        assert_that(CaChannelWrapper.pv_exists("MISSING", 0.01), is_(True))
+
+    def test_GIVEN_no_retry_interval_WHEN_missing_pv_looked_up_again_THEN_waited_for_again(self):
+        self.cache.missing_retry_interval = 0
+        CaChannelWrapper.pv_exists("MISSING", 0.01)
+
+        CaChannelWrapper.pv_exists("MISSING", 0.01)
+
+        assert_that(self.wait.call_count, is_(2))
+
+    def test_GIVEN_check_without_waiting_fails_WHEN_looked_up_again_THEN_waited_for(self):
+        CaChannelWrapper.pv_exists("MISSING", 0)
+
+        CaChannelWrapper.pv_exists("MISSING", 0.01)
+
+        assert_that(self.wait.call_count, is_(2))
+
+
+class TestConnectedPvs(ChannelAccessTestCase):
+    def test_GIVEN_several_pvs_WHEN_connected_pvs_THEN_searches_sent_with_one_flush(self):
+        connected = CaChannelWrapper.connected_pvs(["PV1", "PV2", "PV3"])
+
+        assert_that(connected, is_(["PV1", "PV2", "PV3"]))
+        assert_that(sum(channel.flush_io_calls for channel in self.channels), is_(1))
+
+    def test_GIVEN_one_pv_missing_WHEN_connected_pvs_THEN_others_returned(self):
+        self.unconnectable.add("MISSING")
+
+        connected = CaChannelWrapper.connected_pvs(["PV1", "MISSING", "PV2"], 0.01)
+
+        assert_that(connected, is_(["PV1", "PV2"]))
+
+    def test_GIVEN_pvs_searched_for_WHEN_pv_read_THEN_channel_reused(self):
+        CaChannelWrapper.search_for_pvs(["PV1", "PV2"])
+
+        CaChannelWrapper.get_pv_value("PV1")
+
+        assert_that(self.channels, has_length(2))
+
+
+class TestGetWaveform(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestGetWaveform, self).setUp()
+        self.initial_values["WAVEFORM"] = np.arange(10.0)
+
+    def test_GIVEN_waveform_WHEN_get_waveform_THEN_only_valid_elements_requested(self):
+        CaChannelWrapper.get_chan("WAVEFORM").nord = 3
+
+        value = CaChannelWrapper.get_waveform("WAVEFORM")
+
+        assert_that(list(value), is_([0.0, 1.0, 2.0]))
+        assert_that(self._channel("WAVEFORM").get_counts, is_([0]))
+
+    def test_GIVEN_get_fails_WHEN_get_waveform_THEN_exception(self):
+        CaChannelWrapper.get_chan("WAVEFORM").get_status = ca.ECA_GETFAIL
+
+        assert_that(
+            calling(CaChannelWrapper.get_waveform).with_args("WAVEFORM"),
+            raises(UnableToConnectToPVException),
+        )
+
+
+class TestGetPvValues(ChannelAccessTestCase):
+    def test_GIVEN_several_pvs_WHEN_get_pv_values_THEN_values_returned_after_single_wait(self):
+        values, errors = CaChannelWrapper.get_pv_values(["PV1", "PV2", "PV3"])
+
+        assert_that(values, is_({"PV1": 0.0, "PV2": 0.0, "PV3": 0.0}))
+        assert_that(errors, is_({}))
+        assert_that(sum(channel.pend_io_calls for channel in self.channels), is_(1))
+
+    def test_GIVEN_pv_repeated_WHEN_get_pv_values_THEN_read_once(self):
+        values, _ = CaChannelWrapper.get_pv_values(["PV", "PV"])
+
+        assert_that(values, is_({"PV": 0.0}))
+        assert_that(self.channels, has_length(1))
+
+    def test_GIVEN_to_string_WHEN_get_pv_values_THEN_values_are_strings(self):
+        values, _ = CaChannelWrapper.get_pv_values(["PV"], to_string=True)
+
+        assert_that(values, is_({"PV": "0.0"}))
+        assert_that(self.channels[0].requested, is_(ca.DBR_CHAR))
+
+    def test_GIVEN_one_pv_does_not_connect_WHEN_get_pv_values_THEN_other_values_returned(self):
+        self.unconnectable.add("MISSING")
+
+        with patch("genie_python.genie_cachannel_wrapper.EXIST_TIMEOUT", 0):
+            values, errors = CaChannelWrapper.get_pv_values(["PV", "MISSING"])
+
+        assert_that(values, is_({"PV": 0.0}))
+        assert_that(list(errors), is_(["MISSING"]))
+        assert_that(errors["MISSING"], instance_of(UnableToConnectToPVException))
+
+    def test_GIVEN_pv_without_read_access_WHEN_get_pv_values_THEN_error_for_that_pv(self):
+        CaChannelWrapper.get_chan("PV")
+        self.channels[0].readable = False
+
+        values, errors = CaChannelWrapper.get_pv_values(["PV"])
+
+        assert_that(values, is_({}))
+        assert_that(errors["PV"], instance_of(ReadAccessException))
+        assert_that(self.channels[0].pend_io_calls, is_(0))
+
+
+class TestSetPvValues(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestSetPvValues, self).setUp()
+        for name in ["PV1", "PV2"]:
+            CaChannelWrapper.get_chan(name)
+        for channel in self.channels:
+            channel.flush_io_calls = 0
+
+    def test_GIVEN_several_pvs_WHEN_set_pv_values_THEN_values_written_with_one_flush(self):
+        errors = CaChannelWrapper.set_pv_values({"PV1": 1.0, "PV2": 2.0}, safe_not_quick=False)
+
+        assert_that(errors, is_({}))
+        assert_that([channel.value for channel in self.channels], is_([1.0, 2.0]))
+        assert_that(sum(channel.flush_io_calls for channel in self.channels), is_(1))
+
+    def test_GIVEN_wait_WHEN_set_pv_values_THEN_returns_once_all_puts_complete(self):
+        errors = CaChannelWrapper.set_pv_values(
+            {"PV1": 1.0, "PV2": 2.0}, wait=True, safe_not_quick=False
+        )
+
+        assert_that(errors, is_({}))
+        assert_that([channel.value for channel in self.channels], is_([1.0, 2.0]))
+        assert_that(self.pending_callbacks, is_([]))
+
+    def test_GIVEN_put_completes_with_error_WHEN_set_pv_values_with_wait_THEN_error_returned(
+        self,
+    ):
+        self.channels[1].put_status = ca.ECA_PUTFAIL
+
+        errors = CaChannelWrapper.set_pv_values(
+            {"PV1": 1.0, "PV2": 2.0}, wait=True, safe_not_quick=False
+        )
+
+        assert_that(list(errors), is_(["PV2"]))
+
+    def test_GIVEN_array_values_and_one_put_fails_WHEN_set_pv_values_THEN_others_still_set(self):
+        self.channels[0].array_put = MagicMock(side_effect=CaChannelException("put failed"))
+
+        errors = CaChannelWrapper.set_pv_values(
+            {"PV1": np.array([1.0, 2.0]), "PV2": np.array([3.0, 4.0])}, safe_not_quick=False
+        )
+
+        assert_that(list(errors), is_(["PV1"]))
+        assert_that(list(self.channels[1].value), is_([3.0, 4.0]))
+
+    def test_GIVEN_one_pv_does_not_connect_WHEN_set_pv_values_THEN_others_still_set(self):
+        self.unconnectable.add("MISSING")
+
+        with patch("genie_python.genie_cachannel_wrapper.EXIST_TIMEOUT", 0):
+            errors = CaChannelWrapper.set_pv_values(
+                {"PV1": 1.0, "MISSING": 2.0}, safe_not_quick=False
+            )
+
+        assert_that(errors["MISSING"], instance_of(UnableToConnectToPVException))
+        assert_that(self.channels[0].value, is_(1.0))
+
+
+class TestPutCompletion(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestPutCompletion, self).setUp()
+        self.channel = CaChannelWrapper.get_chan("PV")
+        self.channel.reply_delay = 0.001
+
+    def _median_put_latency(self, puts=20):
+        latencies = []
+        for value in range(puts):
+            start = time.perf_counter()
+            CaChannelWrapper.set_pv_value("PV", float(value), wait=True, safe_not_quick=False)
+            latencies.append(time.perf_counter() - start)
+        return statistics.median(latencies)
+
+    def test_GIVEN_preemptive_callbacks_WHEN_set_pv_value_with_wait_THEN_returns_on_reply(self):
+        assert_that(self._median_put_latency(), is_(less_than(0.02)))
+
+    def test_GIVEN_reply_delivered_by_poll_WHEN_set_pv_value_with_wait_THEN_returns_quickly(
+        self,
+    ):
+        self.channel.preemptive = False
+
+        assert_that(self._median_put_latency(), is_(less_than(0.02)))
+
+    def test_GIVEN_put_never_completes_WHEN_waiting_THEN_user_can_interrupt(self):
+        self.channel.reply_delay = 60
+
+        with patch(
+            "genie_python.genie_cachannel_wrapper.check_break", side_effect=KeyboardInterrupt
+        ):
+            assert_that(
+                calling(CaChannelWrapper.set_pv_value).with_args(
+                    "PV", 1.0, wait=True, safe_not_quick=False
+                ),
+                raises(KeyboardInterrupt),
+            )
+
+    def test_GIVEN_event_never_set_WHEN_wait_for_event_THEN_false_after_timeout(self):
+        start = time.monotonic()
+
+        result = CaChannelWrapper._wait_for_event(threading.Event(), 0.05)
+
+        assert_that(result, is_(False))
+        assert_that(time.monotonic() - start, is_(less_than(1)))
+
+
+class TestPutAsync(ChannelAccessTestCase):
+    def test_GIVEN_slow_puts_on_two_pvs_WHEN_put_async_THEN_both_complete_in_time_of_one(self):
+        for name in ["AXIS1", "AXIS2"]:
+            CaChannelWrapper.get_chan(name).reply_delay = 0.2
+        start = time.perf_counter()
+
+        futures = [
+            CaChannelWrapper.put_async(name, 1.0, safe_not_quick=False)
+            for name in ["AXIS1", "AXIS2"]
+        ]
+        wait(futures, timeout=5)
+
+        assert_that(all(future.done() for future in futures), is_(True))
+        assert_that(time.perf_counter() - start, is_(less_than(0.35)))
+        assert_that(self._channel("AXIS2").value, is_(1.0))
+
+    def test_GIVEN_put_fails_WHEN_put_async_THEN_future_has_exception(self):
+        channel = CaChannelWrapper.get_chan("PV")
+        channel.reply_delay = 0.001
+        channel.put_status = ca.ECA_PUTFAIL
+
+        future = CaChannelWrapper.put_async("PV", 1.0, safe_not_quick=False)
+
+        assert_that(future.exception(timeout=5), is_(instance_of(CaChannelException)))
+
+
+class TestChannelMetadata(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestChannelMetadata, self).setUp()
+        self.channel = CaChannelWrapper.get_chan("PV")
+        self.channel.dbf_type = ca.DBF_ENUM
+        self.channel.enum_strings = ("OFF", "ON")
+
+    def _enum_requests(self):
+        return self.channel.gets.count(ca.DBR_CTRL_ENUM)
+
+    def test_GIVEN_enum_pv_WHEN_string_written_twice_THEN_enum_strings_read_once(self):
+        CaChannelWrapper.set_pv_value("PV", "on", safe_not_quick=False)
+        CaChannelWrapper.set_pv_value("PV", "off", safe_not_quick=False)
+
+        assert_that(self.channel.value, is_(0))
+        assert_that(self._enum_requests(), is_(1))
+
+    def test_GIVEN_enum_pv_WHEN_invalid_string_written_THEN_exception(self):
+        assert_that(
+            calling(CaChannelWrapper.set_pv_value).with_args("PV", "maybe", safe_not_quick=False),
+            raises(InvalidEnumStringException),
+        )
+
+    def test_GIVEN_cached_metadata_WHEN_pv_reconnects_THEN_metadata_read_again(self):
+        CaChannelWrapper.get_metadata("PV")
+        entry = self.cache.entry("PV")
+        entry.connection_changed(("PV", ca.CA_OP_CONN_DOWN), ())
+        entry.connection_changed(("PV", ca.CA_OP_CONN_UP), ())
+        self.channel.enum_strings = ("CLOSED", "OPEN")
+
+        metadata = CaChannelWrapper.get_metadata("PV")
+
+        assert_that(metadata.enum_strings, is_(("CLOSED", "OPEN")))
+        assert_that(self._enum_requests(), is_(2))
+
+    def test_GIVEN_units_read_WHEN_units_read_again_THEN_egu_field_read_once(self):
+        self.initial_values["TEMP.EGU"] = "K"
+
+        assert_that(CaChannelWrapper.get_units("TEMP"), is_("K"))
+        assert_that(CaChannelWrapper.get_units("TEMP"), is_("K"))
+
+        assert_that(self._channel("TEMP.EGU").gets, has_length(1))
+
+    def test_GIVEN_metadata_monitor_WHEN_properties_change_THEN_metadata_read_again(self):
+        unsubscribe = CaChannelWrapper.add_metadata_monitor("PV")
+        CaChannelWrapper.get_metadata("PV")
+        property_channel = self.channels[-1]
+        self.channel.enum_strings = ("CLOSED", "OPEN")
+
+        property_channel.monitor_callback({}, ())
+        metadata = CaChannelWrapper.get_metadata("PV")
+        unsubscribe()
+
+        assert_that(metadata.enum_strings, is_(("CLOSED", "OPEN")))
+        assert_that(property_channel.cleared, is_(True))
+
+
+class TestSharedSubscriptions(ChannelAccessTestCase):
+    def _subscription_channels(self, name):
+        return [
+            channel
+            for channel in self.channels
+            if channel.name() == name and getattr(channel, "monitor_callback", None) is not None
+        ]
+
+    def test_GIVEN_two_monitors_on_pv_WHEN_updated_THEN_one_subscription_updates_both(self):
+        first, second = MagicMock(), MagicMock()
+        CaChannelWrapper.add_monitor("PV", first)
+        CaChannelWrapper.add_monitor("PV", second)
+
+        channels = self._subscription_channels("PV")
+        channels[0].monitor_callback({"pv_value": 1.0}, ())
+
+        assert_that(channels, has_length(1))
+        first.assert_called_once_with(1.0, AlarmSeverity.No, AlarmCondition.No)
+        second.assert_called_once_with(1.0, AlarmSeverity.No, AlarmCondition.No)
+
+    def test_GIVEN_monitor_with_update_WHEN_second_monitor_added_THEN_last_update_passed_on(self):
+        CaChannelWrapper.add_monitor("PV", MagicMock())
+        self._monitored_channel("PV").monitor_callback({"pv_value": 1.0}, ())
+        late = MagicMock()
+
+        CaChannelWrapper.add_monitor("PV", late)
+
+        late.assert_called_once_with(1.0, AlarmSeverity.No, AlarmCondition.No)
+
+    def test_GIVEN_two_monitors_WHEN_one_unsubscribed_THEN_other_still_updated(self):
+        first, second = MagicMock(), MagicMock()
+        unsubscribe = CaChannelWrapper.add_monitor("PV", first)
+        CaChannelWrapper.add_monitor("PV", second)
+        channel = self._monitored_channel("PV")
+
+        unsubscribe()
+        unsubscribe()
+        channel.monitor_callback({"pv_value": 2.0}, ())
+
+        first.assert_not_called()
+        second.assert_called_once_with(2.0, AlarmSeverity.No, AlarmCondition.No)
+        assert_that(channel.cleared, is_(False))
+
+    def test_GIVEN_two_monitors_WHEN_both_unsubscribed_THEN_subscription_cleared(self):
+        unsubscribe_functions = [CaChannelWrapper.add_monitor("PV", MagicMock()) for _ in range(2)]
+        channel = self._monitored_channel("PV")
+
+        for unsubscribe in unsubscribe_functions:
+            unsubscribe()
+
+        assert_that(channel.cleared, is_(True))
+        assert_that(SUBSCRIPTIONS, is_({}))
+
+    def test_GIVEN_failing_monitor_callback_WHEN_updated_THEN_other_callbacks_still_called(self):
+        working = MagicMock()
+        CaChannelWrapper.add_monitor("PV", MagicMock(side_effect=ValueError("bad")))
+        CaChannelWrapper.add_monitor("PV", working)
+
+        self._monitored_channel("PV").monitor_callback({"pv_value": 3.0}, ())
+
+        working.assert_called_once_with(3.0, AlarmSeverity.No, AlarmCondition.No)
+
+    def test_GIVEN_dispatched_monitor_WHEN_updated_THEN_callback_run_off_channel_access_thread(
+        self,
+    ):
+        called = threading.Event()
+        threads = []
+
+        def _callback(value, severity, status):
+            threads.append(threading.current_thread())
+            called.set()
+
+        unsubscribe = CaChannelWrapper.add_monitor("PV", _callback, dispatch=True)
+        self._monitored_channel("PV").monitor_callback({"pv_value": 1.0}, ())
+
+        assert_that(called.wait(5), is_(True))
+        unsubscribe()
+        assert_that(threads[0], is_(not_(threading.current_thread())))
+
+
+class TestInstrumentation(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestInstrumentation, self).setUp()
+        self.instrumentation = PvInstrumentation()
+        self.instrumentation.enable()
+        instrumentation_patch = patch(
+            "genie_python.genie_cachannel_wrapper.INSTRUMENTATION", self.instrumentation
+        )
+        instrumentation_patch.start()
+        self.addCleanup(instrumentation_patch.stop)
+
+    def _statistics(self):
+        return {(row["pv"], row["operation"]): row for row in self.instrumentation.summary()}
+
+    def test_GIVEN_instrumentation_WHEN_pv_read_and_written_THEN_each_operation_recorded(self):
+        CaChannelWrapper.get_pv_value("PV")
+        CaChannelWrapper.get_pv_value("PV")
+        CaChannelWrapper.set_pv_value("PV", 2.0, safe_not_quick=False)
+
+        statistics = self._statistics()
+
+        assert_that(statistics[("PV", "connect")], has_entries(count=1))
+        assert_that(statistics[("PV", "get")], has_entries(count=2, bytes=16, timed=2))
+        assert_that(statistics[("PV", "put")], has_entries(count=1, bytes=8))
+
+    def test_GIVEN_instrumentation_WHEN_monitor_updated_THEN_update_recorded(self):
+        CaChannelWrapper.add_monitor("PV", lambda value, severity, status: None)
+
+        self._monitored_channel("PV").monitor_callback({"pv_value": "text"}, ())
+
+        assert_that(self._statistics()[("PV", "monitor")], has_entries(count=1, bytes=4, timed=0))
+
+
+class TestDispCheck(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestDispCheck, self).setUp()
+        self.initial_values["RECORD.DISP"] = "0"
+        timeout_patch = patch("genie_python.genie_cachannel_wrapper.EXIST_TIMEOUT", 0.5)
+        timeout_patch.start()
+        self.addCleanup(timeout_patch.stop)
+
+    def test_GIVEN_record_with_disp_WHEN_written_twice_THEN_disp_read_once_and_monitored(self):
+        CaChannelWrapper.set_pv_value("RECORD", 1.0)
+        CaChannelWrapper.set_pv_value("RECORD", 2.0)
+
+        assert_that(self._channel("RECORD").value, is_(2.0))
+        assert_that(self._channel("RECORD.DISP").gets, has_length(1))
+        assert_that(self._monitored_channel("RECORD.DISP").monitor_callback, is_(not_none()))
+
+    def test_GIVEN_disp_monitor_WHEN_disp_set_THEN_write_refused(self):
+        CaChannelWrapper.set_pv_value("RECORD", 1.0)
+
+        self._monitored_channel("RECORD.DISP").monitor_callback({"pv_value": 1}, ())
+
+        assert_that(
+            calling(CaChannelWrapper.set_pv_value).with_args("RECORD", 2.0),
+            raises(WriteAccessException),
+        )
+        assert_that(self._channel("RECORD").value, is_(1.0))
+
+    def test_GIVEN_field_of_record_WHEN_written_THEN_disp_of_record_checked(self):
+        self.initial_values["RECORD.DISP"] = "1"
+
+        assert_that(
+            calling(CaChannelWrapper.set_pv_value).with_args("RECORD.VAL", 2.0),
+            raises(WriteAccessException),
+        )
+
+    def test_GIVEN_record_without_disp_WHEN_written_twice_THEN_disp_looked_for_once(self):
+        self.unconnectable.add("RECORD.DISP")
+
+        with patch.object(
+            CaChannelWrapper, "pv_exists", wraps=CaChannelWrapper.pv_exists
+        ) as exists:
+            CaChannelWrapper.set_pv_value("RECORD", 1.0)
+            CaChannelWrapper.set_pv_value("RECORD", 2.0)
+
+        assert_that(self._channel("RECORD").value, is_(2.0))
+        assert_that(exists.call_count, is_(1))
+
+    def test_GIVEN_disp_slow_to_connect_WHEN_written_THEN_disp_waited_for(self):
+        self.initial_values["RECORD.DISP"] = "1"
+        self.connect_delays["RECORD.DISP"] = 0.2
+
+        assert_that(
+            calling(CaChannelWrapper.set_pv_value).with_args("RECORD", 2.0),
+            raises(WriteAccessException),
+        )
+
+    def test_GIVEN_record_without_disp_WHEN_disp_connects_THEN_checked_again(self):
+        self.unconnectable.add("RECORD.DISP")
+        CaChannelWrapper.set_pv_value("RECORD", 1.0)
+        disp_channel = self._channel("RECORD.DISP")
+        disp_channel.connected = True
+        disp_channel.value = "1"
+
+        self.cache.entry("RECORD.DISP").connection_changed(("RECORD.DISP", ca.CA_OP_CONN_UP), ())
+
+        assert_that(
+            calling(CaChannelWrapper.set_pv_value).with_args("RECORD", 2.0),
+            raises(WriteAccessException),
+        )
+
+
+class TestMonitoredReads(ChannelAccessTestCase):
+    def setUp(self):
+        super(TestMonitoredReads, self).setUp()
+        self.initial_values["PV"] = 1.0
+        time_patch = patch("genie_python.genie_cachannel_wrapper.time")
+        self.time = time_patch.start()
+        self.addCleanup(time_patch.stop)
+        self.time.monotonic.return_value = 1000.0
+
+    def _reads(self):
+        return sum(len(channel.gets) for channel in self.channels)
+
+    def test_GIVEN_pv_read_WHEN_read_again_THEN_value_comes_from_monitor(self):
+        CaChannelWrapper.get_monitored_value("PV")
+        reads = self._reads()
+
+        value = CaChannelWrapper.get_monitored_value("PV")
+
+        assert_that(value.value, is_(1.0))
+        assert_that(self._reads(), is_(reads))
+        assert_that(self._monitored_channel("PV").monitor_callback, is_(not_none()))
+
+    def test_GIVEN_monitored_pv_WHEN_value_changes_THEN_new_value_alarm_and_time_returned(self):
+        CaChannelWrapper.get_monitored_value("PV")
+
+        self._monitored_channel("PV").monitor_callback(
+            {
+                "pv_value": 2.0,
+                "pv_severity": ca.AlarmSeverity.Major,
+                "pv_status": ca.AlarmCondition.HiHi,
+                "pv_seconds": 200,
+                "pv_nseconds": 5,
+            },
+            (),
+        )
+        value = CaChannelWrapper.get_monitored_value("PV")
+
+        assert_that(value.value, is_(2.0))
+        assert_that(value.severity, is_(ca.AlarmSeverity.Major))
+        assert_that(value.status, is_(ca.AlarmCondition.HiHi))
+        assert_that(value.timestamp, is_((200, 5)))
+
+    def test_GIVEN_monitored_value_older_than_max_age_WHEN_read_THEN_pv_read_again(self):
+        CaChannelWrapper.get_monitored_value("PV", max_age=5)
+        for channel in self.channels:
+            channel.value = 3.0
+        self.time.monotonic.return_value += 10
+        reads = self._reads()
+
+        value = CaChannelWrapper.get_monitored_value("PV", max_age=5)
+
+        assert_that(value.value, is_(3.0))
+        assert_that(self._reads(), is_(reads + 1))
+
+    def test_GIVEN_monitored_read_idle_WHEN_other_pv_read_THEN_subscription_removed(self):
+        CaChannelWrapper.get_monitored_value("PV")
+        monitored_channel = self._monitored_channel("PV")
+        self.time.monotonic.return_value += MONITORED_READ_IDLE_TIMEOUT + 1
+
+        CaChannelWrapper.get_monitored_value("OTHER")
+
+        assert_that(monitored_channel.cleared, is_(True))
+        assert_that(list(MONITORED_READS), is_([("OTHER", False, None)]))
@@ -24,6 +24,7 @@ import psutil
 from hamcrest import assert_that, calling, close_to, is_, raises
 from parameterized import parameterized_class
 
+from genie_python.channel_access_exceptions import UnableToConnectToPVException
 from genie_python.genie_change_cache import ChangeCache
 from genie_python.genie_dae import Dae
 from genie_python.genie_simulate_impl import ChangeCache as SimChangeCache
@@ -151,6 +152,40 @@ class TestGenieDAE(unittest.TestCase):
         self.change_cache = ChangeCache()
         self.dae.change_cache = self.change_cache
 
+    def test_GIVEN_dae_variables_WHEN_snapshot_taken_THEN_read_in_one_bulk_read(self):
+        self.api.monitored_reads = False
+        error = UnableToConnectToPVException("DAE:RUNNUMBER", "error")
+        self.api.get_pv_values.return_value = (
+            {"DAE:RUNSTATE": "SETUP", "DAE:TITLE": [ord("t"), ord("i"), 0]},
+            {"DAE:RUNNUMBER": error},
+        )
+
+        snapshot = self.dae.snapshot(["runstate", "Title", "runnumber"])
+
+        self.api.get_pv_values.assert_called_once()
+        self.assertEqual(
+            list(self.api.get_pv_values.call_args[0][0]),
+            ["DAE:RUNSTATE", "DAE:TITLE", "DAE:RUNNUMBER"],
+        )
+        self.assertEqual(snapshot.get("RUNSTATE"), "SETUP")
+        self.assertEqual(snapshot.get_string("title"), "ti")
+        self.assertRaises(UnableToConnectToPVException, snapshot.get, "runnumber")
+
+    def test_GIVEN_dae_values_WHEN_get_dashboard_THEN_values_from_one_snapshot(self):
+        self.api.monitored_reads = False
+        self.api.get_pv_values.side_effect = lambda names: (
+            {name: "A, B, C" if name == "ED:USERNAME:DAE:SP" else 1 for name in names},
+            {},
+        )
+
+        dashboard = self.dae.get_dashboard()
+
+        self.api.get_pv_values.assert_called_once()
+        self.api.get_pv_value.assert_not_called()
+        self.assertEqual(dashboard["user"], "A, B and C")
+        self.assertEqual(dashboard["status"], "1")
+        self.assertEqual(dashboard["monitor_counts"], 1)
+
     @patch.dict("genie_python.genie_dae.DAE_PVS_LOOKUP", {"period_rbv": "DAE:PERIOD:RBV"})
     def test_GIVEN_lower_case_DAE_name_WHEN_get_dae_pv_name_THEN_get_correct_pv_name(self):
         self.assertEqual(self.dae._get_dae_pv_name("period_rbv"), "DAE:PERIOD:RBV")
@@ -502,17 +537,14 @@ class TestGenieDAE(unittest.TestCase):
         sim_mock_warning.assert_not_called()
         clock_mock_warning.assert_not_called()
 
-    def get_y_or_yc_pv_value(self, pv, _, use_numpy=False):
+    def get_y_or_yc_waveform(self, pv, use_numpy=False):
+        # only the valid (NORD) elements of a waveform are returned
         if "X" in pv:
             result = X_RETURN
-        elif "YC.NORD" in pv:
-            result = YC_NORD_RETURN
-        elif "Y.NORD" in pv:
-            result = Y_NORD_RETURN
         elif "YC" in pv:
-            result = YC_RETURN
+            result = YC_RETURN[:YC_NORD_RETURN]
         else:
-            result = Y_RETURN
+            result = Y_RETURN[:Y_NORD_RETURN]
 
         if use_numpy:
             return np.array(result)
@@ -520,7 +552,7 @@ class TestGenieDAE(unittest.TestCase):
             return result
 
     def test_WHEN_get_spectrum_dist_true_THEN_default_returns_regular_counts(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
         spectrum = self.dae.get_spectrum(1, 1, True)
         self.assertEqual(
             spectrum["signal"], Y_RETURN[:Y_NORD_RETURN], "Should return value of get_spectrum_y"
@@ -531,7 +563,7 @@ class TestGenieDAE(unittest.TestCase):
         self.assertEqual(spectrum["mode"], "distribution", "Should return 'distribution'")
 
     def test_WHEN_get_spectrum_dist_false_THEN_default_returns_pure_counts(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
         spectrum = self.dae.get_spectrum(1, 1, False)
         self.assertEqual(
             spectrum["signal"], YC_RETURN[:YC_NORD_RETURN], "Should return value of get_spectrum_yc"
@@ -544,7 +576,7 @@ class TestGenieDAE(unittest.TestCase):
         self.assertEqual(spectrum["mode"], "non-distribution", "should return 'non-distribution'")
 
     def test_WHEN_get_spectrum_integrate_for_whole_range_THEN_whole_integrated_range(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(1, 1, X_RETURN[0], X_RETURN[YC_NORD_RETURN])
 
@@ -552,7 +584,7 @@ class TestGenieDAE(unittest.TestCase):
         assert_that(result, is_(expected_result))
 
     def test_WHEN_get_spectrum_integrate_for_unspecified_range_THEN_get_whole_range(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(1, 1)
 
@@ -560,7 +592,7 @@ class TestGenieDAE(unittest.TestCase):
         assert_that(result, is_(expected_result))
 
     def test_WHEN_get_spectrum_integrate_for_one_count_THEN_get_just_that_count(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(1, 1, X_RETURN[1], X_RETURN[2])
 
@@ -569,7 +601,7 @@ class TestGenieDAE(unittest.TestCase):
     def test_WHEN_get_spectrum_integrate_for_count_partial_first_bin_top_limit_not_on_boundry_THEN_get_part_of_count(
         self,
     ):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(1, 1, X_RETURN[1], X_RETURN[1] + WIDTHS[1] * 0.25)
 
@@ -578,7 +610,7 @@ class TestGenieDAE(unittest.TestCase):
     def test_WHEN_get_spectrum_integrate_for_count_partial_first_bin_lower_limit_no_on_boundryTHEN_get_part_of_count(
         self,
     ):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(1, 1, X_RETURN[1] + WIDTHS[1] * 0.25, X_RETURN[2])
 
@@ -587,7 +619,7 @@ class TestGenieDAE(unittest.TestCase):
     def test_WHEN_get_spectrum_integrate_for_count_partial_of_two_different_bins_none_apart_THEN_get_part_of_count(
         self,
     ):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(
             1, 1, X_RETURN[1] + WIDTHS[1] * 0.25, X_RETURN[2] + WIDTHS[2] * 0.4
@@ -600,7 +632,7 @@ class TestGenieDAE(unittest.TestCase):
     def test_WHEN_get_spectrum_integrate_for_count_partial_of_two_different_bins_one_apart_THEN_get_part_of_count(
         self,
     ):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(
             1, 1, X_RETURN[1] + WIDTHS[1] * 0.25, X_RETURN[3] + WIDTHS[3] * 0.4
@@ -619,7 +651,7 @@ class TestGenieDAE(unittest.TestCase):
         )
 
     def test_WHEN_get_spectrum_integrate_for_count_partial_of_one_bins_THEN_get_part_of_count(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         result = self.dae.integrate_spectrum(
             1, 1, X_RETURN[1] + WIDTHS[1] * 0.25, X_RETURN[1] + WIDTHS[1] * 0.4
@@ -629,7 +661,7 @@ class TestGenieDAE(unittest.TestCase):
         assert_that(result, is_(close_to(expected, 1e-6)))
 
     def test_WHEN_get_spectrum_integrate_and_low_limit_is_below_lowest_bin_THEN_error(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         assert_that(
             calling(self.dae.integrate_spectrum).with_args(1, 1, X_RETURN[0] - 0.01, X_RETURN[1]),
@@ -637,7 +669,7 @@ class TestGenieDAE(unittest.TestCase):
         )
 
     def test_WHEN_get_spectrum_integrate_and_upper_limit_is_above_highest_bin_THEN_error(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         assert_that(
             calling(self.dae.integrate_spectrum).with_args(
@@ -647,7 +679,7 @@ class TestGenieDAE(unittest.TestCase):
         )
 
     def test_WHEN_get_spectrum_integrate_and_upper_limit_is_below_lower_limit_THEN_error(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_y_or_yc_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_y_or_yc_waveform)
 
         assert_that(calling(self.dae.integrate_spectrum).with_args(1, 1, 10, 9), raises(ValueError))
 
@@ -686,13 +718,9 @@ class TestGenieDAE(unittest.TestCase):
         )
         self.assertEqual(True, set_pv_arguments[2])
 
-    def get_integrals_or_specdata_pv_value(self, pv, _, use_numpy=False):
-        if "DAE:SPECINTEGRALS.NORD" in pv:
-            result = len(SPECINT)
-        elif "DAE:SPECINTEGRALS" in pv:
+    def get_integrals_or_specdata_waveform(self, pv, use_numpy=False):
+        if "DAE:SPECINTEGRALS" in pv:
             result = SPECINT
-        elif "DAE:SPECDATA.NORD" in pv:
-            result = len(SPECDATA)
         elif "DAE:SPECDATA" in pv:
             result = SPECDATA
         else:
@@ -703,12 +731,12 @@ class TestGenieDAE(unittest.TestCase):
             return result
 
     def test_WHEN_get_specint_called_THEN_expected_values(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_integrals_or_specdata_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_integrals_or_specdata_waveform)
         data = self.dae.get_spec_integrals()
         self.assertTrue((data == SPECINT).all())
 
     def test_WHEN_get_specdata_called_THEN_expected_values(self):
-        self.api.get_pv_value = MagicMock(side_effect=self.get_integrals_or_specdata_pv_value)
+        self.api.get_waveform = MagicMock(side_effect=self.get_integrals_or_specdata_waveform)
         data = self.dae.get_spec_data()
         self.assertTrue((data == SPECDATA).all())
 
@@ -17,12 +17,14 @@
 from __future__ import absolute_import
 
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 from hamcrest import assert_that, calling, is_, raises
 from parameterized import parameterized
 
+from genie_python.block_names import BlockNameIndex
 from genie_python.channel_access_exceptions import UnableToConnectToPVException
+from genie_python.genie_blockserver import ParameterIndex
 from genie_python.genie_cachannel_wrapper import CaChannelWrapper as Wrapper
 from genie_python.genie_epics_api import API
 
@@ -40,6 +42,9 @@ class TestEpicsApiSequence(unittest.TestCase):
         self.mock_pv_value = "Mock PV value"
         self.api = API("", None)
         self.mock_wrapper.get_pv_value = MagicMock(return_value=self.mock_pv_value)
+        self.mock_wrapper.get_pv_values = MagicMock(
+            side_effect=lambda names: ({name: self.mock_pv_value for name in names}, {})
+        )
         self.api.blockserver = MagicMock()
 
     def tearDown(self):
@@ -107,7 +112,9 @@ class TestEpicsApiSequence(unittest.TestCase):
         pv_prefix = "PARS:SAMPLE:"
         pv_suffix = "AOI"
         pv_name = pv_prefix + pv_suffix
-        self.api.blockserver.get_sample_par_names = MagicMock(return_value=[pv_name])
+        self.api.blockserver.sample_pars.get_index = MagicMock(
+            return_value=ParameterIndex([pv_name], "SAMPLE")
+        )
 
         # Act
         val = self.api.get_sample_pars()
@@ -124,7 +131,9 @@ class TestEpicsApiSequence(unittest.TestCase):
         pv_prefix = "PARS:BL:"
         pv_suffix = "BEAMSTOP:POS"
         pv_name = pv_prefix + pv_suffix
-        self.api.blockserver.get_sample_par_names = MagicMock(return_value=[pv_name])
+        self.api.blockserver.sample_pars.get_index = MagicMock(
+            return_value=ParameterIndex([pv_name], "SAMPLE")
+        )
 
         # Act
         val = self.api.get_sample_pars()
@@ -139,7 +148,9 @@ class TestEpicsApiSequence(unittest.TestCase):
         pv_prefix = "PARS:BL:"
         pv_suffix = "JOURNAL:BLOCKS"
         pv_name = pv_prefix + pv_suffix
-        self.api.blockserver.get_beamline_par_names = MagicMock(return_value=[pv_name])
+        self.api.blockserver.beamline_pars.get_index = MagicMock(
+            return_value=ParameterIndex([pv_name], "BL")
+        )
 
         # Act
         val = self.api.get_beamline_pars()
@@ -156,7 +167,9 @@ class TestEpicsApiSequence(unittest.TestCase):
         pv_prefix = "PARS:SAMPLE:"
         pv_suffix = "HEIGHT"
         pv_name = pv_prefix + pv_suffix
-        self.api.blockserver.get_beamline_par_names = MagicMock(return_value=[pv_name])
+        self.api.blockserver.beamline_pars.get_index = MagicMock(
+            return_value=ParameterIndex([pv_name], "BL")
+        )
 
         # Act
         val = self.api.get_beamline_pars()
@@ -164,6 +177,31 @@ class TestEpicsApiSequence(unittest.TestCase):
         # Assert
         self.assertEqual(len(val), 0)
 
+    def test_GIVEN_sample_par_WHEN_set_by_name_in_any_case_THEN_indexed_pv_set(self):
+        self.api.blockserver.sample_pars.get_index = MagicMock(
+            return_value=ParameterIndex(["PARS:SAMPLE:AOI"], "SAMPLE", "IN:DEMO:")
+        )
+        self.api.set_pv_value = MagicMock()
+
+        self.api.set_sample_par("aoi", "1.0")
+
+        self.api.set_pv_value.assert_called_once_with("IN:DEMO:PARS:SAMPLE:AOI", "1.0")
+        assert_that(
+            calling(self.api.set_sample_par).with_args("AO", "1.0"),
+            raises(Exception, "Sample parameter AO does not exist"),
+        )
+
+    def test_GIVEN_several_sample_pars_WHEN_got_THEN_values_read_in_one_bulk_read(self):
+        self.api.blockserver.sample_pars.get_index = MagicMock(
+            return_value=ParameterIndex(["PARS:SAMPLE:AOI", "PARS:SAMPLE:ID"], "SAMPLE")
+        )
+
+        val = self.api.get_sample_pars()
+
+        assert_that(val, is_({"AOI": self.mock_pv_value, "ID": self.mock_pv_value}))
+        self.mock_wrapper.get_pv_values.assert_called_once()
+        self.mock_wrapper.get_pv_value.assert_not_called()
+
     def test_GIVEN_pv_name_WHEN_pv_connected_THEN_get_pv_alarm(self):
         self.api.get_pv_value = TestEpicsApiSequence.mock_get_pv_value
 
@@ -464,14 +502,54 @@ class TestPvMethods(unittest.TestCase):
         pv_wrapper_mock.get_pv_value.assert_called_with(expected_pv_name, False, use_numpy=None)
 
     @patch("genie_python.genie_epics_api.Wrapper")
-    def test_GIVEN_mock_pv_WHEN_get_pv_value_but_pv_does_not_exist_THEN_exception(
+    def test_GIVEN_local_pvs_WHEN_connected_pvs_in_list_THEN_searched_together_and_returned_as_given(
+        self, pv_wrapper_mock: MagicMock
+    ):
+        pv_wrapper_mock.connected_pvs.return_value = [self.instrument_prefix + "PV_2"]
+
+        result = self.api.connected_pvs_in_list(["PV_1", "PV_2"], is_local=True)
+
+        assert_that(result, is_(["PV_2"]))
+        pv_wrapper_mock.connected_pvs.assert_called_once()
+        assert_that(
+            list(pv_wrapper_mock.connected_pvs.call_args[0][0]),
+            is_([self.instrument_prefix + "PV_1", self.instrument_prefix + "PV_2"]),
+        )
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_monitored_reads_enabled_WHEN_get_pv_value_THEN_value_read_from_monitor(
+        self, pv_wrapper_mock: MagicMock
+    ):
+        pv_wrapper_mock.pv_exists.return_value = True
+        pv_wrapper_mock.get_monitored_value.return_value.value = 10
+        self.api.monitored_reads = True
+        self.api.monitored_read_max_age = 5
+
+        result = self.api.get_pv_value("PV")
+
+        assert_that(result, is_(10))
+        pv_wrapper_mock.get_monitored_value.assert_called_with("PV", 5, False, use_numpy=None)
+        pv_wrapper_mock.get_pv_value.assert_not_called()
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_mock_pv_WHEN_get_pv_value_but_pv_does_not_exist_THEN_exception_without_retries(
         self, pv_wrapper_mock: MagicMock
     ):
-        pv_wrapper_mock.pv_exists.return_value = False
+        pv_wrapper_mock.get_pv_value.side_effect = UnableToConnectToPVException("PV", "timeout")
 
         assert_that(
             calling(self.api.get_pv_value).with_args("PV"), raises(UnableToConnectToPVException)
         )
+        assert_that(pv_wrapper_mock.get_pv_value.call_count, is_(1))
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_mock_pv_WHEN_get_pv_value_THEN_read_without_separate_existence_check(
+        self, pv_wrapper_mock: MagicMock
+    ):
+        pv_wrapper_mock.get_pv_value.return_value = 10
+
+        assert_that(self.api.get_pv_value("PV"), is_(10))
+        pv_wrapper_mock.pv_exists.assert_not_called()
 
     @patch("genie_python.genie_epics_api.Wrapper")
     def test_GIVEN_mock_pv_WHEN_get_pv_value_but_wrapper_exception_THEN_exception_thrown(
@@ -636,6 +714,19 @@ class TestPvMethods(unittest.TestCase):
             "set pv call count, once for raise once for ok",
         )
 
+    def test_GIVEN_block_names_WHEN_block_name_corrected_THEN_name_found_in_index(self):
+        index = BlockNameIndex(["Block_1"], self.instrument_prefix)
+        with patch("genie_python.genie_epics_api.BLOCK_NAMES_MANAGER.index", index):
+            assert_that(self.api.correct_blockname("BLOCK_1", False), is_("Block_1"))
+            assert_that(
+                self.api.correct_blockname("block_1"), is_(self.instrument_prefix + "CS:SB:Block_1")
+            )
+            assert_that(self.api.correct_blockname("UNKNOWN", False), is_("UNKNOWN"))
+            assert_that(self.api.get_block_names(), is_(["Block_1"]))
+            assert_that(
+                self.api.get_pv_from_block("block_1"), is_(self.instrument_prefix + "CS:SB:BLOCK_1")
+            )
+
     @patch("genie_python.genie_epics_api.Wrapper")
     def test_GIVEN_block_pointing_at_field_WHEN_get_block_units_THEN_units_field_is_called(
         self, pv_wrapper_mock: MagicMock
@@ -647,8 +738,8 @@ class TestPvMethods(unittest.TestCase):
         self.api.get_block_names = MagicMock(return_value=["TEST"])
         self.api.get_block_units("TEST")
 
-        # Assert get_pv_value is called without the .SOMETHING
-        pv_wrapper_mock.get_pv_value.assert_called_with("PVNAME.EGU")
+        # Assert units are read without the .SOMETHING
+        pv_wrapper_mock.get_units.assert_called_with("PVNAME")
 
     @patch("genie_python.genie_epics_api.Wrapper")
     def test_GIVEN_block_already_pointing_at_unit_field_WHEN_get_block_units_THEN_units_field_is_called(
@@ -661,8 +752,8 @@ class TestPvMethods(unittest.TestCase):
         self.api.get_block_names = MagicMock(return_value=["BLOCK_NAME"])
         self.api.get_block_units("BLOCK_NAME")
 
-        # Assert get_pv_value is called without the extra .EGU (PVNAME.EGU and not PVNAME.EGU.EGU)
-        pv_wrapper_mock.get_pv_value.assert_called_with("PVNAME.EGU")
+        # Assert units are read without the extra .EGU (PVNAME.EGU and not PVNAME.EGU.EGU)
+        pv_wrapper_mock.get_units.assert_called_with("PVNAME")
 
     @patch("genie_python.genie_epics_api.Wrapper")
     def test_GIVEN_block_not_pointing_at_field_WHEN_get_block_units_THEN_units_field_is_called(
@@ -675,8 +766,8 @@ class TestPvMethods(unittest.TestCase):
         self.api.get_block_names = MagicMock(return_value=["BLOCK_NAME"])
         self.api.get_block_units("BLOCK_NAME")
 
-        # Assert get_pv_value is called with the .EGU
-        pv_wrapper_mock.get_pv_value.assert_called_with("PVNAME.EGU")
+        # Assert units are read from the PV
+        pv_wrapper_mock.get_units.assert_called_with("PVNAME")
 
     @patch("genie_python.genie_epics_api.Wrapper")
     def test_GIVEN_block_not_found_WHEN_get_block_units_THEN_exception_is_raised(
@@ -700,8 +791,8 @@ class TestPvMethods(unittest.TestCase):
         self.api.get_pv_from_block = MagicMock(return_value="PVNAME")
         pv_name = self.api.get_pv_from_block
 
-        # Set call to mock get_pv_value to raise an exception
-        pv_wrapper_mock.get_pv_value.side_effect = UnableToConnectToPVException(pv_name, "err")
+        # Set call to mock get_units to raise an exception
+        pv_wrapper_mock.get_units.side_effect = UnableToConnectToPVException(pv_name, "err")
 
         # Set block names to avoid block not found exception
         self.api.get_block_names = MagicMock(return_value=["BLOCK_NAME"])
@@ -844,6 +935,102 @@ class TestSetBlockMethod(unittest.TestCase):
         )
         self.api.waitfor.start_waiting.assert_called_with(block_name, set_point, low, high)
 
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_block_without_sp_WHEN_set_twice_THEN_sp_only_looked_for_until_block_names_change(
+        self, pv_wrapper: MagicMock
+    ):
+        block_pv = self.api.get_pv_from_block("TEST_BLOCK")
+        pv_wrapper.pv_exists.side_effect = lambda name, *args: name == block_pv
+
+        self.api.set_block_value("TEST_BLOCK", 1)
+        self.api.set_block_value("TEST_BLOCK", 2)
+        searches = pv_wrapper.pv_exists.call_count
+        with patch("genie_python.genie_epics_api.BLOCK_NAMES_MANAGER.index", BlockNameIndex()):
+            self.api.set_block_value("TEST_BLOCK", 3)
+
+        pv_wrapper.set_pv_value.assert_called_with(block_pv, 3, wait=False)
+        assert_that(searches, is_(2))
+        assert_that(pv_wrapper.pv_exists.call_count, is_(4))
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_block_not_connected_WHEN_set_THEN_sp_looked_for_again_on_next_set(
+        self, pv_wrapper: MagicMock
+    ):
+        pv_wrapper.pv_exists.return_value = False
+        self.api.set_block_value("TEST_BLOCK", 1)
+        pv_wrapper.pv_exists.return_value = True
+
+        self.api.set_block_value("TEST_BLOCK", 2)
+
+        pv_wrapper.set_pv_value.assert_called_with(
+            self.api.get_pv_from_block("TEST_BLOCK") + ":SP", 2, wait=False
+        )
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_block_in_index_WHEN_runcontrol_set_THEN_runcontrol_pvs_of_index_set(
+        self, pv_wrapper: MagicMock
+    ):
+        index = MagicMock(pv_prefix=self.instrument_prefix)
+        index.get_runcontrol_pv_names.return_value = ("ENABLE", "LOW", "HIGH")
+        with patch("genie_python.genie_epics_api.BLOCK_NAMES_MANAGER.index", index):
+            self.api.set_block_value(
+                "TEST_BLOCK", runcontrol=True, lowlimit=1, highlimit=2, wait=None
+            )
+
+        pv_wrapper.set_pv_value.assert_has_calls(
+            [call("ENABLE", 1, wait=False), call("LOW", 1, wait=False), call("HIGH", 2, wait=False)]
+        )
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_WHEN_set_multiple_blocks_called_THEN_setpoints_set_in_one_bulk_put(
+        self, pv_wrapper: MagicMock
+    ):
+        pv_wrapper.connected_pvs.side_effect = lambda names: [
+            name for name in names if name.endswith("BLOCK_1:SP")
+        ]
+        pv_wrapper.set_pv_values.return_value = {}
+
+        self.api.set_multiple_blocks(["BLOCK_1", "BLOCK_2"], [1, 2])
+
+        pv_wrapper.set_pv_values.assert_called_once_with(
+            {
+                self.api.get_pv_from_block("BLOCK_1") + ":SP": 1,
+                self.api.get_pv_from_block("BLOCK_2"): 2,
+            },
+            wait=False,
+        )
+        pv_wrapper.set_pv_value.assert_not_called()
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_WHEN_set_multiple_blocks_called_THEN_precmd_given_no_wait_for_each_block(
+        self, pv_wrapper: MagicMock
+    ):
+        pv_wrapper.connected_pvs.return_value = []
+        pv_wrapper.set_pv_values.return_value = {}
+        self.api.pre_post_cmd_manager = MagicMock()
+
+        self.api.set_multiple_blocks(["BLOCK_1", "BLOCK_2"], [1, 2])
+
+        assert_that(
+            self.api.pre_post_cmd_manager.cset_precmd.call_args_list,
+            is_([call(runcontrol=None, wait=None)] * 2),
+        )
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_one_pv_fails_to_set_WHEN_set_pv_values_THEN_only_failed_pv_retried_then_raised(
+        self, pv_wrapper: MagicMock
+    ):
+        error = UnableToConnectToPVException("PV_2", "error")
+        pv_wrapper.set_pv_values.side_effect = lambda values, wait: {"PV_2": error}
+
+        assert_that(
+            calling(self.api.set_pv_values).with_args({"PV_1": 1, "PV_2": 2}, attempts=2),
+            raises(UnableToConnectToPVException),
+        )
+
+        pv_wrapper.set_pv_values.assert_called_with({"PV_2": 2}, wait=False)
+        assert_that(pv_wrapper.set_pv_values.call_count, is_(2))
+
     def test_GIVEN_non_existent_block_WHEN_get_block_data_called_THEN_raises(self):
         self.api.block_exists = MagicMock(return_value=False)
         self.assertRaises(Exception, self.api.get_block_data, "my_block")
@@ -893,3 +1080,81 @@ class TestSetBlockMethod(unittest.TestCase):
         self.assertEqual(block_data["runcontrol"], expected_run_control[0])
         self.assertEqual(block_data["lowlimit"], expected_run_control[1])
         self.assertEqual(block_data["highlimit"], expected_run_control[2])
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_several_blocks_WHEN_get_blocks_data_THEN_all_read_in_one_bulk_read(
+        self, pv_wrapper: MagicMock
+    ):
+        values = {}
+        for index, block in enumerate(["BLOCK_1", "BLOCK_2"]):
+            block_pv = self.api.get_pv_from_block(block)
+            values.update(
+                {
+                    block_pv: index,
+                    block_pv + ".SEVR": "MINOR",
+                    block_pv + ":RC:ENABLE": "YES",
+                    block_pv + ":RC:LOW": 0,
+                    block_pv + ":RC:HIGH": 10,
+                }
+            )
+        pv_wrapper.get_pv_values.return_value = (values, {})
+        pv_wrapper.dbf_type_to_string.return_value = "DBF_DOUBLE"
+        pv_wrapper.get_units.return_value = "K"
+
+        block_data = self.api.get_blocks_data(["BLOCK_1", "block_2"])
+
+        pv_wrapper.get_pv_values.assert_called_once()
+        assert_that(set(pv_wrapper.get_pv_values.call_args[0][0]), is_(set(values)))
+        assert_that([data["name"] for data in block_data], is_(["BLOCK_1", "block_2"]))
+        assert_that(
+            dict(block_data[1]),
+            is_(
+                {
+                    "connected": True,
+                    "name": "block_2",
+                    "value": 1,
+                    "unit": "K",
+                    "runcontrol": True,
+                    "lowlimit": 0,
+                    "highlimit": 10,
+                    "alarm": "MINOR",
+                }
+            ),
+        )
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_disconnected_block_WHEN_get_blocks_data_with_fail_fast_THEN_disconnected_and_only_runcontrol_read(
+        self, pv_wrapper: MagicMock
+    ):
+        block_pv = self.api.get_pv_from_block("MY_BLOCK")
+        pv_wrapper.connected_pvs.return_value = []
+        pv_wrapper.get_pv_values.return_value = (
+            {block_pv + ":RC:ENABLE": "NO", block_pv + ":RC:LOW": 0, block_pv + ":RC:HIGH": 1},
+            {},
+        )
+        self.api.get_block_names = MagicMock(return_value=["my_block"])
+
+        (block_data,) = self.api.get_blocks_data(["MY_BLOCK"], fail_fast=True)
+
+        pv_wrapper.connected_pvs.assert_called_once_with([block_pv], 0)
+        assert_that(block_pv in pv_wrapper.get_pv_values.call_args[0][0], is_(False))
+        assert_that(block_data["connected"], is_(False))
+        assert_that(block_data["value"], is_(None))
+        assert_that(block_data["alarm"], is_("UNKNOWN"))
+        assert_that(block_data["runcontrol"], is_(False))
+
+    @patch("genie_python.genie_epics_api.Wrapper")
+    def test_GIVEN_block_not_in_block_names_WHEN_get_blocks_data_THEN_raises(
+        self, pv_wrapper: MagicMock
+    ):
+        block_pv = self.api.get_pv_from_block("MY_BLOCK")
+        pv_wrapper.get_pv_values.return_value = (
+            {},
+            {block_pv: UnableToConnectToPVException(block_pv, "timeout")},
+        )
+        self.api.get_block_names = MagicMock(return_value=["OTHER_BLOCK"])
+
+        assert_that(
+            calling(self.api.get_blocks_data).with_args(["MY_BLOCK"]),
+            raises(Exception, "No block with the name 'MY_BLOCK' exists"),
+        )
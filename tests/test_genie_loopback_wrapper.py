@@ -0,0 +1,136 @@
+import time
+import unittest
+from unittest.mock import MagicMock
+
+import numpy as np
+from hamcrest import assert_that, calling, greater_than_or_equal_to, is_, raises
+
+from genie_python.channel_access_exceptions import (
+    InvalidEnumStringException,
+    UnableToConnectToPVException,
+    WriteAccessException,
+)
+from genie_python.genie_epics_api import API
+from genie_python.genie_loopback_wrapper import LoopbackWrapper, loopback_backend
+from genie_python.genie_pv_connection_protocol import GeniePvConnectionProtocol
+
+
+class TestLoopbackWrapper(unittest.TestCase):
+    def setUp(self):
+        LoopbackWrapper.clear()
+        self.addCleanup(LoopbackWrapper.clear)
+
+    def test_WHEN_loopback_wrapper_checked_THEN_implements_connection_protocol(self):
+        assert_that(isinstance(LoopbackWrapper, GeniePvConnectionProtocol), is_(True))
+
+    def test_GIVEN_pv_WHEN_set_THEN_new_value_read_and_sent_to_monitor(self):
+        LoopbackWrapper.add_pv("PV", 1.0)
+        callback = MagicMock()
+        LoopbackWrapper.add_monitor("PV", callback)
+
+        LoopbackWrapper.set_pv_value("PV", 2.0)
+
+        assert_that(LoopbackWrapper.get_pv_value("PV"), is_(2.0))
+        assert_that(LoopbackWrapper.get_pv_value("PV", to_string=True), is_("2.0"))
+        callback.assert_called_with(2.0, "NO_ALARM", "NO_ALARM")
+        assert_that(callback.call_count, is_(2))
+
+    def test_GIVEN_enum_pv_WHEN_set_by_string_or_index_THEN_state_string_read(self):
+        LoopbackWrapper.add_pv("ENUM", "OFF", enum_strings=["OFF", "ON"])
+
+        LoopbackWrapper.set_pv_value("ENUM", "ON")
+        first = LoopbackWrapper.get_pv_value("ENUM")
+        LoopbackWrapper.set_pv_value("ENUM", 0)
+
+        assert_that(first, is_("ON"))
+        assert_that(LoopbackWrapper.get_pv_value("ENUM"), is_("OFF"))
+        assert_that(
+            calling(LoopbackWrapper.set_pv_value).with_args("ENUM", "MAYBE"),
+            raises(InvalidEnumStringException),
+        )
+
+    def test_GIVEN_waveform_WHEN_fewer_elements_written_THEN_waveform_read_has_valid_elements(
+        self,
+    ):
+        LoopbackWrapper.add_pv("WAVE", [], nelm=10)
+
+        LoopbackWrapper.set_pv_value("WAVE", [1, 2, 3])
+
+        assert_that(LoopbackWrapper.get_waveform("WAVE", use_numpy=False), is_([1, 2, 3]))
+        assert_that(len(LoopbackWrapper.get_pv_value("WAVE")), is_(10))
+        assert_that(LoopbackWrapper.get_pv_value("WAVE.NORD"), is_(3))
+
+    def test_GIVEN_char_waveform_WHEN_string_or_bytes_written_THEN_read_back_as_string(self):
+        LoopbackWrapper.add_pv("TEXT", np.zeros(0, dtype=np.uint8), nelm=20)
+
+        LoopbackWrapper.set_pv_value("TEXT", "hello")
+        first = LoopbackWrapper.get_pv_value("TEXT", to_string=True)
+        LoopbackWrapper.set_pv_value("TEXT", b"bytes")
+
+        assert_that(first, is_("hello"))
+        assert_that(LoopbackWrapper.get_pv_value("TEXT", to_string=True), is_("bytes"))
+
+    def test_GIVEN_record_with_disp_set_WHEN_written_THEN_refused_unless_not_checked(self):
+        LoopbackWrapper.add_pv("RECORD", 1.0, disp=True)
+
+        assert_that(
+            calling(LoopbackWrapper.set_pv_value).with_args("RECORD", 2.0),
+            raises(WriteAccessException),
+        )
+        LoopbackWrapper.set_pv_value("RECORD", 3.0, safe_not_quick=False)
+        assert_that(LoopbackWrapper.get_pv_value("RECORD"), is_(3.0))
+        assert_that(LoopbackWrapper.get_pv_value("RECORD.DISP"), is_("1"))
+
+    def test_GIVEN_alarm_set_by_ioc_WHEN_fields_read_THEN_alarm_returned(self):
+        LoopbackWrapper.add_pv("PV", 1.0)
+
+        LoopbackWrapper.update_pv("PV", severity="MAJOR", status="HIHI")
+
+        assert_that(LoopbackWrapper.get_pv_value("PV.SEVR"), is_("MAJOR"))
+        assert_that(LoopbackWrapper.get_monitored_value("PV").status, is_("HIHI"))
+
+    def test_GIVEN_missing_pv_WHEN_read_THEN_unable_to_connect(self):
+        assert_that(LoopbackWrapper.pv_exists("MISSING"), is_(False))
+        assert_that(
+            calling(LoopbackWrapper.get_pv_value).with_args("MISSING"),
+            raises(UnableToConnectToPVException),
+        )
+
+    def test_GIVEN_monitored_pv_WHEN_removed_THEN_link_alarm_sent(self):
+        LoopbackWrapper.add_pv("PV", 1.0)
+        callback = MagicMock()
+        LoopbackWrapper.add_monitor("PV", callback)
+
+        LoopbackWrapper.remove_pv("PV")
+
+        callback.assert_called_with(1.0, "INVALID", "LINK")
+
+    def test_GIVEN_latency_WHEN_read_THEN_read_takes_latency(self):
+        LoopbackWrapper.add_pv("PV", 1.0)
+        LoopbackWrapper.set_latency(0.02)
+        start = time.perf_counter()
+
+        LoopbackWrapper.get_pv_value("PV")
+
+        assert_that(time.perf_counter() - start, is_(greater_than_or_equal_to(0.02)))
+
+    def test_GIVEN_put_with_process_time_WHEN_put_async_THEN_future_done_after_process_time(
+        self,
+    ):
+        LoopbackWrapper.add_pv("MOTOR", 0.0, process_time=0.05)
+
+        future = LoopbackWrapper.put_async("MOTOR", 1.0)
+
+        assert_that(future.done(), is_(False))
+        assert_that(future.result(timeout=5), is_(None))
+
+    def test_GIVEN_loopback_backend_WHEN_api_reads_and_writes_pvs_THEN_loopback_pvs_used(self):
+        with loopback_backend() as wrapper:
+            wrapper.add_pv("IN:DEMO:PV", 1.0)
+            api = API("", None)
+            api.inst_prefix = "IN:DEMO:"
+
+            api.set_pv_value("PV", 5.0, is_local=True)
+
+            assert_that(api.get_pv_value("PV", is_local=True), is_(5.0))
+            assert_that(api.connected_pvs_in_list(["PV", "MISSING"], True), is_(["PV"]))
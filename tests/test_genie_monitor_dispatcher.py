@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock
+
+from hamcrest import assert_that, has_entries, is_
+
+from genie_python.genie_monitor_dispatcher import MonitorDispatcher
+
+WAIT_TIMEOUT = 5
+
+
+class TestMonitorDispatcher(unittest.TestCase):
+    def setUp(self):
+        self.errors = []
+        self.dispatcher = MonitorDispatcher(workers=1, error_handler=self.errors.append)
+        # Set to let a blocked callback return
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+        self.blocked = threading.Event()
+        self.received = []
+        self.done = threading.Event()
+
+    def _blocking_callback(self, value):
+        self.blocked.set()
+        self.release.wait(WAIT_TIMEOUT)
+
+    def _recording_callback(self, *values):
+        self.received.append(values)
+
+    def _block_worker(self):
+        blocker = self.dispatcher.wrap(self._blocking_callback)
+        blocker(0)
+        assert_that(self.blocked.wait(WAIT_TIMEOUT), is_(True))
+        return blocker
+
+    def _wait_until_idle(self):
+        # With one worker, a call made once the queue has room runs after all the others
+        deadline = time.monotonic() + WAIT_TIMEOUT
+        while self.dispatcher.statistics()["queued"] >= self.dispatcher.max_queued:
+            assert_that(time.monotonic() < deadline, is_(True))
+            time.sleep(0.001)
+        marker = self.dispatcher.wrap(lambda: self.done.set())
+        marker()
+        assert_that(self.done.wait(WAIT_TIMEOUT), is_(True))
+
+    def test_GIVEN_blocked_callback_WHEN_other_callback_called_THEN_other_callback_still_runs(self):
+        self.dispatcher = MonitorDispatcher(workers=2)
+        self._block_worker()
+        other = self.dispatcher.wrap(lambda value: self.done.set())
+
+        other(1)
+
+        assert_that(self.done.wait(WAIT_TIMEOUT), is_(True))
+        self.release.set()
+
+    def test_GIVEN_dispatched_callback_WHEN_called_several_times_THEN_calls_run_in_order(self):
+        callback = self.dispatcher.wrap(self._recording_callback)
+
+        for value in range(3):
+            callback(value, "NO_ALARM")
+        self._wait_until_idle()
+
+        assert_that(self.received, is_([(0, "NO_ALARM"), (1, "NO_ALARM"), (2, "NO_ALARM")]))
+
+    def test_GIVEN_coalescing_callback_behind_WHEN_called_THEN_only_latest_value_run(self):
+        self._block_worker()
+        callback = self.dispatcher.wrap(self._recording_callback, coalesce=True)
+
+        for value in range(5):
+            callback(value)
+        self.release.set()
+        self._wait_until_idle()
+
+        assert_that(self.received, is_([(4,)]))
+        assert_that(callback.coalesced, is_(4))
+        assert_that(self.dispatcher.statistics(), has_entries(coalesced=4, dropped=0))
+
+    def test_GIVEN_full_queue_WHEN_called_THEN_call_dropped_and_counted(self):
+        self.dispatcher = MonitorDispatcher(workers=1, max_queued=2)
+        self._block_worker()
+        callback = self.dispatcher.wrap(self._recording_callback)
+
+        for value in range(4):
+            callback(value)
+        self.release.set()
+        self._wait_until_idle()
+
+        assert_that(self.received, is_([(0,), (1,)]))
+        assert_that(callback.dropped, is_(2))
+        assert_that(self.dispatcher.statistics(), has_entries(dropped=2, queued=0))
+
+    def test_GIVEN_queued_calls_WHEN_closed_THEN_calls_discarded(self):
+        self._block_worker()
+        callback = self.dispatcher.wrap(self._recording_callback)
+        callback(1)
+
+        callback.close()
+        callback(2)
+        self.release.set()
+        self._wait_until_idle()
+
+        assert_that(self.received, is_([]))
+
+    def test_GIVEN_failing_callback_WHEN_called_THEN_error_reported_and_worker_carries_on(self):
+        failing = self.dispatcher.wrap(MagicMock(side_effect=ValueError("bad value")))
+
+        failing(1)
+        self._wait_until_idle()
+
+        assert_that(self.errors, is_(["Monitor callback failed: bad value"]))
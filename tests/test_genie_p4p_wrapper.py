@@ -0,0 +1,131 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from hamcrest import assert_that, calling, has_length, is_, raises
+from p4p.client.thread import RemoteError
+
+from genie_python.channel_access_exceptions import (
+    UnableToConnectToPVException,
+    WriteAccessException,
+)
+from genie_python.genie_p4p_wrapper import EXIST_REQUEST, SUBSCRIPTIONS, P4PWrapper
+
+
+class TestP4PWrapper(unittest.TestCase):
+    def setUp(self):
+        for name in [
+            "CONTEXTS",
+            "SUBSCRIPTIONS",
+            "MONITORED_READS",
+            "DISP_STATES",
+            "DISP_SUBSCRIPTIONS",
+        ]:
+            dict_patch = patch.dict("genie_python.genie_p4p_wrapper.{}".format(name), clear=True)
+            dict_patch.start()
+            self.addCleanup(dict_patch.stop)
+
+        context_patch = patch("genie_python.genie_p4p_wrapper.Context")
+        self.context_class = context_patch.start()
+        self.addCleanup(context_patch.stop)
+        self.context = self.context_class.return_value
+
+    def test_GIVEN_several_threads_WHEN_context_got_THEN_one_context_shared(self):
+        contexts = []
+        threads = [
+            threading.Thread(target=lambda: contexts.append(P4PWrapper.get_context()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_that(set(map(id, contexts)), has_length(1))
+        self.context_class.assert_called_once_with("pva", nt=False)
+
+    def test_GIVEN_two_monitors_on_pv_WHEN_monitor_cleared_THEN_both_subscriptions_closed(self):
+        subscriptions = [MagicMock(), MagicMock()]
+        self.context.monitor.side_effect = subscriptions
+        P4PWrapper.add_monitor("PV", MagicMock())
+        P4PWrapper.add_monitor("PV", MagicMock())
+
+        P4PWrapper.clear_monitor("PV", 1)
+
+        for subscription in subscriptions:
+            subscription.close.assert_called_once_with()
+
+    def test_GIVEN_dispatched_monitor_WHEN_closed_THEN_subscription_and_callback_closed_and_forgotten(
+        self,
+    ):
+        subscription = MagicMock()
+        self.context.monitor.return_value = subscription
+        monitor = P4PWrapper.add_monitor("PV", MagicMock(), coalesce=True)
+
+        monitor.close()
+
+        subscription.close.assert_called_once_with()
+        assert_that(monitor.dispatched.closed, is_(True))
+        assert_that(SUBSCRIPTIONS, is_({}))
+
+    def test_GIVEN_two_monitors_on_pv_WHEN_one_called_to_cancel_THEN_other_still_cleared_by_name(
+        self,
+    ):
+        subscriptions = [MagicMock(), MagicMock()]
+        self.context.monitor.side_effect = subscriptions
+        cancel = P4PWrapper.add_monitor("PV", MagicMock())
+        P4PWrapper.add_monitor("PV", MagicMock())
+
+        cancel()
+        P4PWrapper.clear_monitor("PV", 1)
+
+        for subscription in subscriptions:
+            subscription.close.assert_called_once_with()
+        assert_that(SUBSCRIPTIONS, is_({}))
+
+    def test_GIVEN_pv_WHEN_existence_checked_THEN_only_timestamp_requested(self):
+        self.context.get.return_value = MagicMock()
+
+        assert_that(P4PWrapper.pv_exists("PV", 1), is_(True))
+
+        self.context.get.assert_called_once_with(
+            "PV", request=EXIST_REQUEST, timeout=1, throw=False
+        )
+
+    def test_GIVEN_pv_not_found_WHEN_existence_checked_THEN_does_not_exist(self):
+        self.context.get.return_value = TimeoutError()
+
+        assert_that(P4PWrapper.pv_exists("PV", 1), is_(False))
+
+    def test_GIVEN_server_error_WHEN_existence_checked_THEN_exists(self):
+        self.context.get.return_value = RemoteError("No timeStamp field")
+
+        assert_that(P4PWrapper.pv_exists("PV", 1), is_(True))
+
+    def test_GIVEN_several_pvs_WHEN_connected_pvs_checked_THEN_timestamp_requested_for_each(self):
+        self.context.get.return_value = [MagicMock(), TimeoutError(), MagicMock()]
+
+        connected = P4PWrapper.connected_pvs(["A", "B", "C"], 1)
+
+        assert_that(connected, is_(["A", "C"]))
+        self.context.get.assert_called_once_with(
+            ["A", "B", "C"], request=[EXIST_REQUEST] * 3, timeout=1, throw=False
+        )
+
+    def test_GIVEN_pv_not_found_WHEN_value_got_THEN_unable_to_connect(self):
+        self.context.get.side_effect = TimeoutError()
+
+        assert_that(
+            calling(P4PWrapper.get_pv_value).with_args("PV"),
+            raises(UnableToConnectToPVException),
+        )
+
+    def test_GIVEN_disp_set_but_slow_to_connect_WHEN_disp_checked_THEN_write_refused(self):
+        with (
+            patch.object(P4PWrapper, "pv_exists", side_effect=lambda name, timeout: timeout > 0),
+            patch.object(P4PWrapper, "get_pv_value", return_value="1"),
+        ):
+            assert_that(
+                calling(P4PWrapper._check_for_disp).with_args("RECORD"),
+                raises(WriteAccessException),
+            )
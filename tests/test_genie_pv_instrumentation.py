@@ -0,0 +1,82 @@
+import json
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from hamcrest import assert_that, contains_string, has_entries, is_
+
+from genie_python.genie_pv_instrumentation import (
+    GET,
+    MONITOR,
+    PUT,
+    PvInstrumentation,
+    payload_size,
+)
+
+
+class TestPvInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.instrumentation = PvInstrumentation()
+        self.instrumentation.enable()
+
+    def test_GIVEN_not_enabled_WHEN_operation_recorded_THEN_nothing_recorded(self):
+        instrumentation = PvInstrumentation()
+
+        instrumentation.record("PV", GET, 0.001, 1.0)
+
+        assert_that(instrumentation.summary(), is_([]))
+
+    def test_GIVEN_gets_recorded_WHEN_summarised_THEN_count_bytes_and_latencies_given(self):
+        self.instrumentation.record("PV", GET, 0.0005, 1.0)
+        self.instrumentation.record("PV", GET, 0.003, np.zeros(10))
+
+        (row,) = self.instrumentation.summary()
+
+        assert_that(
+            row,
+            has_entries(
+                pv="PV",
+                operation=GET,
+                count=2,
+                bytes=88,
+                max_latency=0.003,
+                p95_latency=0.005,
+            ),
+        )
+        assert_that(row["histogram"], has_entries({"0.001": 1, "0.005": 1}))
+
+    def test_GIVEN_several_pvs_WHEN_summarised_THEN_slowest_in_total_first(self):
+        self.instrumentation.record("FAST", GET, 0.001)
+        self.instrumentation.record("SLOW", PUT, 0.5)
+        self.instrumentation.record("UPDATES", MONITOR, value="text")
+
+        rows = self.instrumentation.summary()
+
+        assert_that([row["pv"] for row in rows], is_(["SLOW", "FAST", "UPDATES"]))
+        assert_that(rows[2], has_entries(count=1, bytes=4, mean_latency=None))
+
+    def test_GIVEN_operations_recorded_WHEN_formatted_THEN_table_has_row_for_each(self):
+        self.instrumentation.record("IN:DEMO:TEMP", GET, 0.0123, 1.0)
+
+        table = self.instrumentation.format_summary()
+
+        assert_that(table.splitlines()[0], contains_string("Mean (ms)"))
+        assert_that(table.splitlines()[1], contains_string("IN:DEMO:TEMP  get"))
+        assert_that(table.splitlines()[1], contains_string("12.3"))
+
+    def test_GIVEN_operations_recorded_WHEN_exported_THEN_file_has_statistics_as_json(self):
+        self.instrumentation.record("PV", GET, 0.001, 1.0)
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "statistics.json")
+
+            self.instrumentation.export(filename)
+
+            with open(filename) as f:
+                exported = json.load(f)
+        assert_that(exported[0], has_entries(pv="PV", operation=GET, count=1))
+
+    def test_WHEN_payload_sizes_estimated_THEN_sizes_of_data(self):
+        assert_that(payload_size({"pv_value": [1, 2]}), is_(16))
+        assert_that(payload_size(b"abc"), is_(3))
+        assert_that(payload_size(None), is_(0))
@@ -17,15 +17,18 @@ from __future__ import absolute_import
 
 import json
 import unittest
-from unittest.mock import Mock
+import zlib
+from unittest.mock import Mock, patch
 
 from genie_python.utilities import (
+    DecodedJsonCache,
     EnvironmentDetails,
     PVReadException,
     compress_and_hex,
     convert_string_to_ascii,
     crc8,
     dehex_and_decompress,
+    dehex_decompress_and_dejson,
     get_correct_path,
     get_json_pv_value,
     remove_field_from_pv,
@@ -273,6 +276,61 @@ class TestEnvironmentDetails(unittest.TestCase):
 
         self.assertEqual(result, EnvironmentDetails.DEFAULT_INST_LIST)
 
+    def test_GIVEN_list_read_before_WHEN_get_inst_list_THEN_decoded_list_reused(self):
+        compressed_list = compress_and_hex(json.dumps([{"name": "john"}]))
+        api = Mock()
+        api.get_pv_value = Mock(return_value=compressed_list)
+        env_details = EnvironmentDetails()
+
+        with patch("genie_python.utilities.DECODED_JSON_CACHE", DecodedJsonCache()):
+            first = env_details.get_instrument_list(api)
+            with patch("genie_python.utilities.dehex_and_decompress") as decompress:
+                second = env_details.get_instrument_list(api)
+
+        self.assertIs(second, first)
+        decompress.assert_not_called()
+
+
+class TestDecodedJsonCache(unittest.TestCase):
+    def test_GIVEN_value_decoded_WHEN_same_raw_value_decoded_THEN_same_object_returned(self):
+        cache = DecodedJsonCache()
+        raw = compress_and_hex(json.dumps(["BLOCK1", "BLOCK2"]))
+
+        first = cache.decode(raw)
+        second = cache.decode(raw.decode("utf-8"))
+
+        self.assertEqual(first, ["BLOCK1", "BLOCK2"])
+        self.assertIs(second, first)
+
+    def test_GIVEN_cache_full_WHEN_value_added_THEN_least_recently_used_dropped(self):
+        cache = DecodedJsonCache(max_entries=2)
+        raws = [compress_and_hex(json.dumps(index)) for index in range(3)]
+        cache.decode(raws[0])
+        cache.decode(raws[1])
+        cache.decode(raws[0])
+
+        cache.decode(raws[2])
+
+        self.assertEqual(cache.get(raws[0], "missing"), 0)
+        self.assertEqual(cache.get(raws[1], "missing"), "missing")
+
+    def test_GIVEN_value_which_decodes_to_none_WHEN_decoded_cached_THEN_none_held(self):
+        raw = compress_and_hex("null")
+
+        with patch("genie_python.utilities.DECODED_JSON_CACHE", DecodedJsonCache()) as cache:
+            result = dehex_decompress_and_dejson(raw, cached=True)
+
+            self.assertIsNone(result)
+            self.assertIsNone(cache.get(raw, "missing"))
+
+    @patch("genie_python.utilities.STREAMING_DECOMPRESS_CHUNK", 64)
+    @patch("genie_python.utilities.STREAMING_DECOMPRESS_THRESHOLD", 100)
+    def test_GIVEN_large_value_WHEN_decompressed_in_chunks_THEN_matches_original(self):
+        original = json.dumps(["BLOCK_{}".format(index) for index in range(200)])
+
+        self.assertEqual(dehex_and_decompress(compress_and_hex(original)), original)
+        self.assertRaises(zlib.error, dehex_and_decompress, compress_and_hex(original)[:-200])
+
 
 class TestGetJsonPVValue(unittest.TestCase):
     def test_GIVEN_invalid_json_WHEN_get_pv_THEN_list_raise(self):
@@ -304,6 +362,19 @@ class TestGetJsonPVValue(unittest.TestCase):
             PVReadException, "Can not decompress.*", get_json_pv_value, "name", api
         )
 
+    def test_GIVEN_same_value_read_twice_WHEN_get_pv_cached_THEN_decoded_once(self):
+        compressed_list = compress_and_hex(json.dumps([{"name": "cached"}]))
+        api = Mock()
+        api.get_pv_value = Mock(return_value=compressed_list)
+
+        with patch("genie_python.utilities.DECODED_JSON_CACHE", DecodedJsonCache()):
+            first = get_json_pv_value("name", api, cached=True)
+            with patch("genie_python.utilities.dehex_and_decompress") as mock_decompress:
+                second = get_json_pv_value("name", api, cached=True)
+
+        self.assertIs(second, first)
+        mock_decompress.assert_not_called()
+
     def test_GIVEN_pv_can_not_be_read_WHEN_get_pv_THEN_raise(self):
         api = Mock()
         api.get_pv_value = Mock(side_effect=Exception())